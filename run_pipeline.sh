@@ -42,10 +42,15 @@ echo "  Collecting lines of code metrics..."
 python3 src/collection/collect_loc.py
 echo ""
 
+echo "  Collecting LOC / test-file history..."
+python3 src/collection/collect_history.py
+echo ""
+
 # Step 3: Calculation
 echo "Step 3: CALCULATION Layer"
 python3 src/calculations/calculate.py
 python3 src/calculations/calculate_test_metrics.py
+python3 src/calculations/calculate_evolution_metrics.py
 echo ""
 
 # Step 4: Validation
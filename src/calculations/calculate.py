@@ -5,13 +5,20 @@ Processes raw git and CI artifacts into normalized, auditable metrics
 """
 
 import json
-import xml.etree.ElementTree as ET
+import os
 from datetime import datetime
 from pathlib import Path
 
+from src.calculations.coverage_parsers import CoverageCounter, parse_cobertura_totals, parse_jacoco_totals
+from src.calculations.coverage_store import CoverageStore
+from src.calculations.diff_coverage import LineCoverageIndex, commit_date, diff_base, diff_coverage, iter_changed_lines
+from src.calculations.lcov_parser import summarize_lcov
+
 class Calculator:
-    def __init__(self, root_dir="."):
+    def __init__(self, root_dir=".", diff_coverage_days=30, diff_coverage_since_tag=False):
         self.root_dir = Path(root_dir)
+        self.diff_coverage_days = diff_coverage_days
+        self.diff_coverage_since_tag = diff_coverage_since_tag
         self.git_artifacts = self.root_dir / "git_artifacts"
         self.ci_artifacts = self.root_dir / "ci_artifacts"
         self.calculations = self.root_dir / "calculations"
@@ -39,6 +46,14 @@ class Calculator:
                 inputs.append(str(path.relative_to(self.root_dir)))
         return inputs
 
+    def _coverage_reports(self, repo_name):
+        """JaCoCo, Cobertura and LCOV reports collected for a repository"""
+        ci_dir = self.ci_artifacts / repo_name
+        return sorted(
+            set(ci_dir.rglob("*jacoco*.xml")) | set(ci_dir.rglob("coverage.xml"))
+            | set(ci_dir.rglob("cobertura.xml")) | set(ci_dir.rglob("*lcov.info"))
+        )
+
     def list_repos(self):
         """List repos based on collected artifacts"""
         repos = {}
@@ -178,7 +193,7 @@ class Calculator:
 
         coverage_files = []
         if coverage_tool == "jacoco":
-            coverage_files = list(ci_dir.rglob("*.jacoco.xml")) + list(ci_dir.rglob("*jacoco*.xml"))
+            coverage_files = sorted(set(ci_dir.rglob("*jacoco*.xml")))
         elif coverage_tool == "pytest-cov":
             coverage_files = list(ci_dir.rglob("coverage.xml"))
         elif coverage_tool == "lcov":
@@ -192,52 +207,20 @@ class Calculator:
 
         if inputs:
             try:
-                if coverage_tool == "jacoco":
-                    total_missed = 0
-                    total_covered = 0
-                    for coverage_file in coverage_files:
-                        tree = ET.parse(coverage_file)
-                        root = tree.getroot()
-                        counters = root.findall(".//counter")
-                        for counter in counters:
-                            if counter.get("type") == "LINE":
-                                total_missed += int(counter.get("missed", 0))
-                                total_covered += int(counter.get("covered", 0))
-                                break
-                    total = total_missed + total_covered
-                    if total > 0:
-                        value = round((total_covered / total) * 100, 2)
-                elif coverage_tool == "pytest-cov":
-                    total_lines = 0
-                    total_covered = 0
+                if coverage_tool in ("jacoco", "pytest-cov"):
+                    # Report-level LINE counters, streamed (reports can be hundreds of MB)
+                    parse_totals = parse_jacoco_totals if coverage_tool == "jacoco" else parse_cobertura_totals
+                    lines = CoverageCounter("LINE")
                     for coverage_file in coverage_files:
-                        tree = ET.parse(coverage_file)
-                        root = tree.getroot()
-                        lines_valid = root.get("lines-valid")
-                        lines_covered = root.get("lines-covered")
-                        if lines_valid is not None and lines_covered is not None:
-                            total_lines += int(lines_valid)
-                            total_covered += int(lines_covered)
-                    if total_lines > 0:
-                        value = round((total_covered / total_lines) * 100, 2)
+                        counter = parse_totals(coverage_file).get("LINE")
+                        if counter is not None:
+                            lines.add(counter)
+                    value = lines.percentage
                 elif coverage_tool == "lcov":
-                    total_lines = 0
-                    hit_lines = 0
-                    for coverage_file in coverage_files:
-                        with open(coverage_file, "r") as f:
-                            for line in f:
-                                if line.startswith("LF:"):
-                                    total_lines += int(line.strip().split(":")[1])
-                                elif line.startswith("LH:"):
-                                    hit_lines += int(line.strip().split(":")[1])
-                                elif line.startswith("DA:"):
-                                    parts = line.strip().split(":")[1].split(",")
-                                    if len(parts) >= 2:
-                                        total_lines += 1
-                                        if int(parts[1]) > 0:
-                                            hit_lines += 1
-                    if total_lines > 0:
-                        value = round((hit_lines / total_lines) * 100, 2)
+                    # LF/LH per file, DA only for files without summaries
+                    totals = summarize_lcov(coverage_files)
+                    if totals["lines_found"] > 0:
+                        value = round((totals["lines_hit"] / totals["lines_found"]) * 100, 2)
             except Exception as e:
                 reason = f"Coverage parsing failed: {str(e)}"
 
@@ -256,6 +239,93 @@ class Calculator:
             "calculated_at": datetime.now().isoformat()
         }
 
+    def calculate_coverage_breakdown(self, repo_name):
+        """Persist per-file coverage in a SQLite store and summarize it by language and package"""
+        reports = self._coverage_reports(repo_name)
+        inputs = [str(f.relative_to(self.root_dir)) for f in reports]
+        store_path = self.calculations / "per_repo" / repo_name / "coverage.sqlite"
+
+        metric = {
+            "metric_id": "repo.coverage_breakdown",
+            "repo": repo_name,
+            "repos": [repo_name],
+            "inputs": inputs,
+            "time_range": self._safe_time_range(None, None),
+            "store": None,
+            "totals": None,
+            "by_language": [],
+            "top_uncovered_packages": [],
+            "reason": None,
+            "method": "Per-file line/branch counts from JaCoCo, Cobertura and LCOV reports, stored in SQLite",
+            "calculated_at": datetime.now().isoformat()
+        }
+        if not reports:
+            metric["reason"] = "No coverage reports in ci_artifacts"
+            return metric
+
+        try:
+            store = CoverageStore(store_path)
+            store.build(reports, source_root=self.git_artifacts / repo_name / "clone")
+            metric["store"] = str(store_path.relative_to(self.root_dir))
+            metric["totals"] = store.totals()
+            metric["by_language"] = store.coverage_by_language()
+            metric["top_uncovered_packages"] = store.top_uncovered_packages()
+        except Exception as e:
+            metric["reason"] = f"Coverage parsing failed: {str(e)}"
+        return metric
+
+    def calculate_diff_coverage(self, repo_name):
+        """Coverage of lines changed in the last N days (or since the last tag)"""
+        reports = self._coverage_reports(repo_name)
+        clone_path = self.git_artifacts / repo_name / "clone"
+        if self.diff_coverage_since_tag:
+            window = "since the last tag"
+        else:
+            window = f"in the last {self.diff_coverage_days} days"
+
+        metric = {
+            "metric_id": "repo.diff_coverage",
+            "repo": repo_name,
+            "repos": [repo_name],
+            "inputs": [str(f.relative_to(self.root_dir)) for f in reports],
+            "time_range": self._safe_time_range(None, None),
+            "value": None,
+            "unit": "percent",
+            "base_commit": None,
+            "reason": None,
+            "method": f"Covered share of instrumented lines added or modified {window} "
+                      "(git diff --unified=0 against per-line hits from JaCoCo, Cobertura and LCOV reports)",
+            "calculated_at": datetime.now().isoformat()
+        }
+        if not reports:
+            metric["reason"] = "No coverage reports in ci_artifacts"
+            return metric
+        if not (clone_path / ".git").exists():
+            metric["reason"] = "Missing git_artifacts clone - run collect_git.py first"
+            return metric
+
+        base = diff_base(clone_path, days=self.diff_coverage_days, since_tag=self.diff_coverage_since_tag)
+        if base is None:
+            metric["reason"] = "No release tag found" if self.diff_coverage_since_tag else "Clone has no commits"
+            return metric
+
+        try:
+            index = LineCoverageIndex()
+            for report in reports:
+                index.add_report(report, source_root=clone_path)
+            result = diff_coverage(index, iter_changed_lines(clone_path, base))
+        except Exception as e:
+            metric["reason"] = f"Diff coverage failed: {str(e)}"
+            return metric
+
+        metric["base_commit"] = base
+        metric["time_range"] = self._safe_time_range(commit_date(clone_path, base), commit_date(clone_path, "HEAD"))
+        metric["files_indexed"] = len(index)
+        metric.update(result)
+        if metric["value"] is None:
+            metric["reason"] = "No changed lines with coverage data" if result["changed_lines"] else "No changed lines"
+        return metric
+
     def calculate_dora_frequency(self, repo_name):
         """Calculate deployment frequency (proxied by commit frequency)"""
         # In real DORA, this would use deployment tags or release branches
@@ -457,6 +527,8 @@ class Calculator:
             ("commits.json", self.calculate_commits(repo_name)),
             ("contributors.json", self.calculate_contributors(repo_name)),
             ("coverage.json", self.calculate_coverage_percentage(repo_name, config)),
+            ("coverage_breakdown.json", self.calculate_coverage_breakdown(repo_name)),
+            ("diff_coverage.json", self.calculate_diff_coverage(repo_name)),
             ("dora_frequency.json", self.calculate_dora_frequency(repo_name)),
             ("lead_time.json", self.calculate_lead_time(repo_name)),
             ("loc.json", self.calculate_loc(repo_name))
@@ -623,6 +695,8 @@ class Calculator:
                 "repo.commits",
                 "repo.contributors",
                 "repo.coverage",
+                "repo.coverage_breakdown",
+                "repo.diff_coverage",
                 "repo.dora_frequency",
                 "repo.dora_lead_time",
                 "repo.tests",
@@ -665,6 +739,9 @@ class Calculator:
         return True
 
 if __name__ == "__main__":
-    calculator = Calculator()
+    calculator = Calculator(
+        diff_coverage_days=int(os.getenv("DORA_DIFF_COVERAGE_DAYS", "30")),
+        diff_coverage_since_tag=os.getenv("DORA_DIFF_COVERAGE_SINCE", "") == "last_tag"
+    )
     success = calculator.run()
     exit(0 if success else 1)
@@ -2,6 +2,7 @@
 """
 Calculate evolution metrics for tracking project progress and improvements
 - Velocity trends (commits over time)
+- LOC / test-file trends (sampled history snapshots)
 - Coverage trends
 - Team growth/churn
 - Refactorization activity
@@ -235,6 +236,38 @@ class EvolutionMetricsCalculator:
             "calculated_at": datetime.utcnow().isoformat() + "Z"
         }
 
+    def calculate_loc_trend(self, repo_name):
+        """Chart LOC and test-file counts from sampled history snapshots"""
+        history_file = self.git_artifacts / repo_name / "history.json"
+        if not history_file.exists():
+            return None
+
+        with open(history_file, "r") as f:
+            history = json.load(f)
+
+        samples = history.get("samples", [])
+        if history.get("status") != "success" or not samples:
+            return None
+
+        first, last = samples[0], samples[-1]
+        return {
+            "metric_id": f"repo.loc_trend.{repo_name}",
+            "repo": repo_name,
+            "repos": [repo_name],
+            "inputs": [str(history_file.relative_to(self.root_dir))],
+            "time_range": {"start": first["date"], "end": last["date"]},
+            "interval": history.get("interval"),
+            "loc_timeline": {s["date"]: s["code_lines"] for s in samples},
+            "test_files_timeline": {s["date"]: s["test_files"] for s in samples},
+            "current_code_lines": last["code_lines"],
+            "current_test_files": last["test_files"],
+            "code_lines_change": last["code_lines"] - first["code_lines"],
+            "test_files_change": last["test_files"] - first["test_files"],
+            "samples": len(samples),
+            "method": "Count LOC and test files at one sampled commit per period (tree-SHA memoized history snapshots)",
+            "calculated_at": datetime.utcnow().isoformat() + "Z"
+        }
+
     def analyze_code_quality_evolution(self, repo_name):
         """Analyze code quality changes over time"""
         # Check if coverage data exists
@@ -317,6 +350,16 @@ class EvolutionMetricsCalculator:
                 results[f"{repo_name}_velocity"] = velocity
                 print(f"  ✓ Velocity trends: {velocity['weeks_active']} weeks active")
 
+            # LOC / test-file trends
+            loc_trend = self.calculate_loc_trend(repo_name)
+            if loc_trend:
+                self._write_json(
+                    self.calculations / "per_repo" / repo_name / "loc_trend.json",
+                    loc_trend
+                )
+                results[f"{repo_name}_loc_trend"] = loc_trend
+                print(f"  ✓ LOC trend: {loc_trend['samples']} samples, {loc_trend['code_lines_change']:+,} lines")
+
             # Contributor growth
             contributors = self.calculate_contributor_growth(repo_name)
             if contributors:
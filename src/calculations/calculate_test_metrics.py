@@ -6,6 +6,8 @@ Calculate test metrics from GitHub scanning
 import json
 from pathlib import Path
 from datetime import datetime
+from src.collection.scan_store import ScanArtifactStore
+from src.collection.traceability_index import TraceabilityIndex
 
 class TestMetricsCalculator:
     def __init__(self, root_dir="."):
@@ -39,40 +41,63 @@ class TestMetricsCalculator:
             return None, reason or "Coverage value is null"
         return value, None
 
+    def _load_traceability(self, repo_name):
+        """Load the epic/story -> test index written by the scanner"""
+        index_file = self.git_artifacts / repo_name / "traceability.json"
+        if not index_file.exists():
+            return None, None
+        return TraceabilityIndex.load(index_file), index_file
+
     def calculate_test_metrics(self):
         """Calculate test-related metrics"""
         
-        # Load scan results
-        scan_file = self.git_artifacts / "github_scan_artifacts.json"
-        scan_data = None
-        if scan_file.exists():
-            with open(scan_file, 'r') as f:
-                scan_data = json.load(f)
+        # Scan results are sharded per repo; global totals come from the small index
+        store = ScanArtifactStore(self.git_artifacts)
+        scanned_repos = store.repos()
+        has_scan = bool(scanned_repos)
+        scan_source = store.index_file if store.has_index() else store.legacy_file
+        scan_inputs = [str(scan_source.relative_to(self.root_dir))] if has_scan else []
+        missing_reason = "Missing scan artifacts (git_artifacts/scan_index.json)"
 
         results = {}
         repos = self._repo_names()
 
         # Global test metrics
-        if scan_data:
-            total_test_files = sum(v['count'] for v in scan_data.get('tests', {}).values())
-            total_epics = sum(len(v) for v in scan_data.get('epics', {}).values())
-            total_user_stories = sum(len(v) for v in scan_data.get('user_stories', {}).values())
+        if has_scan:
+            if store.has_index():
+                summaries = list(store.load_index()["repos"].values())
+            else:
+                summaries = []
+                for repo_name in scanned_repos:
+                    repo_scan = store.load_repo(repo_name)
+                    summaries.append({
+                        "test_files": repo_scan["tests"].get("count", 0),
+                        "test_cases": repo_scan["test_cases"].get("total", 0),
+                        "epics": len(repo_scan["epics"]),
+                        "user_stories": len(repo_scan["user_stories"])
+                    })
+            total_test_files = sum(s["test_files"] for s in summaries)
+            total_test_cases = sum(s["test_cases"] for s in summaries)
+            total_epics = sum(s["epics"] for s in summaries)
+            total_user_stories = sum(s["user_stories"] for s in summaries)
         else:
             total_test_files = None
+            total_test_cases = None
             total_epics = None
             total_user_stories = None
         
         global_tests = {
             "metric_id": "global.tests",
             "repos": repos,
-            "inputs": [str(scan_file.relative_to(self.root_dir))] if scan_data else [],
+            "inputs": scan_inputs,
             "time_range": {"start": None, "end": None},
             "total_test_files": total_test_files,
+            "total_test_cases": total_test_cases,
             "total_epics_found": total_epics,
             "total_user_stories_found": total_user_stories,
             "description": "Total test files across all repositories",
             "method": "Scan git_artifacts repositories for test files and epic/story references",
-            "reason": None if scan_data else "Missing github_scan_artifacts.json",
+            "reason": None if has_scan else missing_reason,
             "calculated_at": datetime.utcnow().isoformat() + "Z"
         }
         
@@ -83,41 +108,53 @@ class TestMetricsCalculator:
         untested_global = {
             "metric_id": "global.untested_epics",
             "repos": repos,
-            "inputs": [str(scan_file.relative_to(self.root_dir))] if scan_data else [],
+            "inputs": scan_inputs,
             "time_range": {"start": None, "end": None},
             "repos_without_coverage": [],
             "epics_without_coverage": {},
             "user_stories_without_coverage": {},
-            "method": "List epics/user stories for repos with missing or null coverage",
-            "reason": None if scan_data else "Missing github_scan_artifacts.json",
+            "epics_without_tests": {},
+            "method": "List epics/user stories for repos with missing or null coverage, and epics no test references (traceability index)",
+            "reason": None if has_scan else missing_reason,
             "calculated_at": datetime.utcnow().isoformat() + "Z"
         }
 
         # Per-repo test metrics
         for repo_name in repos:
-            test_info = (scan_data or {}).get('tests', {}).get(repo_name, {})
-            frameworks = (scan_data or {}).get('test_frameworks', {}).get(repo_name, [])
-            epics = (scan_data or {}).get('epics', {}).get(repo_name, [])
-            stories = (scan_data or {}).get('user_stories', {}).get(repo_name, [])
+            repo_scan = store.load_repo(repo_name) if has_scan else None
+            scan_file = store.source_file(repo_name)
+            test_info = (repo_scan or {}).get('tests', {})
+            test_cases = (repo_scan or {}).get('test_cases', {})
+            frameworks = (repo_scan or {}).get('test_frameworks', [])
+            epics = (repo_scan or {}).get('epics', [])
+            stories = (repo_scan or {}).get('user_stories', [])
             coverage_value, coverage_reason = self._coverage_status(repo_name)
-            tests_count = test_info.get('count') if scan_data else None
+            tests_count = test_info.get('count') if repo_scan else None
             no_test_coverage = coverage_value is None or (tests_count == 0)
             untested_epics = epics if no_test_coverage else []
             untested_stories = stories if no_test_coverage else []
+            traceability, traceability_file = self._load_traceability(repo_name)
+            repo_inputs = [str(scan_file.relative_to(self.root_dir))] if repo_scan else []
+            untested_inputs = list(repo_inputs)
+            if traceability is not None:
+                untested_inputs.append(str(traceability_file.relative_to(self.root_dir)))
 
             repo_metrics = {
                 "metric_id": f"repo.tests.{repo_name}",
                 "repo": repo_name,
                 "repos": [repo_name],
-                "inputs": [str(scan_file.relative_to(self.root_dir))] if scan_data else [],
+                "inputs": repo_inputs,
                 "time_range": {"start": None, "end": None},
                 "test_files": tests_count,
-                "test_frameworks": frameworks if scan_data else None,
-                "epics": len(epics) if scan_data else None,
-                "user_stories": len(stories) if scan_data else None,
-                "sample_test_files": test_info.get('files', [])[:3] if scan_data else None,
+                "test_files_by_language": test_info.get('by_language', {}) if repo_scan else None,
+                "test_cases": test_cases.get('total') if repo_scan else None,
+                "test_cases_by_framework": test_cases.get('by_framework', {}) if repo_scan else None,
+                "test_frameworks": frameworks if repo_scan else None,
+                "epics": len(epics) if repo_scan else None,
+                "user_stories": len(stories) if repo_scan else None,
+                "sample_test_files": test_info.get('files', [])[:3] if repo_scan else None,
                 "method": "Scan git_artifacts repositories for test files and epic/story references",
-                "reason": None if scan_data else "Missing github_scan_artifacts.json",
+                "reason": None if repo_scan else missing_reason,
                 "calculated_at": datetime.utcnow().isoformat() + "Z"
             }
 
@@ -125,15 +162,18 @@ class TestMetricsCalculator:
                 "metric_id": f"repo.untested_epics.{repo_name}",
                 "repo": repo_name,
                 "repos": [repo_name],
-                "inputs": [str(scan_file.relative_to(self.root_dir))] if scan_data else [],
+                "inputs": untested_inputs,
                 "time_range": {"start": None, "end": None},
                 "coverage_value": coverage_value,
                 "coverage_reason": coverage_reason,
                 "tests_count": tests_count,
                 "epics_without_coverage": untested_epics,
                 "user_stories_without_coverage": untested_stories,
-                "method": "Use scan artifacts and coverage availability to flag untested epics/user stories",
-                "reason": None if scan_data else "Missing github_scan_artifacts.json",
+                "epics_without_tests": traceability.untested(epics) if traceability else None,
+                "user_stories_without_tests": traceability.untested(stories) if traceability else None,
+                "test_files_by_epic": traceability.coverage_by_artifact(epics) if traceability else None,
+                "method": "Use scan artifacts and coverage availability to flag untested epics/user stories; look up referencing tests in the traceability index",
+                "reason": None if repo_scan else missing_reason,
                 "calculated_at": datetime.utcnow().isoformat() + "Z"
             }
             
@@ -144,6 +184,9 @@ class TestMetricsCalculator:
             
             results[repo_name] = repo_metrics
 
+            if traceability is not None:
+                untested_global["epics_without_tests"][repo_name] = untested_metrics["epics_without_tests"]
+
             if no_test_coverage:
                 untested_global["repos_without_coverage"].append(repo_name)
                 untested_global["epics_without_coverage"][repo_name] = untested_epics
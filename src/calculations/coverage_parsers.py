@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Streaming coverage report parsers
+Reads JaCoCo and Cobertura XML reports with iterparse, detaching each element
+once processed, so report totals and per-package/class counters are available
+in constant memory even for multi-hundred-MB multi-module reports
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+
+@dataclass
+class CoverageCounter:
+    """Covered/missed count of one coverage type (LINE, BRANCH, ...)"""
+    type: str
+    covered: int = 0
+    missed: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.covered + self.missed
+
+    @property
+    def percentage(self) -> Optional[float]:
+        """Covered share in percent, None when there is nothing to cover"""
+        if self.total == 0:
+            return None
+        return round(self.covered / self.total * 100, 2)
+
+    def add(self, other: "CoverageCounter"):
+        self.covered += other.covered
+        self.missed += other.missed
+
+
+Counters = Dict[str, CoverageCounter]
+
+JACOCO_LEVELS = ("group", "package", "class", "sourcefile", "method")
+COBERTURA_LEVELS = ("package", "class")
+
+
+def _streamed(path: Union[str, Path]) -> Iterator[Tuple[str, ET.Element, Optional[ET.Element]]]:
+    """
+    Yield ('start'|'end', element, parent) while parsing
+
+    After an 'end' event is handled the element is detached from its parent,
+    so only the currently open branch of the tree is held in memory. Elements
+    named 'counter' stay attached until their parent ends.
+    """
+    stack = []
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            parent = stack[-1] if stack else None
+            stack.append(elem)
+            yield event, elem, parent
+            continue
+        stack.pop()
+        parent = stack[-1] if stack else None
+        yield event, elem, parent
+        if elem.tag == "counter":
+            continue
+        if parent is not None:
+            parent.remove(elem)
+        else:
+            elem.clear()
+
+
+def _jacoco_counters(elem: ET.Element) -> Counters:
+    """Direct <counter> children of a JaCoCo element"""
+    counters = {}
+    for counter in elem.findall("counter"):
+        counter_type = counter.get("type")
+        counters[counter_type] = CoverageCounter(
+            type=counter_type,
+            covered=int(counter.get("covered", 0)),
+            missed=int(counter.get("missed", 0))
+        )
+    return counters
+
+
+def parse_jacoco_totals(path: Union[str, Path]) -> Counters:
+    """
+    Report-level counters of a JaCoCo XML report
+
+    These are the <counter> elements directly under <report>, i.e. the totals
+    over all groups/modules, not the first per-method counter in the file.
+
+    Returns:
+        Mapping of counter type (LINE, BRANCH, INSTRUCTION, ...) -> CoverageCounter
+    """
+    for event, elem, parent in _streamed(path):
+        if event == "end" and elem.tag == "report" and parent is None:
+            return _jacoco_counters(elem)
+    return {}
+
+
+def iter_jacoco(path: Union[str, Path], level: str = "package") -> Iterator[Tuple[str, Counters]]:
+    """
+    Stream counters of every element at one level of a JaCoCo report
+
+    Args:
+        path: JaCoCo XML report
+        level: One of JACOCO_LEVELS
+
+    Yields:
+        (name, counters) per element, e.g. ('com/example/service', {...})
+    """
+    if level not in JACOCO_LEVELS:
+        raise ValueError(f"Unknown JaCoCo level: {level}")
+    for event, elem, _ in _streamed(path):
+        if event == "end" and elem.tag == level:
+            yield elem.get("name", ""), _jacoco_counters(elem)
+
+
+_CONDITION = re.compile(r'\((\d+)/(\d+)\)')
+
+
+def _cobertura_line_counters(line: ET.Element, counters: Counters):
+    """Add one <line> element to LINE/BRANCH counters"""
+    hits = int(line.get("hits", 0))
+    counters["LINE"].add(CoverageCounter("LINE", covered=1 if hits else 0, missed=0 if hits else 1))
+    if line.get("branch") == "true":
+        match = _CONDITION.search(line.get("condition-coverage", ""))
+        if match:
+            covered, total = int(match.group(1)), int(match.group(2))
+            counters["BRANCH"].add(CoverageCounter("BRANCH", covered=covered, missed=total - covered))
+
+
+def _empty_counters() -> Counters:
+    return {"LINE": CoverageCounter("LINE"), "BRANCH": CoverageCounter("BRANCH")}
+
+
+def parse_cobertura_totals(path: Union[str, Path]) -> Counters:
+    """
+    Report-level LINE and BRANCH counters of a Cobertura XML report (coverage.py, Istanbul, ...)
+
+    Uses the summary attributes of <coverage> and stops reading right there;
+    only reports without them are streamed to sum their <line> elements.
+    """
+    counters = _empty_counters()
+    in_methods = False  # <methods> repeats the class's lines
+    for event, elem, parent in _streamed(path):
+        if elem.tag == "methods":
+            in_methods = event == "start"
+            continue
+        if event == "start" and parent is None:
+            lines_valid, lines_covered = elem.get("lines-valid"), elem.get("lines-covered")
+            if lines_valid is None or lines_covered is None:
+                continue
+            counters["LINE"] = CoverageCounter("LINE", covered=int(lines_covered),
+                                               missed=int(lines_valid) - int(lines_covered))
+            branches_valid, branches_covered = elem.get("branches-valid"), elem.get("branches-covered")
+            if branches_valid is not None and branches_covered is not None:
+                counters["BRANCH"] = CoverageCounter("BRANCH", covered=int(branches_covered),
+                                                     missed=int(branches_valid) - int(branches_covered))
+            return counters
+        if event == "end" and elem.tag == "line" and not in_methods:
+            _cobertura_line_counters(elem, counters)
+    return counters
+
+
+def iter_cobertura(path: Union[str, Path], level: str = "package") -> Iterator[Tuple[str, Counters]]:
+    """
+    Stream LINE/BRANCH counters of every package or class of a Cobertura report
+
+    Args:
+        path: Cobertura XML report
+        level: One of COBERTURA_LEVELS
+
+    Yields:
+        (name, counters) per element
+    """
+    if level not in COBERTURA_LEVELS:
+        raise ValueError(f"Unknown Cobertura level: {level}")
+    package_counters = class_counters = None
+    in_methods = False  # <methods> repeats the class's lines
+    for event, elem, _ in _streamed(path):
+        if elem.tag == "methods":
+            in_methods = event == "start"
+            continue
+        if event == "start":
+            if elem.tag == "package":
+                package_counters = _empty_counters()
+            elif elem.tag == "class":
+                class_counters = _empty_counters()
+            continue
+        if elem.tag == "line" and class_counters is not None and not in_methods:
+            _cobertura_line_counters(elem, class_counters)
+        elif elem.tag == "class" and class_counters is not None:
+            if level == "class":
+                yield elem.get("name", ""), class_counters
+            if package_counters is not None:
+                for counter_type, counter in class_counters.items():
+                    package_counters[counter_type].add(counter)
+            class_counters = None
+        elif elem.tag == "package" and package_counters is not None:
+            if level == "package":
+                yield elem.get("name", ""), package_counters
+            package_counters = None
+
+
+def iter_jacoco_sourcefiles(path: Union[str, Path]) -> Iterator[Tuple[str, str, Counters]]:
+    """
+    Stream counters per source file of a JaCoCo report
+
+    The same package and file name can occur in several modules of a
+    multi-module report, so each file comes with its module: the names of
+    the enclosing <group> elements, or the report name when there are none.
+
+    Yields:
+        (module, '<package>/<sourcefile>', counters), e.g. ('service', 'com/example/Foo.java', {...})
+    """
+    report_name = ""
+    groups = []
+    package = ""
+    for event, elem, parent in _streamed(path):
+        if elem.tag == "report" and parent is None and event == "start":
+            report_name = elem.get("name", "")
+        elif elem.tag == "group":
+            if event == "start":
+                groups.append(elem.get("name", ""))
+            else:
+                groups.pop()
+        elif elem.tag == "package" and event == "start":
+            package = elem.get("name", "")
+        elif elem.tag == "sourcefile" and event == "end":
+            name = elem.get("name", "")
+            module = "/".join(groups) if groups else report_name
+            yield module, (f"{package}/{name}" if package else name), _jacoco_counters(elem)
+
+
+def iter_cobertura_files(path: Union[str, Path]) -> Iterator[Tuple[str, Counters]]:
+    """
+    Stream LINE/BRANCH counters per class of a Cobertura report, keyed by file
+
+    Several classes may share a file; callers aggregate by file name.
+
+    Yields:
+        (filename, counters) per <class>
+    """
+    counters = None
+    in_methods = False  # <methods> repeats the class's lines
+    for event, elem, _ in _streamed(path):
+        if elem.tag == "methods":
+            in_methods = event == "start"
+        elif elem.tag == "class":
+            if event == "start":
+                counters = _empty_counters()
+            else:
+                yield elem.get("filename") or elem.get("name", ""), counters
+                counters = None
+        elif elem.tag == "line" and event == "end" and counters is not None and not in_methods:
+            _cobertura_line_counters(elem, counters)
+
+
+def iter_jacoco_line_hits(path: Union[str, Path]) -> Iterator[Tuple[str, str, Dict[int, int]]]:
+    """
+    Stream per-line instruction hits per source file of a JaCoCo report
+
+    Yields:
+        (module, '<package>/<sourcefile>', {line: covered instructions}) -
+        only lines with instructions are listed; module as for
+        iter_jacoco_sourcefiles
+    """
+    report_name = ""
+    groups = []
+    package = ""
+    lines: Dict[int, int] = {}
+    for event, elem, parent in _streamed(path):
+        if elem.tag == "report" and parent is None and event == "start":
+            report_name = elem.get("name", "")
+        elif elem.tag == "group":
+            if event == "start":
+                groups.append(elem.get("name", ""))
+            else:
+                groups.pop()
+        elif elem.tag == "package" and event == "start":
+            package = elem.get("name", "")
+        elif elem.tag == "sourcefile" and event == "start":
+            lines = {}
+        elif elem.tag == "line" and event == "end":
+            covered, missed = int(elem.get("ci", 0)), int(elem.get("mi", 0))
+            if covered or missed:
+                lines[int(elem.get("nr", 0))] = covered
+        elif elem.tag == "sourcefile" and event == "end":
+            name = elem.get("name", "")
+            module = "/".join(groups) if groups else report_name
+            yield module, (f"{package}/{name}" if package else name), lines
+
+
+def iter_cobertura_line_hits(path: Union[str, Path]) -> Iterator[Tuple[str, Dict[int, int]]]:
+    """
+    Stream per-line hits per class of a Cobertura report, keyed by file
+
+    Yields:
+        (filename, {line: hits}) per <class>
+    """
+    lines: Optional[Dict[int, int]] = None
+    in_methods = False  # <methods> repeats the class's lines
+    for event, elem, _ in _streamed(path):
+        if elem.tag == "methods":
+            in_methods = event == "start"
+        elif elem.tag == "class":
+            if event == "start":
+                lines = {}
+            else:
+                yield elem.get("filename") or elem.get("name", ""), lines
+                lines = None
+        elif elem.tag == "line" and event == "end" and lines is not None and not in_methods:
+            number = int(elem.get("number", 0))
+            lines[number] = lines.get(number, 0) + int(elem.get("hits", 0))
+
+
+def detect_format(path: Union[str, Path]) -> Optional[str]:
+    """'jacoco' or 'cobertura' from the report's root element; None if neither"""
+    try:
+        for _, elem in ET.iterparse(str(path), events=("start",)):
+            return {"report": "jacoco", "coverage": "cobertura"}.get(elem.tag)
+    except ET.ParseError:
+        return None
+    return None
+
+
+def parse_coverage_totals(path: Union[str, Path]) -> Counters:
+    """
+    Report-level counters of a JaCoCo or Cobertura XML report
+
+    Raises:
+        ValueError: If the file is neither format
+    """
+    report_format = detect_format(path)
+    if report_format == "jacoco":
+        return parse_jacoco_totals(path)
+    if report_format == "cobertura":
+        return parse_cobertura_totals(path)
+    raise ValueError(f"Unrecognized coverage report format: {path}")
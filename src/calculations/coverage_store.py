@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Per-file coverage store
+Persists per-file covered/missed line and branch counts from JaCoCo,
+Cobertura and LCOV reports in one SQLite database per repository, with
+query helpers for drill-down by package, directory prefix and language
+"""
+
+import os
+import sqlite3
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.calculations.coverage_parsers import detect_format, iter_cobertura_files, iter_jacoco_sourcefiles
+from src.calculations.lcov_parser import iter_lcov_records
+
+
+LANGUAGES = {
+    ".java": "java", ".kt": "kotlin", ".scala": "scala", ".groovy": "groovy",
+    ".py": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "typescript",
+    ".go": "go", ".c": "c", ".h": "c", ".cc": "cpp", ".cpp": "cpp", ".hpp": "cpp",
+}
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (
+    module TEXT NOT NULL,
+    path TEXT NOT NULL,
+    package TEXT NOT NULL,
+    language TEXT NOT NULL,
+    report_format TEXT NOT NULL,
+    lines_covered INTEGER NOT NULL,
+    lines_missed INTEGER NOT NULL,
+    branches_covered INTEGER NOT NULL,
+    branches_missed INTEGER NOT NULL,
+    PRIMARY KEY (module, path)
+);
+CREATE INDEX files_package ON files (module, package);
+CREATE INDEX files_language ON files (language);
+"""
+
+# (lines_covered, lines_missed, branches_covered, branches_missed)
+FileCounts = Tuple[int, int, int, int]
+
+# (module, relative file path); module is the JaCoCo group path, or the report name for
+# single-module JaCoCo reports, and '' for Cobertura/LCOV
+FileKey = Tuple[str, str]
+
+
+def language_of(path: str) -> str:
+    """Language from a file extension ('other' when unknown)"""
+    return LANGUAGES.get(PurePosixPath(path).suffix.lower(), "other")
+
+
+def _coverage(covered: int, missed: int) -> Optional[float]:
+    total = covered + missed
+    return round(covered / total * 100, 2) if total else None
+
+
+def read_report(report: Path, source_root: Optional[Path] = None) -> Tuple[str, Dict[FileKey, FileCounts]]:
+    """
+    Per-file counts from one coverage report
+
+    Args:
+        report: JaCoCo/Cobertura XML or LCOV tracefile
+        source_root: Absolute source paths under this root are made relative to it
+
+    Returns:
+        (report format, {(module, relative file path): FileCounts})
+    """
+    files: Dict[FileKey, List[int]] = {}
+
+    def add(path: str, counts: FileCounts, module: str = ""):
+        totals = files.setdefault((module, path), [0, 0, 0, 0])
+        for i, value in enumerate(counts):
+            totals[i] += value
+
+    report_format = "lcov" if report.name.endswith(".info") else detect_format(report)
+    if report_format == "jacoco":
+        for module, path, counters in iter_jacoco_sourcefiles(report):
+            line, branch = counters.get("LINE"), counters.get("BRANCH")
+            add(path, (line.covered if line else 0, line.missed if line else 0,
+                       branch.covered if branch else 0, branch.missed if branch else 0), module)
+    elif report_format == "cobertura":
+        for path, counters in iter_cobertura_files(report):
+            add(path, (counters["LINE"].covered, counters["LINE"].missed,
+                       counters["BRANCH"].covered, counters["BRANCH"].missed))
+    elif report_format == "lcov":
+        root = f"{Path(source_root).resolve()}{os.sep}" if source_root else None
+        for record in iter_lcov_records(report):
+            path = record.source
+            if root and path.startswith(root):
+                path = path[len(root):]
+            add(path.replace(os.sep, "/"), (record.lines_hit, record.lines_found - record.lines_hit,
+                                            record.branches_hit, record.branches_found - record.branches_hit))
+    else:
+        raise ValueError(f"Unrecognized coverage report format: {report}")
+    return report_format, {key: tuple(counts) for key, counts in files.items()}
+
+
+class CoverageStore:
+    """SQLite store of per-file coverage for one repository"""
+
+    VERSION = 2
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+
+    def build(self, reports: Iterable[Path], source_root: Optional[Path] = None) -> int:
+        """
+        Rebuild the store from coverage reports
+
+        Reports are applied oldest first; when two reports cover the same file
+        of the same module the newer one wins. The database is written to a temporary file and
+        moved into place, so readers never see a partial store.
+
+        Args:
+            reports: Coverage report files
+            source_root: Repository root used to relativize absolute LCOV paths
+
+        Returns:
+            Number of files stored
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.db_path.with_name(self.db_path.name + ".tmp")
+        if temp_path.exists():
+            temp_path.unlink()
+
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.executescript(SCHEMA)
+            connection.execute("INSERT INTO meta VALUES ('version', ?)", (str(self.VERSION),))
+            for report in sorted(reports, key=lambda r: Path(r).stat().st_mtime):
+                report_format, files = read_report(Path(report), source_root)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (module, path, str(PurePosixPath(path).parent), language_of(path), report_format) + counts
+                        for (module, path), counts in files.items()
+                    ]
+                )
+            connection.commit()
+            count = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        finally:
+            connection.close()
+        os.replace(temp_path, self.db_path)
+        return count
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        connection.row_factory = sqlite3.Row
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict:
+        return {
+            "files": row["files"],
+            "lines_covered": row["lines_covered"],
+            "lines_missed": row["lines_missed"],
+            "line_coverage": _coverage(row["lines_covered"], row["lines_missed"]),
+            "branch_coverage": _coverage(row["branches_covered"], row["branches_missed"])
+        }
+
+    _SUMS = """COUNT(*) AS files, COALESCE(SUM(lines_covered), 0) AS lines_covered,
+               COALESCE(SUM(lines_missed), 0) AS lines_missed,
+               COALESCE(SUM(branches_covered), 0) AS branches_covered,
+               COALESCE(SUM(branches_missed), 0) AS branches_missed"""
+
+    def totals(self) -> Dict:
+        """Line/branch coverage over all stored files"""
+        return self._summary(self._query(f"SELECT {self._SUMS} FROM files")[0])
+
+    def top_uncovered_packages(self, limit: int = 10) -> List[Dict]:
+        """Packages (or directories) with the most missed lines, per module"""
+        rows = self._query(
+            f"SELECT module, package, {self._SUMS} FROM files GROUP BY module, package "
+            "HAVING SUM(lines_missed) > 0 ORDER BY SUM(lines_missed) DESC, module, package LIMIT ?",
+            (limit,)
+        )
+        return [{"module": row["module"], "package": row["package"], **self._summary(row)} for row in rows]
+
+    def coverage_by_prefix(self, prefix: str) -> Dict:
+        """
+        Coverage of all files under a path prefix, across modules
+
+        Paths are stored as the report gives them: JaCoCo files are
+        package-relative (prefix 'com/example'), Cobertura files are relative
+        to the report's source root and LCOV files to the repository
+        (prefix e.g. 'src/app').
+        """
+        prefix = prefix.strip("/")
+        if not prefix:
+            return self.totals()
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        row = self._query(
+            f"SELECT {self._SUMS} FROM files WHERE path = ? OR path LIKE ? ESCAPE '\\'",
+            (prefix, escaped + "/%")
+        )[0]
+        return {"prefix": prefix, **self._summary(row)}
+
+    def coverage_by_language(self) -> List[Dict]:
+        """Coverage per language, largest first"""
+        rows = self._query(
+            f"SELECT language, {self._SUMS} FROM files GROUP BY language "
+            "ORDER BY SUM(lines_covered + lines_missed) DESC, language"
+        )
+        return [{"language": row["language"], **self._summary(row)} for row in rows]
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Diff coverage
+Builds a per-file hit-line bitmap index from collected coverage reports and
+intersects it with `git diff --unified=0` hunks streamed from the clone, giving
+the share of recently changed, instrumented lines that tests cover
+"""
+
+import os
+import re
+import subprocess
+from collections import defaultdict
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.calculations.coverage_parsers import detect_format, iter_cobertura_line_hits, iter_jacoco_line_hits
+from src.calculations.lcov_parser import iter_lcov_records
+
+
+# Bitmap values per line
+NOT_INSTRUMENTED = 0
+MISSED = 1
+COVERED = 2
+
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+_HUNK = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+# (module, report path); module is the JaCoCo module (see iter_jacoco_line_hits), else ''
+FileKey = Tuple[str, str]
+
+
+class LineCoverageIndex:
+    """
+    Per-file line bitmaps (one byte per line: not instrumented / missed / covered)
+
+    Bitmaps are keyed by (module, report path), so same-named files of
+    different modules in a multi-module JaCoCo report stay apart. Report
+    paths rarely match repository paths exactly (JaCoCo uses package paths,
+    Cobertura paths relative to a source root), so lookups match on the
+    longest common path suffix among files sharing a base name; among equal
+    suffixes, a file whose module names a directory of the repository path
+    wins. Matches that stay ambiguous resolve to nothing rather than to an
+    arbitrary module.
+    """
+
+    def __init__(self):
+        self._bitmaps: Dict[FileKey, bytearray] = {}
+        self._by_name: Dict[str, List[FileKey]] = defaultdict(list)
+        self._resolved: Dict[str, Optional[FileKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._bitmaps)
+
+    def add(self, path: str, line_hits: Dict[int, int], module: str = ""):
+        """Merge per-line hits for a file; a line covered in any report counts as covered"""
+        path = path.replace(os.sep, "/")
+        while path.startswith("./"):
+            path = path[2:]
+        path = path.lstrip("/")
+        if not line_hits:
+            return
+        key = (module, path)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bitmap = self._bitmaps[key] = bytearray()
+            self._by_name[PurePosixPath(path).name].append(key)
+            self._resolved.clear()
+        top = max(line_hits)
+        if top >= len(bitmap):
+            bitmap.extend(bytes(top + 1 - len(bitmap)))
+        for line, hits in line_hits.items():
+            if line > 0:
+                bitmap[line] = max(bitmap[line], COVERED if hits > 0 else MISSED)
+
+    def add_report(self, report: Path, source_root: Optional[Path] = None):
+        """
+        Add a JaCoCo/Cobertura XML report or LCOV tracefile
+
+        Args:
+            report: Coverage report
+            source_root: Absolute LCOV source paths under this root are made relative
+        """
+        if report.name.endswith(".info"):
+            root = f"{Path(source_root).resolve()}{os.sep}" if source_root else None
+            for record in iter_lcov_records(report, with_lines=True):
+                path = record.source
+                if root and path.startswith(root):
+                    path = path[len(root):]
+                self.add(path, record.line_hits)
+            return
+        report_format = detect_format(report)
+        if report_format == "jacoco":
+            for module, path, line_hits in iter_jacoco_line_hits(report):
+                self.add(path, line_hits, module)
+        elif report_format == "cobertura":
+            for path, line_hits in iter_cobertura_line_hits(report):
+                self.add(path, line_hits)
+        else:
+            raise ValueError(f"Unrecognized coverage report format: {report}")
+
+    def resolve(self, repo_path: str) -> Optional[FileKey]:
+        """(module, report path) matching a repository path, or None if there is no unambiguous match"""
+        if repo_path in self._resolved:
+            return self._resolved[repo_path]
+        repo_parts = PurePosixPath(repo_path).parts
+        best, matches = None, []
+        for key in self._by_name.get(PurePosixPath(repo_path).name, ()):
+            module, candidate = key
+            candidate_parts = PurePosixPath(candidate).parts
+            common = 0
+            for a, b in zip(reversed(repo_parts), reversed(candidate_parts)):
+                if a != b:
+                    break
+                common += 1
+            # The whole report path must be a suffix of the repository path (or vice versa)
+            if common != min(len(repo_parts), len(candidate_parts)):
+                continue
+            module_dir = module.rsplit("/", 1)[-1]
+            score = (common, bool(module_dir) and module_dir in repo_parts[:len(repo_parts) - common])
+            if best is None or score > best:
+                best, matches = score, [key]
+            elif score == best:
+                matches.append(key)
+        match = matches[0] if len(matches) == 1 else None
+        self._resolved[repo_path] = match
+        return match
+
+    def bitmap(self, repo_path: str) -> Optional[bytearray]:
+        """Line bitmap for a repository path, or None when the file has no (unambiguous) coverage data"""
+        match = self.resolve(repo_path)
+        return self._bitmaps[match] if match is not None else None
+
+
+def diff_base(repo_path: Path, days: Optional[int] = None, since_tag: bool = False) -> Optional[str]:
+    """
+    Commit to diff HEAD against
+
+    Args:
+        repo_path: Git clone
+        days: Use the last commit older than this many days
+        since_tag: Use the most recent tag reachable from HEAD instead
+
+    Returns:
+        Commit SHA, the empty tree when history is shorter than the window,
+        or None if no tag exists (since_tag) or the repository cannot be read
+    """
+    def git(*args) -> Optional[str]:
+        try:
+            result = subprocess.run(["git", *args], cwd=repo_path, capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    if since_tag:
+        tag = git("describe", "--tags", "--abbrev=0", "HEAD")
+        return git("rev-parse", f"{tag}^{{commit}}") if tag else None
+    if git("rev-parse", "--verify", "HEAD") is None:
+        return None
+    return git("rev-list", "-1", f"--before={days or 30} days ago", "HEAD") or EMPTY_TREE
+
+
+def commit_date(repo_path: Path, ref: str) -> Optional[str]:
+    """Committer date of a commit in ISO 8601, or None (e.g. for the empty tree)"""
+    if ref == EMPTY_TREE:
+        return None
+    try:
+        result = subprocess.run(["git", "show", "-s", "--format=%cI", ref], cwd=repo_path,
+                                capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None if result.returncode == 0 else None
+
+
+def iter_changed_lines(repo_path: Path, base: str, head: str = "HEAD") -> Iterator[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    Stream added/modified line ranges per file from `git diff --unified=0`
+
+    Yields:
+        (path, [(first_line, last_line), ...]) per changed file, in new-file line numbers
+    """
+    process = subprocess.Popen(
+        ["git", "diff", "--unified=0", "--no-color", "--no-ext-diff", "-M", base, head],
+        cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, encoding="utf-8", errors="replace"
+    )
+    path, ranges = None, []
+    try:
+        for line in process.stdout:
+            if line.startswith("+++ "):
+                if path is not None and ranges:
+                    yield path, ranges
+                target = line[4:].rstrip("\n")
+                path = target[2:] if target.startswith("b/") else None
+                ranges = []
+            elif line.startswith("@@") and path is not None:
+                hunk = _HUNK.match(line)
+                if hunk:
+                    start = int(hunk.group(1))
+                    count = int(hunk.group(2)) if hunk.group(2) is not None else 1
+                    if count:
+                        ranges.append((start, start + count - 1))
+        if path is not None and ranges:
+            yield path, ranges
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"git diff {base}..{head} failed (exit code {process.returncode})")
+
+
+def diff_coverage(index: LineCoverageIndex, changes: Iterable[Tuple[str, List[Tuple[int, int]]]],
+                  top_files: int = 20) -> Dict:
+    """
+    Intersect changed line ranges with the coverage index
+
+    Each changed line is one bitmap lookup, so cost is linear in changed lines.
+
+    Returns:
+        Dictionary with changed/instrumented/covered line counts, the
+        coverage percentage (None with no instrumented changed lines) and the
+        files with the most uncovered changed lines
+    """
+    totals = {"changed_files": 0, "changed_lines": 0, "instrumented_lines": 0,
+              "covered_lines": 0, "files_without_coverage": 0}
+    files = []
+    for path, ranges in changes:
+        totals["changed_files"] += 1
+        changed = sum(last - first + 1 for first, last in ranges)
+        totals["changed_lines"] += changed
+        bitmap = index.bitmap(path)
+        if bitmap is None:
+            totals["files_without_coverage"] += 1
+            continue
+        instrumented = covered = 0
+        size = len(bitmap)
+        for first, last in ranges:
+            segment = bitmap[first:min(last + 1, size)]
+            covered += segment.count(COVERED)
+            instrumented += len(segment) - segment.count(NOT_INSTRUMENTED)
+        totals["instrumented_lines"] += instrumented
+        totals["covered_lines"] += covered
+        if instrumented > covered:
+            files.append({"path": path, "changed_lines": changed,
+                          "instrumented_lines": instrumented, "uncovered_lines": instrumented - covered})
+
+    instrumented = totals["instrumented_lines"]
+    totals["value"] = round(totals["covered_lines"] / instrumented * 100, 2) if instrumented else None
+    files.sort(key=lambda f: (-f["uncovered_lines"], f["path"]))
+    totals["top_uncovered_files"] = files[:top_files]
+    return totals
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+LCOV tracefile parser
+Reads lcov.info files in large binary blocks split on end_of_record and
+extracts per-file line, branch and function counts with compiled regexes,
+using the LF/LH-style summaries when present and DA/BRDA/FNDA entries only
+otherwise, so multi-GB merged tracefiles parse quickly in bounded memory
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+
+BLOCK_SIZE = 16 * 1024 * 1024
+END_OF_RECORD = b"end_of_record"
+
+# Patterns start with a literal newline rather than a MULTILINE '^' so the regex
+# engine can skip ahead by literal search; every record block starts with b"\n"
+_SOURCE = re.compile(rb'\nSF:([^\r\n]*)')
+_SUMMARY = re.compile(rb'\n(LF|LH|BRF|BRH|FNF|FNH):(\d+)')
+_DA = re.compile(rb'\nDA:(\d+),(-?\d+)')
+_DA_LINE = re.compile(rb'\nDA:(\d+),')
+_DA_HIT_LINE = re.compile(rb'\nDA:(\d+),0*[1-9]')
+_BRDA = re.compile(rb'\nBRDA:[^,\n]*,[^,\n]*,[^,\n]*,(\S+)')
+_FNDA = re.compile(rb'\nFNDA:(\d+),')
+_FN = re.compile(rb'\nFN:')
+
+
+@dataclass
+class LcovRecord:
+    """Coverage counts of one source file (one SF ... end_of_record block)"""
+    source: str
+    lines_found: int = 0
+    lines_hit: int = 0
+    branches_found: int = 0
+    branches_hit: int = 0
+    functions_found: int = 0
+    functions_hit: int = 0
+    line_hits: Optional[Dict[int, int]] = None  # line -> hits, only when requested
+
+    @property
+    def line_percentage(self) -> Optional[float]:
+        if self.lines_found == 0:
+            return None
+        return round(self.lines_hit / self.lines_found * 100, 2)
+
+
+def _parse_record(block: bytes, with_lines: bool) -> Optional[LcovRecord]:
+    """Parse one record; None for blocks without a source file"""
+    source = _SOURCE.search(block)
+    if source is None:
+        return None
+    record = LcovRecord(source=source.group(1).decode('utf-8', errors='replace'))
+    summary = {tag: int(value) for tag, value in _SUMMARY.findall(block)}
+
+    if b"LF" in summary and b"LH" in summary:
+        record.lines_found, record.lines_hit = summary[b"LF"], summary[b"LH"]
+    else:
+        # Distinct line numbers; a line listed twice counts once
+        record.lines_found = len(set(_DA_LINE.findall(block)))
+        record.lines_hit = len(set(_DA_HIT_LINE.findall(block)))
+    if with_lines:
+        hits = {}
+        for number, count in _DA.findall(block):
+            hits[int(number)] = hits.get(int(number), 0) + max(int(count), 0)
+        record.line_hits = hits
+
+    if b"BRF" in summary and b"BRH" in summary:
+        record.branches_found, record.branches_hit = summary[b"BRF"], summary[b"BRH"]
+    else:
+        taken = _BRDA.findall(block)
+        record.branches_found = len(taken)
+        record.branches_hit = sum(1 for value in taken if value not in (b"-", b"0"))
+
+    if b"FNF" in summary and b"FNH" in summary:
+        record.functions_found, record.functions_hit = summary[b"FNF"], summary[b"FNH"]
+    else:
+        record.functions_found = len(_FN.findall(block))
+        record.functions_hit = sum(1 for count in _FNDA.findall(block) if int(count))
+    return record
+
+
+def iter_lcov_records(path: Union[str, Path], with_lines: bool = False,
+                      block_size: int = BLOCK_SIZE) -> Iterator[LcovRecord]:
+    """
+    Stream per-file records from an LCOV tracefile
+
+    Args:
+        path: lcov.info file
+        with_lines: Also collect per-line hit counts (DA) into record.line_hits
+        block_size: Bytes read per step; records spanning blocks are carried over
+
+    Yields:
+        LcovRecord per SF block
+    """
+    pending = b"\n"  # blocks after a split start with the newline following end_of_record
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(block_size)
+            buffer = pending + data
+            if not data:
+                # Trailing record without end_of_record
+                if buffer.strip():
+                    record = _parse_record(buffer, with_lines)
+                    if record is not None:
+                        yield record
+                return
+            blocks = buffer.split(END_OF_RECORD)
+            pending = blocks.pop()
+            for block in blocks:
+                record = _parse_record(block, with_lines)
+                if record is not None:
+                    yield record
+
+
+def summarize_lcov(paths: Iterable[Union[str, Path]]) -> Dict[str, int]:
+    """
+    Total line, branch and function counts over LCOV tracefiles
+
+    Returns:
+        Dictionary with files, lines_found, lines_hit, branches_found,
+        branches_hit, functions_found and functions_hit
+    """
+    totals = {"files": 0, "lines_found": 0, "lines_hit": 0, "branches_found": 0,
+              "branches_hit": 0, "functions_found": 0, "functions_hit": 0}
+    for path in paths:
+        for record in iter_lcov_records(path):
+            totals["files"] += 1
+            for key in ("lines_found", "lines_hit", "branches_found", "branches_hit",
+                        "functions_found", "functions_hit"):
+                totals[key] += getattr(record, key)
+    return totals
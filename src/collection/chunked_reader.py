@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory chunked reading for oversized files
+Large files are read in line-aligned chunks that repeat the tail of the previous
+chunk, so patterns spanning a chunk boundary still match while peak memory stays
+flat; per-file-type size limits skip files too large to be worth scanning
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+
+# Files up to this size are read whole; larger ones are scanned in chunks
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Characters of the previous chunk repeated at the start of the next one
+OVERLAP = 16 * 1024
+
+# Largest file scanned per extension ('*' applies to all others)
+DEFAULT_MAX_FILE_SIZES = {
+    "*": 256 * 1024 * 1024,
+    ".json": 32 * 1024 * 1024,
+    ".csv": 32 * 1024 * 1024,
+    ".xml": 64 * 1024 * 1024,
+    ".snap": 16 * 1024 * 1024,
+}
+
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3,
+               "KIB": 1024, "MIB": 1024 ** 2, "GIB": 1024 ** 3}
+
+
+def parse_size(value: Union[int, str]) -> int:
+    """
+    Parse a size such as 1048576, "64MB" or "512 KiB" into bytes
+
+    Raises:
+        ValueError: If the size cannot be parsed
+    """
+    if isinstance(value, int):
+        return value
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([A-Za-z]*)\s*', str(value))
+    if not match or match.group(2).upper() not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def max_file_sizes(overrides: Optional[Dict[str, Union[int, str]]] = None) -> Dict[str, int]:
+    """
+    Merge size limit overrides into the defaults
+
+    Args:
+        overrides: Mapping of extension (e.g. '.md', or '*') -> size
+
+    Returns:
+        Mapping of lowercased extension -> bytes
+    """
+    limits = dict(DEFAULT_MAX_FILE_SIZES)
+    for extension, size in (overrides or {}).items():
+        extension = extension.lower()
+        if extension != "*" and not extension.startswith("."):
+            extension = "." + extension
+        limits[extension] = parse_size(size)
+    return limits
+
+
+def size_limit(path: Union[str, Path], limits: Dict[str, int]) -> int:
+    """Size limit for a file according to its extension"""
+    return limits.get(Path(path).suffix.lower(), limits["*"])
+
+
+def exceeds_limit(path: Union[str, Path], limits: Dict[str, int]) -> bool:
+    """Check whether a file is larger than its size limit"""
+    try:
+        return os.path.getsize(path) > size_limit(path, limits)
+    except OSError:
+        return False
+
+
+@dataclass
+class Chunk:
+    """A line-aligned slice of a file"""
+    text: str
+    start_line: int  # Line number of the first character of text
+    overlap: int  # Leading characters already covered by the previous chunk
+
+
+class ChunkedFile:
+    """
+    Re-iterable sequence of overlapping chunks of a text file
+
+    Each iteration reopens the file, so several passes never hold more than
+    about two chunks plus the overlap in memory.
+    """
+
+    def __init__(self, path: Union[str, Path], chunk_size: int = CHUNK_SIZE, overlap: int = OVERLAP):
+        """
+        Args:
+            path: File to read
+            chunk_size: Characters read per step
+            overlap: Characters repeated from the previous chunk
+        """
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.overlap = min(overlap, chunk_size // 2)
+
+    def _overlap_start(self, text: str) -> int:
+        """Start of the carried-over tail, on a line boundary where possible"""
+        lower = max(len(text) - self.overlap, 0)
+        newline = text.find("\n", lower)
+        if newline != -1 and newline + 1 < len(text):
+            return newline + 1
+        # The last line alone is longer than the overlap
+        return lower
+
+    def __iter__(self) -> Iterator[Chunk]:
+        carry = ""  # tail of the previous chunk, already scanned
+        pending = ""  # read but not yet scanned
+        line = 1  # line number of the first character of carry
+        with open(self.path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                data = f.read(self.chunk_size)
+                at_eof = len(data) < self.chunk_size
+                buffer = carry + pending + data
+
+                cut = len(buffer)
+                if not at_eof:
+                    # End chunks on a line boundary; one huge line is cut hard
+                    cut = buffer.rfind("\n", len(carry)) + 1 or len(buffer)
+
+                text = buffer[:cut]
+                if len(text) > len(carry):
+                    yield Chunk(text=text, start_line=line, overlap=len(carry))
+                if at_eof:
+                    return
+
+                pending = buffer[cut:]
+                overlap_start = self._overlap_start(text)
+                line += text.count("\n", 0, overlap_start)
+                carry = text[overlap_start:]
+
+
+def open_for_scan(path: Union[str, Path], limits: Dict[str, int],
+                  chunk_size: int = CHUNK_SIZE) -> Union[str, ChunkedFile, None]:
+    """
+    Open a file for scanning according to its size
+
+    Args:
+        path: File to read
+        limits: Size limits from max_file_sizes()
+        chunk_size: Files above this size are returned as a ChunkedFile
+
+    Returns:
+        File text, a ChunkedFile for large files, or None if the file is
+        unreadable or exceeds its size limit
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+    if size > size_limit(path, limits):
+        return None
+    if size > chunk_size:
+        return ChunkedFile(path, chunk_size=chunk_size)
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    except (IOError, OSError):
+        return None
@@ -4,9 +4,17 @@ CI Environment validation and detection
 Checks for required tools and services
 """
 
+import hashlib
+import json
+import os
+import shutil
 import subprocess
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from dataclasses import asdict, dataclass, field
 
 
 @dataclass
@@ -37,9 +45,103 @@ class EnvironmentReport:
             return "warnings"
 
 
+class ToolProbeCache:
+    """
+    Cache of tool probe results
+
+    Results are kept per process and, when a cache file is given, on disk for
+    `ttl` seconds. Entries are keyed by PATH and the resolved binary's path and
+    mtime (plus the working directory for relative commands such as
+    ./gradlew), so upgrading or replacing a tool invalidates its entry.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_file: Optional[Path] = None, ttl: float = 3600):
+        """
+        Args:
+            cache_file: Optional JSON file shared across runs
+            ttl: Seconds an on-disk entry stays valid
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl = ttl
+        self._memory: Dict[str, EnvironmentCheckResult] = {}
+        self._disk: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.probes = 0
+        self._load()
+
+    def _load(self):
+        """Load unexpired on-disk entries"""
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, json.JSONDecodeError):
+            return
+        if data.get("version") != self.VERSION:
+            return
+        now = time.time()
+        self._disk = {
+            key: entry for key, entry in data.get("probes", {}).items()
+            if now - entry.get("checked_at", 0) < self.ttl
+        }
+
+    @staticmethod
+    def resolve(executable: str) -> Optional[str]:
+        """Absolute path of an executable as the shell would run it; None if not found"""
+        if os.sep in executable or (os.altsep and os.altsep in executable):
+            path = os.path.abspath(executable)
+            return path if os.path.isfile(path) else None
+        return shutil.which(executable)
+
+    def key(self, tool_name: str, command: List[str]) -> str:
+        """Cache key for a probe"""
+        binary = self.resolve(command[0])
+        try:
+            # stat follows symlinks, so the mtime is the real binary's
+            identity = f"{binary}:{os.stat(binary).st_mtime_ns}" if binary else "missing"
+        except OSError:
+            identity = "missing"
+        payload = "\0".join([tool_name, " ".join(command), os.environ.get("PATH", ""), identity])
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[EnvironmentCheckResult]:
+        """Look up a probe result"""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is None and key in self._disk:
+                result = self._memory[key] = EnvironmentCheckResult(**self._disk[key]["result"])
+            if result is not None:
+                self.hits += 1
+            return result
+
+    def put(self, key: str, result: EnvironmentCheckResult):
+        """Store a probe result; transient failures (timeouts, errors) stay in memory only"""
+        with self._lock:
+            self.probes += 1
+            self._memory[key] = result
+            if result.installed or result.error == "Not found in PATH":
+                self._disk[key] = {"result": asdict(result), "checked_at": time.time()}
+
+    def save(self):
+        """Persist on-disk entries"""
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with open(self.cache_file, 'w') as f:
+                json.dump({"version": self.VERSION, "probes": self._disk}, f, indent=2)
+
+
 class CIEnvironmentValidator:
     """Validates CI environment for test execution"""
 
+    # Concurrent probes when several tools are checked at once
+    PROBE_WORKERS = 8
+
     # Define tool checks: tool_name -> (command, version_flag, version_pattern)
     TOOLS = {
         'java': (['java', '-version'], '-version', None),
@@ -79,8 +181,15 @@ class CIEnvironmentValidator:
         }
     }
 
-    @staticmethod
-    def check_tool(tool_name: str) -> EnvironmentCheckResult:
+    def __init__(self, probe_cache: Optional[ToolProbeCache] = None):
+        """
+        Args:
+            probe_cache: Probe results shared by this validator's checks
+                (defaults to an in-memory cache; pass one with a file to reuse probes across runs)
+        """
+        self.probe_cache = probe_cache or ToolProbeCache()
+
+    def check_tool(self, tool_name: str) -> EnvironmentCheckResult:
         """
         Check if a tool is installed and get its version
 
@@ -93,7 +202,42 @@ class CIEnvironmentValidator:
         if tool_name not in CIEnvironmentValidator.TOOLS:
             return EnvironmentCheckResult(name=tool_name, installed=False, error="Unknown tool")
 
-        command, version_flag, version_pattern = CIEnvironmentValidator.TOOLS[tool_name]
+        command = CIEnvironmentValidator.TOOLS[tool_name][0]
+        cache = self.probe_cache
+        key = cache.key(tool_name, command)
+        result = cache.get(key)
+        if result is None:
+            result = CIEnvironmentValidator._probe(tool_name, command)
+            cache.put(key, result)
+        return result
+
+    def check_tools(self, tool_names: Iterable[str]) -> Dict[str, EnvironmentCheckResult]:
+        """
+        Check several tools, probing uncached ones concurrently
+
+        Args:
+            tool_names: Names of tools to check
+
+        Returns:
+            Mapping of tool name -> EnvironmentCheckResult, in the given order
+        """
+        tool_names = list(dict.fromkeys(tool_names))
+        if len(tool_names) <= 1:
+            return {name: self.check_tool(name) for name in tool_names}
+        workers = min(CIEnvironmentValidator.PROBE_WORKERS, len(tool_names))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self.check_tool, tool_names))
+        return dict(zip(tool_names, results))
+
+    @staticmethod
+    def _probe(tool_name: str, command: List[str]) -> EnvironmentCheckResult:
+        """Run a tool's version command"""
+        if ToolProbeCache.resolve(command[0]) is None:
+            return EnvironmentCheckResult(
+                name=tool_name,
+                installed=False,
+                error="Not found in PATH"
+            )
 
         try:
             result = subprocess.run(
@@ -150,8 +294,7 @@ class CIEnvironmentValidator:
                 return line
         return None
 
-    @staticmethod
-    def validate_language(language: str) -> EnvironmentReport:
+    def validate_language(self, language: str) -> EnvironmentReport:
         """
         Validate environment for a specific language
 
@@ -171,10 +314,11 @@ class CIEnvironmentValidator:
         requirements = CIEnvironmentValidator.LANGUAGE_REQUIREMENTS[language]
         required_tools = requirements.get('required', [])
         optional_tools = requirements.get('optional', [])
+        checks = self.check_tools(required_tools + optional_tools)
 
         # Check required tools
         for tool in required_tools:
-            result = CIEnvironmentValidator.check_tool(tool)
+            result = checks[tool]
             report.available_tools[tool] = result
 
             if not result.installed:
@@ -185,7 +329,7 @@ class CIEnvironmentValidator:
 
         # Check optional tools (warnings if missing)
         for tool in optional_tools:
-            result = CIEnvironmentValidator.check_tool(tool)
+            result = checks[tool]
             report.available_tools[tool] = result
 
             if not result.installed:
@@ -195,8 +339,7 @@ class CIEnvironmentValidator:
 
         return report
 
-    @staticmethod
-    def validate_coverage_tool(tool_type: str, language: str) -> EnvironmentReport:
+    def validate_coverage_tool(self, tool_type: str, language: str) -> EnvironmentReport:
         """
         Validate environment for a specific coverage tool
 
@@ -242,6 +385,9 @@ class CIEnvironmentValidator:
             return report
 
         requirements = coverage_tool_requirements[tool_type]
+        checks = self.check_tools(
+            requirements.get('required', []) + requirements.get('optional', [])
+        )
 
         # Check if tool matches language
         if language != 'unknown' and language != requirements['language']:
@@ -252,7 +398,7 @@ class CIEnvironmentValidator:
 
         # Check required tools
         for tool in requirements.get('required', []):
-            result = CIEnvironmentValidator.check_tool(tool)
+            result = checks[tool]
             report.available_tools[tool] = result
 
             if not result.installed:
@@ -261,7 +407,7 @@ class CIEnvironmentValidator:
 
         # Check optional tools
         for tool in requirements.get('optional', []):
-            result = CIEnvironmentValidator.check_tool(tool)
+            result = checks[tool]
             report.available_tools[tool] = result
 
             if not result.installed:
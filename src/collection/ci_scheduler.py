@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Resource-aware scheduler for coverage jobs
+Runs coverage jobs from many repositories in parallel threads, bounded by CPU
+slots and a memory budget, starting the longest expected jobs first based on
+durations recorded in previous runs
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# CPU slots and memory (MB) a job of each runner type is expected to occupy
+JOB_WEIGHTS = {
+    'jacoco': {'cpu': 2, 'memory_mb': 2048},
+    'lcov': {'cpu': 2, 'memory_mb': 1536},
+    'pytest-cov': {'cpu': 1, 'memory_mb': 512},
+}
+DEFAULT_WEIGHT = {'cpu': 1, 'memory_mb': 512}
+
+# Expected duration (seconds) of a runner type with no recorded history
+DEFAULT_DURATIONS = {
+    'jacoco': 600,
+    'lcov': 300,
+    'pytest-cov': 180,
+}
+DEFAULT_DURATION = 300
+
+
+def available_memory_mb() -> int:
+    """Memory available for jobs: MemAvailable on Linux, else 3/4 of physical memory"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (IOError, OSError, ValueError):
+        pass
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') * 3 // 4 // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return 4096
+
+
+@dataclass
+class CoverageJob:
+    """One coverage runner invocation for one repository"""
+    repo_name: str
+    tool_type: str
+    run: Callable[[], Any]
+    cpu: int = 1
+    memory_mb: int = 512
+    expected_seconds: float = DEFAULT_DURATION
+    locks: Tuple[str, ...] = ()  # jobs sharing a lock never run at the same time
+    result: Any = None
+    error: Optional[BaseException] = None
+    duration: Optional[float] = None
+    output: str = ""  # what the job printed, kept together instead of interleaved with other jobs
+
+    @property
+    def key(self) -> str:
+        return f"{self.repo_name}:{self.tool_type}"
+
+
+class _JobOutput(io.TextIOBase):
+    """sys.stdout replacement that buffers prints of job threads per thread"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = io.StringIO()
+
+    def release(self) -> str:
+        buffer = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        return buffer.getvalue() if buffer is not None else ""
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class JobDurationStore:
+    """Durations of previous coverage jobs, persisted in .cache/ci_durations.json"""
+
+    VERSION = 1
+    HISTORY = 5  # runs averaged per job
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._jobs: Dict[str, List[float]] = {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self._jobs = data.get('jobs', {})
+        except (IOError, OSError, json.JSONDecodeError):
+            pass
+        self._lock = threading.Lock()
+
+    def expected(self, repo_name: str, tool_type: str) -> float:
+        """Mean of recent durations, or the runner type's default"""
+        history = self._jobs.get(f"{repo_name}:{tool_type}")
+        if history:
+            return sum(history) / len(history)
+        return DEFAULT_DURATIONS.get(tool_type, DEFAULT_DURATION)
+
+    def record(self, repo_name: str, tool_type: str, seconds: float):
+        """Record a job duration"""
+        with self._lock:
+            history = self._jobs.setdefault(f"{repo_name}:{tool_type}", [])
+            history.append(round(seconds, 1))
+            del history[:-self.HISTORY]
+
+    def save(self):
+        """Persist durations"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({"version": self.VERSION, "jobs": dict(sorted(self._jobs.items()))}, f, indent=2)
+
+
+class CoverageJobScheduler:
+    """Runs coverage jobs in parallel within CPU and memory limits, longest first"""
+
+    def __init__(self, cpu_slots: Optional[int] = None, memory_mb: Optional[int] = None,
+                 durations: Optional[JobDurationStore] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            cpu_slots: CPU slots shared by running jobs (defaults to CPU count)
+            memory_mb: Memory budget shared by running jobs (defaults to available memory)
+            durations: Duration history used to order jobs and updated as jobs finish
+        """
+        self.cpu_slots = max(1, cpu_slots or os.cpu_count() or 1)
+        self.memory_mb = max(1, memory_mb or available_memory_mb())
+        self.durations = durations
+
+    def make_job(self, repo_name: str, tool_type: str, run: Callable[[], Any],
+                 overrides: Optional[Dict] = None, locks: Tuple[str, ...] = ()) -> CoverageJob:
+        """
+        Build a job weighted by runner type
+
+        Args:
+            repo_name: Repository name
+            tool_type: Coverage tool type ('jacoco', 'lcov', ...)
+            run: Callable executing the job
+            overrides: Optional 'cpu' / 'memory_mb' / 'shards' from the tool configuration
+            locks: Names of resources the job needs exclusively
+        """
+        weight = dict(JOB_WEIGHTS.get(tool_type, DEFAULT_WEIGHT))
+        weight.update({k: v for k, v in (overrides or {}).items() if k in ('cpu', 'memory_mb') and v})
+        shards = int((overrides or {}).get('shards') or 1)
+        if shards > 1 and not (overrides or {}).get('cpu'):
+            # Sharded runs occupy one slot per shard
+            weight['cpu'] = max(int(weight['cpu']), shards)
+        expected = self.durations.expected(repo_name, tool_type) if self.durations else \
+            DEFAULT_DURATIONS.get(tool_type, DEFAULT_DURATION)
+        return CoverageJob(
+            repo_name=repo_name,
+            tool_type=tool_type,
+            run=run,
+            cpu=min(int(weight['cpu']), self.cpu_slots),
+            memory_mb=min(int(weight['memory_mb']), self.memory_mb),
+            expected_seconds=expected,
+            locks=tuple(locks)
+        )
+
+    def run(self, jobs: List[CoverageJob], on_done: Optional[Callable[[CoverageJob], None]] = None) -> List[CoverageJob]:
+        """
+        Run all jobs and wait for them
+
+        Jobs are started longest-expected first; when the next one does not fit
+        the free resources, a smaller job that does fit starts instead. What a
+        job prints is collected in job.output rather than written as it runs.
+        Jobs whose result reports `cached` are not recorded in the duration
+        history, since they say nothing about the job's real run time.
+
+        Args:
+            jobs: Jobs to run
+            on_done: Called (serialized) as each job finishes
+
+        Returns:
+            The jobs, with result/error/duration filled in
+        """
+        queue = sorted(jobs, key=lambda job: (-job.expected_seconds, job.key))
+        free = {'cpu': self.cpu_slots, 'memory_mb': self.memory_mb}
+        held_locks = set()
+        condition = threading.Condition()
+        output = _JobOutput(sys.stdout)
+
+        def execute(job: CoverageJob):
+            output.capture()
+            started = time.monotonic()
+            try:
+                job.result = job.run()
+            except Exception as e:
+                job.error = e
+            job.duration = time.monotonic() - started
+            job.output = output.release()
+            if self.durations and not getattr(job.result, "cached", False):
+                self.durations.record(job.repo_name, job.tool_type, job.duration)
+            with condition:
+                free['cpu'] += job.cpu
+                free['memory_mb'] += job.memory_mb
+                held_locks.difference_update(job.locks)
+                if on_done:
+                    on_done(job)
+                condition.notify_all()
+
+        threads = []
+        sys.stdout = output
+        try:
+            with condition:
+                while queue:
+                    job = next(
+                        (j for j in queue
+                         if j.cpu <= free['cpu'] and j.memory_mb <= free['memory_mb'] and not held_locks.intersection(j.locks)),
+                        None
+                    )
+                    if job is None:
+                        condition.wait()
+                        continue
+                    queue.remove(job)
+                    free['cpu'] -= job.cpu
+                    free['memory_mb'] -= job.memory_mb
+                    held_locks.update(job.locks)
+                    thread = threading.Thread(target=execute, args=(job,), name=f"coverage-{job.key}", daemon=True)
+                    threads.append(thread)
+                    thread.start()
+
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.stdout = output.stream
+
+        if self.durations:
+            self.durations.save()
+        return jobs
@@ -5,20 +5,49 @@ Collects CI/test/coverage data with environment validation and dynamic framework
 """
 
 import json
+import os
+import shutil
 from datetime import datetime
 from pathlib import Path
 from src.config.config_parser import RepoConfigParser
-from src.collection.ci_environment import CIEnvironmentValidator
-from src.collection.framework_detector import FrameworkDetector
+from src.collection.ci_environment import CIEnvironmentValidator, ToolProbeCache
+from src.collection.detection_cache import FrameworkDetectionCache
 from src.collection.coverage_tool_runner import CoverageToolRunnerFactory
+from src.collection.ci_scheduler import CoverageJobScheduler, JobDurationStore
+from src.collection.coverage_cache import CoverageResultCache
+from src.collection.repo_manifest_index import RepoManifestIndex
 
 
 class CICollector:
-    def __init__(self, root_dir=".", config_file=None):
+    def __init__(self, root_dir=".", config_file=None, cpu_slots=None, memory_mb=None, probe_cache_ttl=None,
+                 coverage_cache=True):
+        """
+        Args:
+            root_dir: Project root containing git_artifacts/ and ci_artifacts/
+            config_file: Path to repos.yaml (auto-detected if None)
+            cpu_slots: CPU slots for parallel coverage jobs (defaults to CPU count)
+            memory_mb: Memory budget for parallel coverage jobs (defaults to available memory)
+            probe_cache_ttl: Seconds tool probes are reused across runs via
+                .cache/tool_probes.json (None keeps them per process)
+            coverage_cache: Reuse coverage results while a repository's tree,
+                runner and runner config are unchanged; results and report
+                copies live in .cache/coverage/<repo>, outside the published ci_artifacts
+        """
         self.root_dir = Path(root_dir)
+        self.cpu_slots = cpu_slots
+        self.memory_mb = memory_mb
+        self.coverage_cache = coverage_cache
         self.git_artifacts = self.root_dir / "git_artifacts"
         self.ci_artifacts = self.root_dir / "ci_artifacts"
         self.ci_artifacts.mkdir(exist_ok=True)
+        self.cache_root = self.root_dir / ".cache"
+
+        (self.ci_artifacts / "tool_probes.json").unlink(missing_ok=True)  # published location of earlier versions
+        if probe_cache_ttl:
+            self.probe_cache = ToolProbeCache(self.cache_root / "tool_probes.json", ttl=probe_cache_ttl)
+        else:
+            self.probe_cache = ToolProbeCache()
+        self.env_validator = CIEnvironmentValidator(self.probe_cache)
 
         # Initialize config parser
         self.config_parser = RepoConfigParser(config_file=config_file)
@@ -31,28 +60,38 @@ class CICollector:
         """Parse repository configuration"""
         return self.config_parser.get_all_repos()
 
-    def collect_repo_ci(self, repo_name, config):
+    def _log_dir(self, repo_name):
+        """Build/test command logs of a repository (not published with ci_artifacts)"""
+        return self.cache_root / "logs" / repo_name
+
+    def plan_repo_ci(self, repo_name, config):
         """
-        Collect CI/test/coverage data from a repository
+        Validate the environment and detect frameworks for a repository
 
-        Validates environment, detects frameworks, and runs appropriate coverage tools
+        Returns:
+            Plan dictionary with the coverage tools to run, or None if the
+            repository has not been cloned yet
         """
         print(f"  Processing CI for {repo_name}...")
 
         repo_dir = self.ci_artifacts / repo_name
         repo_dir.mkdir(exist_ok=True)
 
+        # Command logs of the previous run; earlier versions wrote them into the published ci_artifacts
+        shutil.rmtree(self._log_dir(repo_name), ignore_errors=True)
+        shutil.rmtree(repo_dir / "coverage" / "logs", ignore_errors=True)
+
         git_clone = self.git_artifacts / repo_name / "clone"
         if not git_clone.exists():
             print(f"    ℹ Git data not collected yet")
-            return
+            return None
 
         language = config.get("language", "unknown")
         configured_tools = self.config_parser.get_coverage_tools(repo_name) or []
 
         # Step 1: Validate environment
         print(f"    → Validating environment for {language}...")
-        env_report = CIEnvironmentValidator.validate_language(language)
+        env_report = self.env_validator.validate_language(language)
 
         if not env_report.is_valid:
             print(f"    ✗ Missing required tools: {env_report.missing_tools}")
@@ -61,50 +100,111 @@ class CICollector:
             for warning in env_report.warnings:
                 print(f"    ⚠ {warning}")
 
-        # Step 2: Detect frameworks
+        # Step 2: Detect frameworks (the clone may have changed since this process last indexed it)
         print(f"    → Detecting test frameworks...")
-        detected_test_fw = FrameworkDetector.detect_test_framework(git_clone, language)
-        detected_coverage_tool = FrameworkDetector.detect_coverage_tool(git_clone, language)
-
-        print(f"    ✓ Detected: {detected_test_fw}, Coverage: {detected_coverage_tool}")
-
-        # Step 3: Run coverage tools
-        coverage_results = []
+        RepoManifestIndex.invalidate(git_clone)
+        (repo_dir / "framework_detection.json").unlink(missing_ok=True)  # published location of earlier versions
+        detection_cache = FrameworkDetectionCache(self.cache_root / "detection" / f"{repo_name}.json")
+        detection, cached = detection_cache.detect(git_clone, language)
+        detected_test_fw = detection["test_framework"]
+        detected_coverage_tool = detection["coverage_tool"]
+        build_tool = detection["build_tool"]
+
+        print(f"    ✓ Detected: {detected_test_fw}, Coverage: {detected_coverage_tool}"
+              + (f", Build: {build_tool}" if build_tool else "")
+              + (" (manifests unchanged)" if cached else ""))
 
         # If tools are configured, use those; otherwise use auto-detected
         tools_to_run = []
 
         if configured_tools:
             for tool in configured_tools:
-                tool_type = tool.get('type') if isinstance(tool, dict) else tool
-                tools_to_run.append(tool_type)
+                tools_to_run.append(tool if isinstance(tool, dict) else {'type': tool})
         elif detected_coverage_tool:
-            tools_to_run.append(detected_coverage_tool)
+            tools_to_run.append({'type': detected_coverage_tool})
 
-        for tool_type in tools_to_run:
-            print(f"    → Running coverage with {tool_type}...")
+        return {
+            "repo_name": repo_name,
+            "language": language,
+            "repo_dir": repo_dir,
+            "git_clone": git_clone,
+            "env_report": env_report,
+            "test_framework": detected_test_fw,
+            "coverage_tool": detected_coverage_tool,
+            "build_tool": build_tool,
+            "tools": tools_to_run
+        }
 
-            runner = CoverageToolRunnerFactory.create(tool_type, git_clone, repo_dir / "coverage")
-            if runner is None:
-                print(f"      ✗ No runner available for {tool_type}")
-                continue
+    # Tool settings that only affect scheduling, not the coverage result
+    SCHEDULING_KEYS = {'cpu', 'memory_mb'}
 
-            result = runner.run()
-            coverage_results.append(result)
+    def run_coverage_tool(self, plan, tool):
+        """
+        Run one coverage tool for a planned repository
 
-            if result.success:
-                print(f"      ✓ Success: {result.status_message}")
-            else:
-                print(f"      ⚠ {result.status_message}")
-                if result.errors:
-                    for error in result.errors:
-                        print(f"        - {error}")
+        Reuses the cached result when the clone's tracked content, the runner
+        and its configuration match a previous successful run.
 
-        # Step 4: Save CI info
+        Returns:
+            CoverageResult, or None if no runner exists for the tool
+        """
+        tool_type = tool['type']
+        output_dir = plan["repo_dir"] / "coverage"
+        runner = CoverageToolRunnerFactory.create(tool_type, plan["git_clone"], output_dir,
+                                                  log_dir=self._log_dir(plan["repo_name"]))
+        if runner is None:
+            return None
+
+        config = {k: v for k, v in tool.items() if k != 'type' and k not in self.SCHEDULING_KEYS}
+        if tool_type == 'jacoco' and plan.get("build_tool"):
+            config.setdefault('build_tool', plan["build_tool"])
+        if not self.coverage_cache:
+            return self._run_runner(runner, config)
+
+        # Earlier runs kept the cache under ci_artifacts, where calculations picked up its report copies
+        shutil.rmtree(output_dir / "cache", ignore_errors=True)
+        cache = CoverageResultCache(self.cache_root / "coverage" / plan["repo_name"])
+        state = CoverageResultCache.worktree_state(plan["git_clone"])
+        if state is not None:
+            cached = cache.get(CoverageResultCache.key(state, tool_type, config))
+            if cached is not None:
+                return cached
+
+        result = self._run_runner(runner, config)
+
+        if state is not None and result.success:
+            # Builds may touch tracked files (e.g. lockfiles); the next run starts from that state
+            after = CoverageResultCache.worktree_state(plan["git_clone"]) or state
+            keys = [CoverageResultCache.key(s, tool_type, config) for s in (state, after)]
+            cache.put(keys, result, state, tool_type, config)
+        return result
+
+    @staticmethod
+    def _run_runner(runner, config):
+        """Run a coverage runner, recording per-command resource usage in its result"""
+        result = runner.run(config)
+        result.commands = [stats.to_dict() for stats in runner.executor.history]
+        return result
+
+    def _report_coverage_result(self, tool_type, result, indent="      "):
+        """Print the outcome of a coverage run"""
+        if result is None:
+            print(f"{indent}✗ No runner available for {tool_type}")
+        elif result.success:
+            print(f"{indent}✓ Success: {result.status_message}")
+        else:
+            print(f"{indent}⚠ {result.status_message}")
+            if result.errors:
+                for error in result.errors:
+                    print(f"{indent}  - {error}")
+
+    def write_ci_info(self, plan, coverage_results):
+        """Save CI info for a planned repository"""
+        env_report = plan["env_report"]
         ci_info = {
             "metric_id": "ci.info.raw",
-            "repo": repo_name,
-            "language": language,
+            "repo": plan["repo_name"],
+            "language": plan["language"],
             "environment_validation": {
                 "status": "valid" if env_report.is_valid else "missing_dependencies",
                 "available_tools": {
@@ -118,20 +218,47 @@ class CICollector:
                 "warnings": env_report.warnings
             },
             "framework_detection": {
-                "test_framework": detected_test_fw,
-                "coverage_tool": detected_coverage_tool
+                "test_framework": plan["test_framework"],
+                "coverage_tool": plan["coverage_tool"],
+                "build_tool": plan["build_tool"]
             },
             "coverage_results": [r.to_dict() for r in coverage_results],
             "collected_at": datetime.now().isoformat()
         }
 
-        with open(repo_dir / "ci_info.json", 'w') as f:
+        with open(plan["repo_dir"] / "ci_info.json", 'w') as f:
             json.dump(ci_info, f, indent=2)
 
+    def collect_repo_ci(self, repo_name, config):
+        """
+        Collect CI/test/coverage data from a repository
+
+        Validates environment, detects frameworks, and runs appropriate coverage tools
+        """
+        plan = self.plan_repo_ci(repo_name, config)
+        if plan is None:
+            return
+
+        # Step 3: Run coverage tools
+        coverage_results = []
+        for tool in plan["tools"]:
+            print(f"    → Running coverage with {tool['type']}...")
+            result = self.run_coverage_tool(plan, tool)
+            self._report_coverage_result(tool['type'], result)
+            if result is not None:
+                coverage_results.append(result)
+
+        # Step 4: Save CI info
+        self.write_ci_info(plan, coverage_results)
         print(f"    ✓ CI collection complete")
 
     def run(self):
-        """Execute CI collection pipeline"""
+        """
+        Execute CI collection pipeline
+
+        Environments and frameworks are checked per repository first; coverage
+        jobs of all repositories then run in parallel through the scheduler.
+        """
         print("\n" + "="*70)
         print("DORA COLLECTION LAYER - CI Artifacts Extraction")
         print("="*70 + "\n")
@@ -139,8 +266,57 @@ class CICollector:
         repos = self.parse_repos()
         print(f"Processing CI data for {len(repos)} repositories\n")
 
+        plans = []
         for repo_name, config in repos.items():
-            self.collect_repo_ci(repo_name, config)
+            plan = self.plan_repo_ci(repo_name, config)
+            if plan is not None:
+                plans.append(plan)
+
+        self.probe_cache.save()
+        print(f"\n  → Tool probes: {self.probe_cache.probes} run, {self.probe_cache.hits} reused")
+
+        (self.ci_artifacts / "ci_durations.json").unlink(missing_ok=True)  # published location of earlier versions
+        scheduler = CoverageJobScheduler(
+            cpu_slots=self.cpu_slots,
+            memory_mb=self.memory_mb,
+            durations=JobDurationStore(self.cache_root / "ci_durations.json")
+        )
+        jobs = []
+        plan_jobs = {id(plan): [] for plan in plans}
+        for plan in plans:
+            for tool in plan["tools"]:
+                # Runs in the same clone never overlap; non-isolated pip installs go into this interpreter
+                shared_env = tool['type'] == 'pytest-cov' and not tool.get('isolated_env', True)
+                locks = (plan["repo_name"],) + (("python-env",) if shared_env else ())
+                job = scheduler.make_job(
+                    plan["repo_name"], tool['type'],
+                    run=lambda plan=plan, tool=tool: self.run_coverage_tool(plan, tool),
+                    overrides=tool, locks=locks
+                )
+                plan_jobs[id(plan)].append(job)
+                jobs.append(job)
+
+        if jobs:
+            print(f"\nRunning {len(jobs)} coverage jobs ({scheduler.cpu_slots} CPU slots, {scheduler.memory_mb} MB)\n")
+
+        def on_done(job):
+            # Jobs run in parallel; every line carries the job so output stays attributable
+            prefix = f"  [{job.repo_name}/{job.tool_type}]"
+            print(f"{prefix} finished in {job.duration:.0f}s")
+            for line in job.output.splitlines():
+                print(f"{prefix}   {line}")
+            if job.error is not None:
+                print(f"{prefix} ✗ Error running {job.tool_type}: {job.error}")
+            else:
+                self._report_coverage_result(job.tool_type, job.result, indent=f"{prefix} ")
+
+        scheduler.run(jobs, on_done=on_done)
+
+        # Results are written per repository in configuration order
+        for plan in plans:
+            coverage_results = [job.result for job in plan_jobs[id(plan)] if job.result is not None]
+            self.write_ci_info(plan, coverage_results)
+            print(f"  ✓ CI collection complete for {plan['repo_name']}")
 
         print(f"\n{'='*70}")
         print("CI artifacts collection complete")
@@ -150,6 +326,11 @@ class CICollector:
 
 
 if __name__ == "__main__":
-    collector = CICollector()
+    collector = CICollector(
+        cpu_slots=int(os.getenv("DORA_CI_SLOTS", "0")) or None,
+        memory_mb=int(os.getenv("DORA_CI_MEMORY_MB", "0")) or None,
+        probe_cache_ttl=float(os.getenv("DORA_PROBE_CACHE_TTL", "0")) or None,
+        coverage_cache=os.getenv("DORA_COVERAGE_CACHE", "1") != "0"
+    )
     success = collector.run()
     exit(0 if success else 1)
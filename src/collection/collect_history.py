@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+COLLECTION LAYER - Historical LOC and Test-File Snapshots
+Samples one commit per week/month and counts lines of code and test files at each sample.
+Trees are walked straight from the object database and memoized by tree SHA,
+so subtrees that did not change between samples are never walked twice.
+"""
+
+import subprocess
+import json
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.collection.collect_loc import LOCCollector
+from src.collection.test_index import TestFileIndex, TEST_DIR_NAMES
+
+
+class GitObjectReader:
+    """Reads git objects through a single long-lived `git cat-file --batch` process"""
+
+    def __init__(self, clone_path: Path):
+        self.clone_path = Path(clone_path)
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=self.clone_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+    def read(self, sha: str) -> Tuple[str, bytes]:
+        """
+        Read a single object
+
+        Args:
+            sha: Object id (hex)
+
+        Returns:
+            Tuple of (object_type, raw_content)
+        """
+        self._process.stdin.write(sha.encode() + b"\n")
+        self._process.stdin.flush()
+
+        header = self._process.stdout.readline().decode().split()
+        if len(header) < 3 or header[1] == "missing":
+            raise KeyError(f"Git object not found: {sha}")
+
+        obj_type, size = header[1], int(header[2])
+        content = self._process.stdout.read(size)
+        self._process.stdout.read(1)  # trailing newline
+        return obj_type, content
+
+    def close(self):
+        """Terminate the cat-file process"""
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+
+
+class HistorySnapshotEngine:
+    """Counts LOC and test files at sampled commits with tree/blob memoization"""
+
+    def __init__(self, clone_path: Path):
+        self.clone_path = Path(clone_path)
+        self._reader: Optional[GitObjectReader] = None
+        self._test_index = TestFileIndex()
+        # (tree_sha, inside_test_dir) -> counts; test classification depends on the parent path
+        self._tree_cache: Dict[Tuple[str, bool], Dict[str, int]] = {}
+        # blob_sha -> (total_lines, blank_lines)
+        self._blob_cache: Dict[str, Tuple[int, int]] = {}
+        self.trees_walked = 0
+        self.tree_cache_hits = 0
+        self.blobs_read = 0
+
+    def iter_samples(self, interval: str = "week", max_samples: int = 200) -> Iterator[Dict]:
+        """
+        Pick the most recent first-parent commit of each week or month
+
+        Args:
+            interval: 'week' or 'month'
+            max_samples: Maximum number of samples (most recent are kept)
+
+        Yields:
+            Dicts with commit, tree, date and period, oldest first
+        """
+        bucket_format = "%Y-W%W" if interval == "week" else "%Y-%m"
+
+        process = subprocess.Popen(
+            ["git", "log", "--first-parent", "--format=%H %T %ct", "HEAD"],
+            cwd=self.clone_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+
+        samples = []
+        seen_periods = set()
+        truncated = False
+        for line in process.stdout:
+            parts = line.split()
+            if len(parts) != 3:
+                continue
+            commit_sha, tree_sha, timestamp = parts
+            date = datetime.fromtimestamp(int(timestamp))
+            period = date.strftime(bucket_format)
+            # git log is newest-first, so the first commit seen in a period is its last state
+            if period in seen_periods:
+                continue
+            seen_periods.add(period)
+            samples.append({
+                "commit": commit_sha,
+                "tree": tree_sha,
+                "date": date.strftime("%Y-%m-%d"),
+                "period": period
+            })
+            if len(samples) >= max_samples:
+                truncated = True
+                break
+
+        if truncated:
+            process.terminate()
+        process.stdout.close()
+        process.wait()
+
+        if process.returncode != 0 and not truncated:
+            raise subprocess.CalledProcessError(process.returncode, "git log", stderr=process.stderr.read())
+
+        yield from reversed(samples)
+
+    def _count_blob(self, blob_sha: str) -> Tuple[int, int]:
+        """Count total and blank lines in a blob (memoized by SHA)"""
+        cached = self._blob_cache.get(blob_sha)
+        if cached is not None:
+            return cached
+
+        _, content = self._reader.read(blob_sha)
+        self.blobs_read += 1
+
+        lines = content.split(b"\n")
+        if lines and lines[-1] == b"":
+            lines.pop()
+        total = len(lines)
+        blank = sum(1 for line in lines if not line.strip())
+
+        self._blob_cache[blob_sha] = (total, blank)
+        return total, blank
+
+    def _walk_tree(self, tree_sha: str, inside_test_dir: bool) -> Dict[str, int]:
+        """Recursively count a tree, reusing results for subtrees already seen"""
+        key = (tree_sha, inside_test_dir)
+        cached = self._tree_cache.get(key)
+        if cached is not None:
+            self.tree_cache_hits += 1
+            return cached
+
+        self.trees_walked += 1
+        _, content = self._reader.read(tree_sha)
+        sha_len = len(tree_sha) // 2
+
+        counts = {"total_lines": 0, "blank_lines": 0, "code_files": 0, "test_files": 0}
+        pos = 0
+        while pos < len(content):
+            space = content.index(b" ", pos)
+            nul = content.index(b"\0", space)
+            mode = content[pos:space]
+            name = content[space + 1:nul].decode("utf-8", errors="replace")
+            sha = content[nul + 1:nul + 1 + sha_len].hex()
+            pos = nul + 1 + sha_len
+
+            if mode == b"40000":
+                if name in LOCCollector.EXCLUDE_PATTERNS:
+                    continue
+                child = self._walk_tree(sha, inside_test_dir or name in TEST_DIR_NAMES)
+                for field in counts:
+                    counts[field] += child[field]
+                continue
+
+            # Skip symlinks (120000) and submodules (160000)
+            if not mode.startswith(b"100") or name in LOCCollector.EXCLUDE_PATTERNS:
+                continue
+
+            if self._test_index.classify_name(name, inside_test_dir):
+                counts["test_files"] += 1
+
+            if Path(name).suffix.lower() in LOCCollector.CODE_EXTENSIONS:
+                total, blank = self._count_blob(sha)
+                counts["total_lines"] += total
+                counts["blank_lines"] += blank
+                counts["code_files"] += 1
+
+        self._tree_cache[key] = counts
+        return counts
+
+    def snapshot(self, tree_sha: str) -> Dict[str, int]:
+        """
+        Count LOC and test files for a root tree
+
+        Args:
+            tree_sha: Root tree of a commit
+
+        Returns:
+            Dictionary of counts
+        """
+        counts = dict(self._walk_tree(tree_sha, False))
+        counts["code_lines"] = counts["total_lines"] - counts["blank_lines"]
+        return counts
+
+    def collect(self, interval: str = "week", max_samples: int = 200) -> List[Dict]:
+        """
+        Compute a time series of snapshots
+
+        Args:
+            interval: 'week' or 'month'
+            max_samples: Maximum number of samples
+
+        Returns:
+            List of sample dicts (oldest first) with counts merged in
+        """
+        self._reader = GitObjectReader(self.clone_path)
+        try:
+            series = []
+            for sample in self.iter_samples(interval, max_samples):
+                sample.update(self.snapshot(sample["tree"]))
+                series.append(sample)
+            return series
+        finally:
+            self._reader.close()
+            self._reader = None
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Memoization statistics for the last collection"""
+        return {
+            "trees_walked": self.trees_walked,
+            "tree_cache_hits": self.tree_cache_hits,
+            "blobs_read": self.blobs_read
+        }
+
+
+class HistoryCollector:
+    """Collects LOC/test-file history for all cloned repositories"""
+
+    def __init__(self, root_dir=".", interval="week", max_samples=200):
+        self.root_dir = Path(root_dir)
+        self.git_artifacts = self.root_dir / "git_artifacts"
+        self.interval = interval
+        self.max_samples = max_samples
+
+    def collect_repo_history(self, repo_name: str, clone_path: Path) -> Dict:
+        """
+        Collect historical snapshots for a repository
+
+        Args:
+            repo_name: Name of the repository
+            clone_path: Path to the cloned repository
+
+        Returns:
+            Dictionary with the snapshot time series
+        """
+        if not clone_path.exists():
+            return {
+                "metric_id": "git.history.raw",
+                "repo": repo_name,
+                "status": "error",
+                "reason": "Clone directory not found",
+                "collected_at": datetime.now().isoformat()
+            }
+
+        try:
+            engine = HistorySnapshotEngine(clone_path)
+            samples = engine.collect(self.interval, self.max_samples)
+
+            return {
+                "metric_id": "git.history.raw",
+                "repo": repo_name,
+                "status": "success",
+                "interval": self.interval,
+                "sample_count": len(samples),
+                "samples": samples,
+                "cache_stats": engine.cache_stats(),
+                "method": "Sample last first-parent commit per period; walk trees from the object store memoized by tree SHA",
+                "collected_at": datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            return {
+                "metric_id": "git.history.raw",
+                "repo": repo_name,
+                "status": "error",
+                "reason": f"History collection failed: {str(e)}",
+                "collected_at": datetime.now().isoformat()
+            }
+
+    def run(self):
+        """Execute history collection for all repositories"""
+        print("\n" + "="*70)
+        print("DORA COLLECTION LAYER - LOC / Test-File History")
+        print("="*70 + "\n")
+
+        if not self.git_artifacts.exists():
+            print("  No git_artifacts directory found. Run collect_git.py first.\n")
+            return True
+
+        success_count = 0
+        total_count = 0
+
+        for repo_dir in sorted(self.git_artifacts.iterdir()):
+            if not repo_dir.is_dir() or repo_dir.name.startswith("."):
+                continue
+
+            clone_path = repo_dir / "clone"
+            if not clone_path.exists():
+                continue
+
+            total_count += 1
+            print(f"  Collecting history for {repo_dir.name}...")
+
+            history = self.collect_repo_history(repo_dir.name, clone_path)
+            with open(repo_dir / "history.json", 'w') as f:
+                json.dump(history, f, indent=2)
+
+            if history.get("status") == "success":
+                stats = history["cache_stats"]
+                print(f"    ✓ {history['sample_count']} samples "
+                      f"({stats['trees_walked']} trees walked, {stats['tree_cache_hits']} reused)")
+                success_count += 1
+            else:
+                print(f"    ✗ {history.get('reason', 'Unknown error')}")
+
+        print(f"\n{'='*70}")
+        print(f"History collection complete: {success_count}/{total_count} successful")
+        print("="*70 + "\n")
+
+        return success_count == total_count
+
+
+if __name__ == "__main__":
+    collector = HistoryCollector()
+    success = collector.run()
+    exit(0 if success else 1)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Streaming command executor
+Runs build and test commands with their output streamed to rotating log files
+and only a bounded tail kept in memory, records wall time, CPU time and peak
+RSS per command, and kills the whole process group on timeout
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+
+@dataclass
+class CommandStats:
+    """Resource usage of one command"""
+    command: str
+    returncode: Optional[int]
+    wall_seconds: float
+    cpu_seconds: Optional[float]  # user + system time of the command and its reaped children
+    max_rss_mb: Optional[float]
+    timed_out: bool
+    log_path: Optional[str]
+    output_bytes: int
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class CommandResult(subprocess.CompletedProcess):
+    """CompletedProcess whose stdout/stderr hold only the tail of the output"""
+
+    def __init__(self, args, returncode: int, stdout: str, stderr: str, stats: CommandStats):
+        super().__init__(args, returncode, stdout, stderr)
+        self.stats = stats
+
+
+class RotatingLog:
+    """Append-only log file rotated to <name>.1, <name>.2, ... once it exceeds max_bytes"""
+
+    def __init__(self, path: Path, max_bytes: int, backups: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: BinaryIO = open(self.path, 'wb')
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups, 0, -1):
+            source = self.path if index == 1 else self.path.with_name(f"{self.path.name}.{index - 1}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{index}"))
+        self._file = open(self.path, 'wb')
+        self._size = 0
+
+    def write(self, data: bytes):
+        with self._lock:
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._size += len(data)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class _Tail:
+    """Last `limit` bytes written to a stream"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._chunks = deque()
+        self._size = 0
+        self.total = 0  # bytes seen, including those dropped from the tail
+
+    def add(self, data: bytes):
+        self.total += len(data)
+        self._chunks.append(data)
+        self._size += len(data)
+        while self._chunks and self._size - len(self._chunks[0]) >= self.limit:
+            self._size -= len(self._chunks.popleft())
+
+    def text(self) -> str:
+        return b"".join(self._chunks)[-self.limit:].decode('utf-8', errors='replace')
+
+
+class CommandExecutor:
+    """Runs commands with streamed, size-bounded output and resource accounting"""
+
+    READ_SIZE = 64 * 1024
+    KILL_GRACE_SECONDS = 10  # between SIGTERM and SIGKILL on timeout
+
+    def __init__(self, log_dir: Optional[Path] = None, max_log_bytes: int = 32 * 1024 * 1024,
+                 backups: int = 2, tail_bytes: int = 64 * 1024):
+        """
+        Initialize executor
+
+        Args:
+            log_dir: Directory for command logs (output is discarded when None)
+            max_log_bytes: Size at which a log file is rotated
+            backups: Rotated log files kept per command
+            tail_bytes: Bytes of stdout and of stderr kept in memory
+        """
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.max_log_bytes = max_log_bytes
+        self.backups = backups
+        self.tail_bytes = tail_bytes
+        self.history: List[CommandStats] = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _open_log(self, command: List[str]) -> Optional[RotatingLog]:
+        if self.log_dir is None:
+            return None
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        name = Path(command[0]).name or "command"
+        return RotatingLog(self.log_dir / f"{sequence:03d}-{name}.log", self.max_log_bytes, self.backups)
+
+    def _pump(self, stream: BinaryIO, tail: _Tail, log: Optional[RotatingLog]):
+        """Copy a pipe to the log and the in-memory tail until EOF"""
+        for data in iter(lambda: stream.read1(self.READ_SIZE), b""):
+            tail.add(data)
+            if log is not None:
+                log.write(data)
+        stream.close()
+
+    @staticmethod
+    def _signal_group(process: subprocess.Popen, sig: int):
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, sig)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+
+    def _wait(self, process: subprocess.Popen):
+        """
+        Wait for the process to exit
+
+        Returns:
+            (returncode, rusage or None)
+        """
+        if hasattr(os, "wait4"):
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return process.returncode, rusage
+        return process.wait(), None
+
+    def run(self, command: List[str], cwd: Optional[Path] = None, timeout: Optional[float] = None,
+            env: Optional[Dict[str, str]] = None) -> CommandResult:
+        """
+        Run a command to completion
+
+        Args:
+            command: Command to run
+            cwd: Working directory
+            timeout: Seconds before the command's process group is killed
+            env: Environment (defaults to this process's)
+
+        Returns:
+            CommandResult with the tail of stdout/stderr and resource stats
+
+        Raises:
+            FileNotFoundError: If the executable does not exist
+            subprocess.TimeoutExpired: If the command was killed after `timeout`
+        """
+        log = self._open_log(command)
+        started = time.monotonic()
+        try:
+            process = subprocess.Popen(
+                command, cwd=cwd, env=env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                start_new_session=os.name == "posix"
+            )
+        except BaseException:
+            if log is not None:
+                log.close()
+                log.path.unlink()
+            raise
+
+        tails = (_Tail(self.tail_bytes), _Tail(self.tail_bytes))
+        readers = [
+            threading.Thread(target=self._pump, args=(stream, tail, log), daemon=True)
+            for stream, tail in zip((process.stdout, process.stderr), tails)
+        ]
+        for reader in readers:
+            reader.start()
+
+        done = threading.Event()
+        timed_out = threading.Event()
+
+        def watchdog():
+            if done.wait(timeout):
+                return
+            timed_out.set()
+            self._signal_group(process, signal.SIGTERM)
+            if not done.wait(self.KILL_GRACE_SECONDS):
+                self._signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+        if timeout is not None:
+            threading.Thread(target=watchdog, daemon=True).start()
+        try:
+            returncode, rusage = self._wait(process)
+        finally:
+            done.set()
+
+        if timed_out.is_set():
+            # Children that outlived the killed leader still hold the pipes
+            self._signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        for reader in readers:
+            # Background daemons may inherit the pipes; do not wait on them forever
+            reader.join(timeout=5)
+        if log is not None:
+            log.close()
+
+        cpu_seconds = max_rss_mb = None
+        if rusage is not None:
+            cpu_seconds = round(rusage.ru_utime + rusage.ru_stime, 2)
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            max_rss_mb = round(rusage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+        stats = CommandStats(
+            command=subprocess.list2cmdline(command),
+            returncode=returncode,
+            wall_seconds=round(time.monotonic() - started, 2),
+            cpu_seconds=cpu_seconds,
+            max_rss_mb=max_rss_mb,
+            timed_out=timed_out.is_set(),
+            log_path=str(log.path) if log is not None else None,
+            output_bytes=tails[0].total + tails[1].total
+        )
+        with self._lock:
+            self.history.append(stats)
+
+        stdout, stderr = tails[0].text(), tails[1].text()
+        if stats.timed_out:
+            raise subprocess.TimeoutExpired(command, timeout, output=stdout, stderr=stderr)
+        return CommandResult(command, returncode, stdout, stderr, stats)
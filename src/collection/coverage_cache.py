@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Coverage result cache
+Reuses a previous CoverageResult and its report when a repository's source
+tree, the runner type and the runner configuration are all unchanged
+"""
+
+import hashlib
+import json
+import shutil
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from src.collection.coverage_tool_runner import CoverageResult
+
+
+class CoverageResultCache:
+    """Per-repository cache of coverage results keyed by worktree state, runner and config"""
+
+    VERSION = 1
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Directory holding index.json and copies of cached reports
+        """
+        self.cache_dir = Path(cache_dir)
+        self.index_file = self.cache_dir / "index.json"
+        self._entries: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self):
+        """Load the index if it matches the current version"""
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, json.JSONDecodeError):
+            return
+        if data.get("version") == self.VERSION:
+            self._entries = data.get("entries", {})
+
+    def _save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.index_file, 'w') as f:
+            json.dump({"version": self.VERSION, "entries": self._entries}, f, indent=2)
+
+    @staticmethod
+    def worktree_state(repo_path: Path) -> Optional[str]:
+        """
+        Identify the tracked content of a worktree
+
+        Returns:
+            HEAD's tree SHA, suffixed with a hash of `git diff HEAD` when tracked
+            files are modified; None if the repository state cannot be read
+        """
+        try:
+            tree = subprocess.run(
+                ["git", "rev-parse", "HEAD^{tree}"],
+                cwd=repo_path, capture_output=True, text=True, timeout=30, check=True
+            ).stdout.strip()
+            diff = subprocess.run(
+                ["git", "diff", "HEAD", "--binary"],
+                cwd=repo_path, capture_output=True, timeout=120, check=True
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if not tree:
+            return None
+        return f"{tree}+{hashlib.sha1(diff).hexdigest()[:12]}" if diff else tree
+
+    @staticmethod
+    def _slot(runner_type: str, config: Optional[Dict]) -> str:
+        """Identify a runner and its configuration"""
+        payload = json.dumps([runner_type, config or {}], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    @classmethod
+    def key(cls, state: str, runner_type: str, config: Optional[Dict] = None) -> str:
+        """Cache key for a worktree state, runner type and runner configuration"""
+        return hashlib.sha1(f"{state}\0{cls._slot(runner_type, config)}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CoverageResult]:
+        """
+        Look up a cached result
+
+        Returns:
+            CoverageResult pointing at the cached report copy, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        report = self.cache_dir / entry["report"] if entry.get("report") else None
+        if report is not None and not report.exists():
+            return None
+
+        result = CoverageResult.from_dict(entry["result"])
+        result.report_path = report
+        result.commands = []  # nothing was run for this result
+        result.cached = True
+        result.status_message = f"{result.status_message} (cached, tree {entry['state'][:12]})"
+        return result
+
+    def put(self, keys: Iterable[str], result: CoverageResult, state: str, runner_type: str,
+            config: Optional[Dict] = None):
+        """
+        Store a successful result and a copy of its report
+
+        Older entries for the same runner and configuration are dropped, so
+        only the latest report per runner is kept.
+
+        Args:
+            keys: Keys to store the result under (e.g. before and after the run)
+            result: Result to cache
+            state: Worktree state the result was produced from
+            runner_type: Coverage runner type
+            config: Runner configuration
+        """
+        slot = self._slot(runner_type, config)
+        keys = list(dict.fromkeys(keys))
+        report_dir = self.cache_dir / runner_type / keys[0][:16]
+
+        for key, entry in list(self._entries.items()):
+            if entry.get("slot") == slot:
+                del self._entries[key]
+                if entry.get("report"):
+                    shutil.rmtree(self.cache_dir / Path(entry["report"]).parent, ignore_errors=True)
+
+        report = None
+        if result.report_path and Path(result.report_path).exists():
+            report_dir.mkdir(parents=True, exist_ok=True)
+            copy = report_dir / Path(result.report_path).name
+            shutil.copy2(result.report_path, copy)
+            report = str(copy.relative_to(self.cache_dir))
+
+        entry = {
+            "slot": slot,
+            "state": state,
+            "runner": runner_type,
+            "result": result.to_dict(),
+            "report": report,
+            "stored_at": datetime.now().isoformat()
+        }
+        for key in keys:
+            self._entries[key] = entry
+        self._save()
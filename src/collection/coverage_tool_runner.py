@@ -4,13 +4,22 @@ Abstract coverage tool runners
 Unified interface for running different coverage tools
 """
 
+import hashlib
+import os
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional, List
 from dataclasses import dataclass
 from datetime import datetime
 
+from src.collection.command_executor import CommandExecutor
+from src.collection.lcov_merge import merge_lcov
+from src.collection.node_modules_cache import NodeModulesCache
+from src.collection.repo_manifest_index import RepoManifestIndex
+from src.collection.venv_cache import VirtualenvCache
+
 
 @dataclass
 class CoverageResult:
@@ -25,10 +34,14 @@ class CoverageResult:
     report_path: Optional[Path] = None
     status_message: str = ""
     errors: List[str] = None
+    commands: List[Dict] = None  # CommandStats of the commands run
+    cached: bool = False  # reused from the coverage result cache; nothing was run
 
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
+        if self.commands is None:
+            self.commands = []
 
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
@@ -43,17 +56,44 @@ class CoverageResult:
             "report_path": str(self.report_path) if self.report_path else None,
             "status_message": self.status_message,
             "errors": self.errors,
+            "commands": self.commands,
+            "cached": self.cached,
             "collected_at": datetime.now().isoformat()
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CoverageResult":
+        """Rebuild a result from `to_dict` output"""
+        return cls(
+            tool=data["tool"],
+            language=data["language"],
+            success=data["success"],
+            coverage_percentage=data.get("coverage_percentage"),
+            files_covered=data.get("files_covered", 0),
+            lines_covered=data.get("lines_covered", 0),
+            lines_total=data.get("lines_total", 0),
+            report_path=Path(data["report_path"]) if data.get("report_path") else None,
+            status_message=data.get("status_message", ""),
+            errors=list(data.get("errors") or []),
+            commands=list(data.get("commands") or [])
+        )
+
 
 class CoverageToolRunner:
     """Abstract base class for coverage tool runners"""
 
-    def __init__(self, repo_path: Path, output_dir: Path):
+    def __init__(self, repo_path: Path, output_dir: Path, log_dir: Optional[Path] = None):
+        """
+        Args:
+            repo_path: Path to repository
+            output_dir: Output directory for coverage reports
+            log_dir: Directory for command logs (defaults to output_dir/logs)
+        """
         self.repo_path = Path(repo_path)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        log_dir = Path(log_dir) if log_dir else self.output_dir / "logs"
+        self.executor = CommandExecutor(log_dir / type(self).__name__)
 
     def run(self, config: Optional[Dict] = None) -> CoverageResult:
         """
@@ -67,82 +107,160 @@ class CoverageToolRunner:
         """
         raise NotImplementedError("Subclasses must implement run()")
 
+    def _cache_dir(self, config: Dict) -> Path:
+        """Shared dependency cache location (config 'cache_dir', DORA_CACHE_DIR, or ~/.cache/dora)"""
+        cache_dir = config.get('cache_dir') or os.getenv('DORA_CACHE_DIR') or Path.home() / ".cache" / "dora"
+        return Path(cache_dir).expanduser()
+
     def _run_command(self, command: List[str], timeout: int = 600, cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
         """
         Helper to run a command
 
+        Output is streamed to the runner's log directory; only its tail is returned. Wall
+        time, CPU time and peak RSS are recorded in self.executor.history. The
+        repository's manifest index is invalidated afterwards, since builds
+        and installs write files into the clone.
+
         Args:
             command: Command to run
             timeout: Command timeout in seconds
             cwd: Working directory (defaults to repo_path)
 
         Returns:
-            CompletedProcess result
+            CompletedProcess-compatible CommandResult
 
         Raises:
-            subprocess.CalledProcessError on non-zero exit
+            subprocess.TimeoutExpired: After killing the command's process group
         """
         try:
-            result = subprocess.run(
-                command,
-                cwd=cwd or self.repo_path,
-                capture_output=True,
-                timeout=timeout,
-                text=True,
-                check=False
-            )
-            return result
-        except subprocess.TimeoutExpired as e:
-            raise subprocess.TimeoutExpired(command[0], timeout)
+            return self.executor.run(command, cwd=cwd or self.repo_path, timeout=timeout)
+        finally:
+            RepoManifestIndex.invalidate(self.repo_path)
 
 
 class JaCoCoRunner(CoverageToolRunner):
     """Runner for JaCoCo (Java) coverage"""
 
+    def _warm_marker(self, cache_dir: Path, build_tool: str) -> Path:
+        """Marker recording that this repository's dependencies are in the cache"""
+        repo_id = hashlib.sha1(str(self.repo_path.resolve()).encode()).hexdigest()[:16]
+        return cache_dir / "warm" / f"{build_tool}-{repo_id}"
+
+    def _maven_command(self, cache_dir: Optional[Path], offline: bool, shards: int = 1) -> List[str]:
+        """mvn invocation; in build-cache mode without `clean` and with a shared local repository"""
+        executable = "./mvnw" if (self.repo_path / "mvnw").exists() else "mvn"
+        command = [executable, "-B"]
+        if shards > 1:
+            # Surefire runs test classes in parallel JVMs; each appends to the same jacoco.exec
+            command += [f"-DforkCount={shards}", "-DreuseForks=true"]
+        if cache_dir is None:
+            return command + ["clean", "test", "jacoco:report"]
+        command.append(f"-Dmaven.repo.local={cache_dir / 'm2' / 'repository'}")
+        if offline:
+            command.append("--offline")
+        return command + ["test", "jacoco:report"]
+
+    def _gradle_command(self, cache_dir: Optional[Path], offline: bool, shards: int = 1) -> List[str]:
+        """
+        gradle invocation; in build-cache mode with a shared Gradle home and build cache
+
+        Always without a daemon: a daemon leaves the command's process group, so
+        the executor's timeout kill would miss it and it would outlive the job.
+        """
+        executable = "./gradlew" if (self.repo_path / "gradlew").exists() else "gradle"
+        command = [executable, "test", "jacocoTestReport", "--no-daemon"]
+        if shards > 1:
+            # Test forks write to the task's single execution data file
+            init_script = self.output_dir / "shards.gradle"
+            init_script.write_text(
+                "allprojects {\n"
+                f"    tasks.withType(Test).configureEach {{ maxParallelForks = {shards} }}\n"
+                "}\n"
+            )
+            command += ["--init-script", str(init_script)]
+        if cache_dir is None:
+            return command
+        command += ["--gradle-user-home", str(cache_dir / "gradle"), "--build-cache"]
+        if offline:
+            command.append("--offline")
+        return command
+
+    def _find_report(self) -> Optional[Path]:
+        """Newest jacoco.xml in the repository (incremental builds may leave older ones)"""
+        jacoco_files = RepoManifestIndex.for_repo(self.repo_path).find("jacoco.xml")
+        if not jacoco_files:
+            return None
+        return max(jacoco_files, key=lambda f: f.stat().st_mtime)
+
+    def _build(self, build_tool: str, config: Dict, cache_dir: Optional[Path], timeout: int) -> subprocess.CompletedProcess:
+        """
+        Run the build, offline first once the dependency cache is warm
+
+        An offline build that fails (e.g. a new dependency) is retried online.
+        """
+        make_command = self._maven_command if build_tool == "maven" else self._gradle_command
+        shards = max(1, int(config.get('shards', 1)))
+        if cache_dir is None:
+            return self._run_command(make_command(None, False, shards), timeout=timeout)
+
+        marker = self._warm_marker(cache_dir, build_tool)
+        offline = config.get('offline', 'auto')
+        use_offline = offline is True or (offline == 'auto' and marker.exists())
+
+        build = self._run_command(make_command(cache_dir, use_offline, shards), timeout=timeout)
+        if build.returncode != 0 and use_offline and offline == 'auto':
+            build = self._run_command(make_command(cache_dir, False, shards), timeout=timeout)
+
+        if build.returncode == 0:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        return build
+
     def run(self, config: Optional[Dict] = None) -> CoverageResult:
-        """Run JaCoCo coverage collection"""
+        """
+        Run JaCoCo coverage collection
+
+        Config keys:
+            build_tool: 'maven' or 'gradle' (both are tried in turn when unset)
+            build_cache: Incremental builds with shared dependency caches (default True)
+            cache_dir: Location of the shared Maven/Gradle caches
+            offline: True, False or 'auto' (offline once the cache is warm)
+            shards: Parallel test JVMs (Surefire forkCount / Gradle maxParallelForks)
+            timeout: Build timeout in seconds (default 900)
+        """
+        config = config or {}
         result = CoverageResult(
             tool="jacoco",
             language="java",
             success=False
         )
 
-        try:
-            # Try Maven first
-            maven_result = self._run_command(
-                ["mvn", "clean", "test", "jacoco:report"],
-                timeout=900
-            )
-
-            if maven_result.returncode == 0:
-                # Look for jacoco.xml
-                jacoco_files = list(self.repo_path.rglob("jacoco.xml"))
-                jacoco_files = [f for f in jacoco_files if ".git" not in str(f)]
-
-                if jacoco_files:
-                    result.report_path = jacoco_files[0]
-                    result.success = True
-                    result.status_message = f"JaCoCo report found at {result.report_path}"
-                    return result
+        build_tool = config.get('build_tool')
+        build_tools = [build_tool] if build_tool in ("maven", "gradle") else ["maven", "gradle"]
+        cache_dir = self._cache_dir(config) if config.get('build_cache', True) else None
+        timeout = int(config.get('timeout', 900))
 
-            # Try Gradle if Maven failed
-            gradle_result = self._run_command(
-                ["./gradlew", "test", "jacocoTestReport"],
-                timeout=900
-            )
-
-            if gradle_result.returncode == 0:
-                jacoco_files = list(self.repo_path.rglob("jacoco.xml"))
-                jacoco_files = [f for f in jacoco_files if ".git" not in str(f)]
-
-                if jacoco_files:
-                    result.report_path = jacoco_files[0]
+        try:
+            for tool in build_tools:
+                try:
+                    build = self._build(tool, config, cache_dir, timeout)
+                except FileNotFoundError as e:
+                    result.errors.append(f"{tool.capitalize()} not available: {e.filename}")
+                    continue
+                if build.returncode != 0:
+                    result.errors.append(f"{tool} build failed (exit code {build.returncode})")
+                    continue
+
+                report = self._find_report()
+                if report:
+                    result.report_path = report
                     result.success = True
-                    result.status_message = f"JaCoCo report found via Gradle"
+                    result.errors = []
+                    result.status_message = f"JaCoCo report found via {tool.capitalize()} at {report}"
                     return result
 
             result.errors.append("No JaCoCo reports generated")
-            result.status_message = "Maven and Gradle test/coverage execution completed but no reports found"
+            result.status_message = f"No JaCoCo report produced by {' or '.join(t.capitalize() for t in build_tools)}"
 
         except subprocess.TimeoutExpired:
             result.errors.append("JaCoCo execution timeout")
@@ -157,8 +275,41 @@ class JaCoCoRunner(CoverageToolRunner):
 class PytestCovRunner(CoverageToolRunner):
     """Runner for pytest-cov (Python) coverage"""
 
+    TEST_PACKAGES = ["pytest", "pytest-cov"]
+
+    def _prepare_python(self, config: Dict, packages: List[str]) -> str:
+        """
+        Interpreter to run the tests with
+
+        By default a cached virtualenv keyed by the requirement files (with
+        their includes), the project's packaging metadata and the Python
+        version; with isolated_env disabled, dependencies are installed into
+        the pipeline's own interpreter as before.
+        """
+        requirement_files = [self.repo_path / name for name in config.get('requirements', ["requirements.txt"])]
+        requirement_files = [path for path in requirement_files if path.exists()]
+
+        if not config.get('isolated_env', True):
+            for requirements_file in requirement_files:
+                self._run_command(["pip", "install", "-q", "-r", str(requirements_file)], timeout=600)
+            self._run_command(["pip", "install", "-q"] + packages, timeout=300)
+            return "python"
+
+        cache = VirtualenvCache(self._cache_dir(config), python=config.get('python'), executor=self.executor)
+        return str(cache.env_python(cache.ensure(requirement_files, packages, project_dir=self.repo_path)))
+
     def run(self, config: Optional[Dict] = None) -> CoverageResult:
-        """Run pytest with coverage"""
+        """
+        Run pytest with coverage
+
+        Config keys:
+            isolated_env: Run in a cached per-repo virtualenv (default True)
+            requirements: Requirement files relative to the repo (default ['requirements.txt'])
+            python: Base interpreter for the virtualenv (defaults to the pipeline's)
+            cache_dir: Location of the shared virtualenv and wheel cache
+            shards: Parallel pytest-xdist workers; pytest-cov combines their coverage data
+        """
+        config = config or {}
         result = CoverageResult(
             tool="pytest-cov",
             language="python",
@@ -166,25 +317,15 @@ class PytestCovRunner(CoverageToolRunner):
         )
 
         try:
-            # Install dependencies
-            requirements_file = self.repo_path / "requirements.txt"
-            if requirements_file.exists():
-                self._run_command(
-                    ["pip", "install", "-q", "-r", str(requirements_file)],
-                    timeout=600
-                )
-
-            # Install pytest and coverage if not present
-            self._run_command(
-                ["pip", "install", "-q", "pytest", "pytest-cov"],
-                timeout=300
-            )
+            shards = max(1, int(config.get('shards', 1)))
+            packages = self.TEST_PACKAGES + (["pytest-xdist"] if shards > 1 else [])
+            python = self._prepare_python(config, packages)
 
             # Run pytest with coverage
-            pytest_result = self._run_command(
-                ["python", "-m", "pytest", "--cov=.", "--cov-report=xml", "--tb=short", "-v"],
-                timeout=300
-            )
+            command = [python, "-m", "pytest", "--cov=.", "--cov-report=xml", "--tb=short", "-v"]
+            if shards > 1:
+                command += ["-n", str(shards)]
+            pytest_result = self._run_command(command, timeout=300)
 
             # Look for coverage.xml
             coverage_file = self.repo_path / "coverage.xml"
@@ -222,8 +363,65 @@ class PytestCovRunner(CoverageToolRunner):
 class LCovRunner(CoverageToolRunner):
     """Runner for LCOV (JavaScript/C) coverage"""
 
+    def _install_dependencies(self, config: Dict) -> Optional[str]:
+        """
+        Install node_modules, restoring them from the lockfile-keyed cache when possible
+
+        Returns:
+            Error message if installation failed, else None
+        """
+        if not config.get('dependency_cache', True):
+            npm_install = self._run_command(["npm", "install", "--legacy-peer-deps"], timeout=600)
+            return None if npm_install.returncode == 0 else (npm_install.stderr or "npm install failed")
+
+        cache = NodeModulesCache(self._cache_dir(config), executor=self.executor)
+        key = cache.key(self.repo_path)
+        if key is not None and cache.restore(key, self.repo_path):
+            return None
+
+        install = self._run_command(cache.install_command(self.repo_path), timeout=600)
+        if install.returncode != 0:
+            return install.stderr or "dependency install failed"
+        if key is not None:
+            cache.save(key, self.repo_path)
+        return None
+
+    def _run_sharded_tests(self, shards: int, lcov_file: Path):
+        """
+        Run the suite as parallel Jest shards and merge their lcov.info files
+
+        Each shard writes to coverage/shard-<i>; no lcov.info is left behind
+        unless at least one shard produced coverage.
+        """
+        shard_root = self.repo_path / "coverage"
+        for stale in [lcov_file] + list(shard_root.glob("shard-*/lcov.info")):
+            if stale.exists():
+                stale.unlink()
+
+        def run_shard(index: int) -> subprocess.CompletedProcess:
+            return self._run_command(
+                ["npm", "test", "--", "--coverage", "--coverage-reporter=lcov",
+                 f"--shard={index}/{shards}", f"--coverageDirectory=coverage/shard-{index}"],
+                timeout=600
+            )
+
+        with ThreadPoolExecutor(max_workers=shards) as executor:
+            list(executor.map(run_shard, range(1, shards + 1)))
+
+        tracefiles = sorted(shard_root.glob("shard-*/lcov.info"))
+        if tracefiles:
+            merge_lcov(tracefiles, lcov_file)
+
     def run(self, config: Optional[Dict] = None) -> CoverageResult:
-        """Run JavaScript tests with LCOV coverage"""
+        """
+        Run JavaScript tests with LCOV coverage
+
+        Config keys:
+            dependency_cache: Restore node_modules keyed by the lockfile hash (default True)
+            cache_dir: Location of the shared dependency cache
+            shards: Parallel Jest processes (--shard=i/N), merged into one lcov.info
+        """
+        config = config or {}
         result = CoverageResult(
             tool="lcov",
             language="javascript",
@@ -232,23 +430,23 @@ class LCovRunner(CoverageToolRunner):
 
         try:
             # Install dependencies
-            npm_install = self._run_command(
-                ["npm", "install", "--legacy-peer-deps"],
-                timeout=600
-            )
-
-            if npm_install.returncode != 0:
-                result.status_message = "npm install failed"
-                result.errors.append(npm_install.stderr or "npm install failed")
+            install_error = self._install_dependencies(config)
+            if install_error:
+                result.status_message = "Dependency install failed"
+                result.errors.append(install_error)
 
             # Run tests with coverage
-            npm_test = self._run_command(
-                ["npm", "test", "--", "--coverage", "--coverage-reporter=lcov"],
-                timeout=600
-            )
+            shards = max(1, int(config.get('shards', 1)))
+            lcov_file = self.repo_path / "coverage" / "lcov.info"
+            if shards > 1:
+                self._run_sharded_tests(shards, lcov_file)
+            else:
+                self._run_command(
+                    ["npm", "test", "--", "--coverage", "--coverage-reporter=lcov"],
+                    timeout=600
+                )
 
             # Look for lcov.info
-            lcov_file = self.repo_path / "coverage" / "lcov.info"
             if lcov_file.exists():
                 result.report_path = lcov_file
                 result.success = True
@@ -278,7 +476,8 @@ class CoverageToolRunnerFactory:
     }
 
     @staticmethod
-    def create(tool_type: str, repo_path: Path, output_dir: Path) -> Optional[CoverageToolRunner]:
+    def create(tool_type: str, repo_path: Path, output_dir: Path,
+               log_dir: Optional[Path] = None) -> Optional[CoverageToolRunner]:
         """
         Create appropriate runner for tool type
 
@@ -286,13 +485,14 @@ class CoverageToolRunnerFactory:
             tool_type: Type of coverage tool
             repo_path: Path to repository
             output_dir: Output directory for coverage reports
+            log_dir: Directory for command logs (defaults to output_dir/logs)
 
         Returns:
             CoverageToolRunner instance or None if tool not supported
         """
         runner_class = CoverageToolRunnerFactory.RUNNERS.get(tool_type)
         if runner_class:
-            return runner_class(repo_path, output_dir)
+            return runner_class(repo_path, output_dir, log_dir)
         return None
 
     @staticmethod
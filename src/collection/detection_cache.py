@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Framework detection cache
+Stores FrameworkDetector.detect_all output per repository, keyed by the git
+blob SHAs of the manifest files it inspects and by the detector's own source,
+so manifests are only re-parsed when one of them or the detection rules change
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Tuple
+
+from src.collection import framework_detector, repo_manifest_index
+from src.collection.framework_detector import FrameworkDetector
+
+
+def blob_sha(path: Path) -> str:
+    """Git blob SHA of a file (same as `git hash-object`)"""
+    data = Path(path).read_bytes()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def rules_hash() -> str:
+    """SHA-1 of the detector modules, so edited detection rules invalidate cached results"""
+    digest = hashlib.sha1()
+    for module in (framework_detector, repo_manifest_index):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+class FrameworkDetectionCache:
+    """Cached framework detection for one repository, in .cache/detection/<repo>.json"""
+
+    # Bump when the cached result layout changes; detection rule changes are covered by rules_hash()
+    VERSION = 1
+    _rules_hash = None
+
+    def __init__(self, cache_file: Path):
+        """
+        Initialize cache
+
+        Args:
+            cache_file: JSON file holding the last detection for the repository
+        """
+        self.cache_file = Path(cache_file)
+
+    def key(self, repo_path: Path, language: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Cache key for a repository's current manifests
+
+        Returns:
+            (key, {relative manifest path: blob SHA})
+        """
+        repo_path = Path(repo_path)
+        manifests = {
+            str(path.relative_to(repo_path)): blob_sha(path)
+            for path in FrameworkDetector.manifest_files(repo_path, language)
+        }
+        if FrameworkDetectionCache._rules_hash is None:
+            FrameworkDetectionCache._rules_hash = rules_hash()
+        payload = json.dumps([language, manifests, self._rules_hash], sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest(), manifests
+
+    def detect(self, repo_path: Path, language: str) -> Tuple[Dict, bool]:
+        """
+        Detect test framework, coverage tool and build tool in one pass
+
+        Args:
+            repo_path: Path to repository
+            language: Programming language
+
+        Returns:
+            (detect_all result, True if it came from the cache)
+        """
+        key, manifests = self.key(repo_path, language)
+        try:
+            with open(self.cache_file, 'r') as f:
+                cached = json.load(f)
+            if cached.get("version") == self.VERSION and cached.get("key") == key:
+                return cached["result"], True
+        except (IOError, OSError, json.JSONDecodeError, KeyError):
+            pass
+
+        result = FrameworkDetector.detect_all(repo_path, language)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w') as f:
+            json.dump({
+                "version": self.VERSION,
+                "key": key,
+                "manifests": manifests,
+                "result": result
+            }, f, indent=2)
+        return result, False
@@ -9,6 +9,8 @@ import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from src.collection.repo_manifest_index import RepoManifestIndex
+
 
 class FrameworkDetector:
     """Detects test frameworks and coverage tools from project configuration"""
@@ -27,9 +29,10 @@ class FrameworkDetector:
         test_framework = None
         coverage_tool = None
 
+        index = RepoManifestIndex.for_repo(repo_path)
+
         # Check Maven pom.xml
-        pom_files = list(repo_path.rglob("pom.xml"))
-        pom_files = [p for p in pom_files if ".git" not in str(p)]
+        pom_files = index.find("pom.xml")
 
         for pom_file in pom_files:
             try:
@@ -71,9 +74,7 @@ class FrameworkDetector:
                 pass
 
         # Check Gradle build.gradle or build.gradle.kts
-        gradle_files = list(repo_path.rglob("build.gradle"))
-        gradle_files.extend(list(repo_path.rglob("build.gradle.kts")))
-        gradle_files = [f for f in gradle_files if ".git" not in str(f)]
+        gradle_files = index.find("build.gradle") + index.find("build.gradle.kts")
 
         for gradle_file in gradle_files:
             try:
@@ -110,6 +111,63 @@ class FrameworkDetector:
 
         return test_framework, coverage_tool
 
+    # Build files identifying a Java build tool, checked at the repository root first
+    JAVA_BUILD_FILES = {
+        "maven": ("pom.xml", "mvnw"),
+        "gradle": ("build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts", "gradlew"),
+    }
+
+    @staticmethod
+    def detect_java_build_tool(repo_path: Path) -> Optional[str]:
+        """
+        Detect the Java build tool
+
+        Args:
+            repo_path: Path to repository
+
+        Returns:
+            'maven', 'gradle', or None if neither is used
+        """
+        repo_path = Path(repo_path)
+        for tool, names in FrameworkDetector.JAVA_BUILD_FILES.items():
+            if any((repo_path / name).exists() for name in names):
+                return tool
+
+        # Fall back to build files in subdirectories (e.g. a Java module in a mixed repo)
+        index = RepoManifestIndex.for_repo(repo_path)
+        for tool, names in FrameworkDetector.JAVA_BUILD_FILES.items():
+            if any(index.find(name) for name in names):
+                return tool
+        return None
+
+    # Root files read by detect_python_framework
+    PYTHON_MANIFESTS = ("requirements.txt", "requirements-dev.txt", "setup.py", "pyproject.toml")
+
+    @staticmethod
+    def manifest_files(repo_path: Path, language: str) -> List[Path]:
+        """
+        Files whose content determines detect_all's result for a language
+
+        Args:
+            repo_path: Path to repository
+            language: Programming language
+
+        Returns:
+            Existing manifest files, sorted
+        """
+        repo_path = Path(repo_path)
+        index = RepoManifestIndex.for_repo(repo_path)
+        if language in ("java", "mixed"):
+            names = {name for names in FrameworkDetector.JAVA_BUILD_FILES.values() for name in names}
+            files = [f for name in names for f in index.find(name)]
+        elif language == "python":
+            files = [repo_path / name for name in FrameworkDetector.PYTHON_MANIFESTS]
+        elif language == "javascript":
+            files = index.find("package.json")
+        else:
+            files = []
+        return sorted(f for f in files if f.is_file())
+
     @staticmethod
     def detect_python_framework(repo_path: Path) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -124,12 +182,7 @@ class FrameworkDetector:
         test_framework = None
         coverage_tool = None
 
-        requirements_files = [
-            repo_path / "requirements.txt",
-            repo_path / "requirements-dev.txt",
-            repo_path / "setup.py",
-            repo_path / "pyproject.toml"
-        ]
+        requirements_files = [repo_path / name for name in FrameworkDetector.PYTHON_MANIFESTS]
 
         for req_file in requirements_files:
             if not req_file.exists():
@@ -177,8 +230,7 @@ class FrameworkDetector:
         test_framework = None
         coverage_tool = None
 
-        package_files = list(repo_path.rglob("package.json"))
-        package_files = [f for f in package_files if ".git" not in str(f) and "node_modules" not in str(f)]
+        package_files = RepoManifestIndex.for_repo(repo_path).find("package.json")
 
         for package_file in package_files:
             try:
@@ -308,5 +360,6 @@ class FrameworkDetector:
         return {
             "test_framework": test_fw,
             "coverage_tool": coverage,
+            "build_tool": FrameworkDetector.detect_java_build_tool(repo_path) if language in ("java", "mixed") else None,
             "language": language
         }
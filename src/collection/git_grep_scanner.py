@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+git grep-backed scanning backend
+Lets git list and search repository content (multi-threaded, index/revision aware,
+works on bare and partial clones); Python only parses the matched lines
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Characters with special meaning in POSIX extended regular expressions
+_ERE_SPECIAL = set('.[]()*+?{}|^$\\')
+
+
+def ere_escape(literal: str) -> str:
+    """Escape a literal for use in a `git grep -E` pattern"""
+    return ''.join('\\' + c if c in _ERE_SPECIAL else c for c in literal)
+
+
+class GitGrepBackend:
+    """Lists and searches files of a repository through git itself"""
+
+    def __init__(self, repo_path: Path, revision: Optional[str] = None):
+        """
+        Initialize backend
+
+        Args:
+            repo_path: Path to the repository (worktree or bare)
+            revision: Revision to scan; None scans the index (or HEAD for bare repos)
+        """
+        self.repo_path = Path(repo_path)
+        self.revision = revision or (None if self._has_worktree() else "HEAD")
+
+    def _has_worktree(self) -> bool:
+        """Check whether the repository has a worktree (and therefore an index)"""
+        result = subprocess.run(
+            ["git", "rev-parse", "--is-bare-repository"],
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True
+        )
+        return result.returncode == 0 and result.stdout.strip() == "false"
+
+    def _source_args(self) -> List[str]:
+        """Arguments selecting the index or the revision"""
+        return [self.revision] if self.revision else ["--cached"]
+
+    def list_files(self) -> List[str]:
+        """
+        List tracked file paths
+
+        Returns:
+            Repository-relative POSIX paths in git's (sorted) order
+        """
+        if self.revision:
+            command = ["git", "ls-tree", "-r", "-z", "--name-only", self.revision]
+        else:
+            command = ["git", "ls-files", "-z"]
+
+        result = subprocess.run(command, cwd=self.repo_path, capture_output=True, check=True)
+        return [p.decode("utf-8", errors="replace") for p in result.stdout.split(b"\0") if p]
+
+    def list_blobs(self) -> Dict[str, str]:
+        """
+        Map tracked file paths to their blob SHAs
+
+        Returns:
+            Mapping of repository-relative POSIX path -> blob SHA
+        """
+        if self.revision:
+            command = ["git", "ls-tree", "-r", "-z", self.revision]
+        else:
+            command = ["git", "ls-files", "-s", "-z"]
+
+        result = subprocess.run(command, cwd=self.repo_path, capture_output=True, check=True)
+
+        blobs = {}
+        for entry in result.stdout.split(b"\0"):
+            if not entry:
+                continue
+            meta, _, path = entry.partition(b"\t")
+            fields = meta.split()
+            # ls-files -s: "<mode> <sha> <stage>", ls-tree: "<mode> <type> <sha>"
+            sha = fields[2] if self.revision else fields[1]
+            if self.revision and fields[1] != b"blob":
+                continue
+            blobs[path.decode("utf-8", errors="replace")] = sha.decode()
+        return blobs
+
+    def list_modified(self) -> List[str]:
+        """
+        List tracked files whose worktree content differs from the index
+
+        Returns:
+            Repository-relative POSIX paths (empty when scanning a revision)
+        """
+        if self.revision:
+            return []
+        result = subprocess.run(
+            ["git", "diff", "--name-only", "-z"],
+            cwd=self.repo_path,
+            capture_output=True,
+            check=True
+        )
+        return [p.decode("utf-8", errors="replace") for p in result.stdout.split(b"\0") if p]
+
+    def grep(self, literals: Iterable[str], ignore_case: bool = True,
+             extra_patterns: Iterable[str] = ()) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Find lines containing any of the literals
+
+        Args:
+            literals: Literal strings to search for
+            ignore_case: Match case-insensitively
+            extra_patterns: Additional raw ERE patterns
+
+        Returns:
+            Mapping of path -> list of (line_number, line_text)
+        """
+        patterns = [ere_escape(literal) for literal in sorted(set(literals))] + list(extra_patterns)
+        if not patterns:
+            return {}
+
+        command = ["git", "grep", "-z", "-n", "-I", "-E"]
+        if ignore_case:
+            command.append("-i")
+        for pattern in patterns:
+            command.extend(["-e", pattern])
+        command.extend(self._source_args())
+
+        process = subprocess.Popen(
+            command,
+            cwd=self.repo_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+        # With a revision git prefixes every path with "<rev>:"
+        prefix = f"{self.revision}:".encode() if self.revision else b""
+        matches: Dict[str, List[Tuple[int, str]]] = {}
+        for raw in process.stdout:
+            parts = raw.rstrip(b"\n").split(b"\0", 2)
+            if len(parts) != 3:
+                continue
+            path, line_number, text = parts
+            if prefix and path.startswith(prefix):
+                path = path[len(prefix):]
+            matches.setdefault(path.decode("utf-8", errors="replace"), []).append(
+                (int(line_number), text.decode("utf-8", errors="ignore"))
+            )
+
+        process.wait()
+        # Exit code 1 only means "no matches"
+        if process.returncode not in (0, 1):
+            raise subprocess.CalledProcessError(process.returncode, "git grep", stderr=process.stderr.read())
+
+        return matches
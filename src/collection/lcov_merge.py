@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+LCOV tracefile merging
+Combines the lcov.info files written by sharded test runs into one tracefile,
+summing hit counts per source line, function and branch
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+
+class _FileRecord:
+    """Accumulated coverage of one source file"""
+
+    def __init__(self):
+        self.lines: Dict[int, int] = {}
+        self.functions: Dict[str, int] = {}  # name -> first line
+        self.function_hits: Dict[str, int] = {}
+        self.branches: Dict[Tuple[str, str, str], int] = {}  # (line, block, branch) -> taken
+
+    def add(self, line: str):
+        """Fold one record line into the totals"""
+        tag, _, value = line.partition(":")
+        if tag == "DA":
+            number, hits = value.split(",")[:2]
+            self.lines[int(number)] = self.lines.get(int(number), 0) + int(hits)
+        elif tag == "FN":
+            number, name = value.split(",", 1)
+            self.functions.setdefault(name, int(number))
+        elif tag == "FNDA":
+            hits, name = value.split(",", 1)
+            self.function_hits[name] = self.function_hits.get(name, 0) + int(hits)
+        elif tag == "BRDA":
+            number, block, branch, taken = value.split(",")
+            key = (number, block, branch)
+            self.branches[key] = self.branches.get(key, 0) + (0 if taken == "-" else int(taken))
+
+    def lines_out(self) -> Iterable[str]:
+        """Record lines with summary counts recomputed from the merged data"""
+        for name, number in sorted(self.functions.items(), key=lambda item: item[1]):
+            yield f"FN:{number},{name}"
+        for name in sorted(self.function_hits):
+            yield f"FNDA:{self.function_hits[name]},{name}"
+        if self.functions or self.function_hits:
+            yield f"FNF:{len(self.functions)}"
+            yield f"FNH:{sum(1 for hits in self.function_hits.values() if hits)}"
+        for (number, block, branch), taken in sorted(self.branches.items(), key=lambda item: int(item[0][0])):
+            yield f"BRDA:{number},{block},{branch},{taken}"
+        if self.branches:
+            yield f"BRF:{len(self.branches)}"
+            yield f"BRH:{sum(1 for taken in self.branches.values() if taken)}"
+        for number in sorted(self.lines):
+            yield f"DA:{number},{self.lines[number]}"
+        yield f"LF:{len(self.lines)}"
+        yield f"LH:{sum(1 for hits in self.lines.values() if hits)}"
+
+
+def merge_lcov(tracefiles: Iterable[Path], output: Path) -> int:
+    """
+    Merge LCOV tracefiles
+
+    Args:
+        tracefiles: lcov.info files to merge
+        output: Merged tracefile to write
+
+    Returns:
+        Number of source files in the merged tracefile
+    """
+    records: Dict[str, _FileRecord] = {}
+    for tracefile in tracefiles:
+        record = None
+        with open(tracefile, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("SF:"):
+                    record = records.setdefault(line[3:], _FileRecord())
+                elif line == "end_of_record":
+                    record = None
+                elif record is not None:
+                    try:
+                        record.add(line)
+                    except ValueError:
+                        continue
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        for source in sorted(records):
+            f.write("TN:\n")
+            f.write(f"SF:{source}\n")
+            for line in records[source].lines_out():
+                f.write(line + "\n")
+            f.write("end_of_record\n")
+    return len(records)
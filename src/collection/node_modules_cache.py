@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Lockfile-keyed node_modules cache
+Installed node_modules trees are stored per hash of the lockfile, package.json
+and Node version, and restored into a clone by reflink (copy-on-write) or
+plain copy instead of reinstalling when the lockfile has not changed
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.collection.command_executor import CommandExecutor
+
+
+# Lockfile -> package manager, in order of precedence
+LOCKFILES = (
+    ("pnpm-lock.yaml", "pnpm"),
+    ("yarn.lock", "yarn"),
+    ("package-lock.json", "npm"),
+    ("npm-shrinkwrap.json", "npm"),
+)
+
+
+def detect_package_manager(repo_path: Path) -> Tuple[str, Optional[Path]]:
+    """
+    Detect the package manager from the repository's lockfile
+
+    Returns:
+        (manager, lockfile) - ('npm', None) when there is no lockfile
+    """
+    for name, manager in LOCKFILES:
+        lockfile = Path(repo_path) / name
+        if lockfile.exists():
+            return manager, lockfile
+    return "npm", None
+
+
+def copy_tree(source: Path, destination: Path, executor: Optional[CommandExecutor] = None) -> str:
+    """
+    Copy a directory tree as cheaply as the filesystem allows
+
+    Tries a reflink (copy-on-write) copy, then a plain copy. Never hardlinks:
+    postinstall or build steps that modify files in place would otherwise
+    change the source tree too.
+
+    Args:
+        source: Directory to copy
+        destination: New directory
+        executor: Runs the cp commands (output is discarded when None)
+
+    Returns:
+        'reflink' or 'copy'
+    """
+    executor = executor or CommandExecutor()
+    attempts = [("reflink", ["cp", "-a", "--reflink=always"]), ("copy", ["cp", "-a"])]
+    for mode, command in attempts:
+        try:
+            copied = executor.run(command + [str(source), str(destination)], timeout=600)
+        except (OSError, subprocess.SubprocessError):
+            copied = None
+        if copied is not None and copied.returncode == 0:
+            return mode
+        shutil.rmtree(destination, ignore_errors=True)
+    shutil.copytree(source, destination, symlinks=True)
+    return "copy"
+
+
+class NodeModulesCache:
+    """node_modules trees under <cache_dir>/node_modules, keyed by lockfile hash"""
+
+    COMPLETE_MARKER = ".dora-complete"
+    MAX_ENTRIES = 10  # least recently used trees beyond this are removed
+
+    def __init__(self, cache_dir: Path, executor: Optional[CommandExecutor] = None):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Shared dependency cache directory
+            executor: Runs node/cp commands (logs, timeouts, resource stats);
+                output is discarded when None
+        """
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / "node_modules"
+        self.executor = executor or CommandExecutor()
+
+    def _node_version(self) -> str:
+        try:
+            return self.executor.run(["node", "--version"], timeout=30).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+
+    def key(self, repo_path: Path) -> Optional[str]:
+        """
+        Hash of the lockfile, package.json, package manager and Node version
+
+        Returns:
+            Key, or None when the repository has no lockfile (nothing to key on)
+        """
+        manager, lockfile = detect_package_manager(repo_path)
+        if lockfile is None:
+            return None
+        digest = hashlib.sha256(f"{manager}\0{self._node_version()}".encode())
+        for path in (lockfile, Path(repo_path) / "package.json"):
+            if path.exists():
+                digest.update(b"\0" + path.name.encode() + b"\0" + path.read_bytes())
+        return digest.hexdigest()[:16]
+
+    def install_command(self, repo_path: Path) -> List[str]:
+        """Install command honouring the lockfile and preferring the local package cache"""
+        manager, lockfile = detect_package_manager(repo_path)
+        if manager == "pnpm":
+            return ["pnpm", "install", "--frozen-lockfile", "--prefer-offline",
+                    "--store-dir", str(self.cache_dir / "pnpm-store")]
+        if manager == "yarn":
+            return ["yarn", "install", "--frozen-lockfile", "--prefer-offline",
+                    "--cache-folder", str(self.cache_dir / "yarn")]
+        command = ["npm", "ci"] if lockfile is not None else ["npm", "install"]
+        return command + ["--prefer-offline", "--no-audit", "--no-fund", "--legacy-peer-deps",
+                          "--cache", str(self.cache_dir / "npm")]
+
+    def restore(self, key: str, repo_path: Path) -> Optional[str]:
+        """
+        Restore a cached node_modules into a repository
+
+        Returns:
+            Copy mode used, or None on a cache miss
+        """
+        entry = self.entries_dir / key
+        marker = entry / self.COMPLETE_MARKER
+        if not marker.exists():
+            return None
+        target = Path(repo_path) / "node_modules"
+        shutil.rmtree(target, ignore_errors=True)
+        mode = copy_tree(entry / "node_modules", target, executor=self.executor)
+        marker.touch()
+        return mode
+
+    def save(self, key: str, repo_path: Path):
+        """
+        Store a repository's freshly installed node_modules
+
+        The tree is copied so later changes in the clone do not alter the
+        cached copy, then moved into place atomically.
+        """
+        source = Path(repo_path) / "node_modules"
+        if not source.is_dir() or (self.entries_dir / key / self.COMPLETE_MARKER).exists():
+            return
+        build_dir = self.entries_dir / f"{key}.tmp-{os.getpid()}-{id(source):x}"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        build_dir.mkdir(parents=True)
+        try:
+            copy_tree(source, build_dir / "node_modules", executor=self.executor)
+            (build_dir / self.COMPLETE_MARKER).touch()
+            build_dir.rename(self.entries_dir / key)
+        except OSError:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            return
+        self.prune()
+
+    def prune(self, keep: Optional[int] = None):
+        """Remove the least recently used trees beyond `keep`"""
+        keep = self.MAX_ENTRIES if keep is None else keep
+        entries = [d for d in self.entries_dir.iterdir() if (d / self.COMPLETE_MARKER).exists()]
+        entries.sort(key=lambda d: (d / self.COMPLETE_MARKER).stat().st_mtime, reverse=True)
+        for entry in entries[keep:]:
+            shutil.rmtree(entry, ignore_errors=True)
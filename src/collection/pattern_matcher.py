@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Compiled multi-pattern matcher for artifact and test scanning
+Compiles configured and default patterns once per repository, runs a cheap
+literal prefilter before any full regex, and bounds the time user-supplied
+regexes may spend on a single file
+"""
+
+import hashlib
+import re
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+
+# Characters that end the literal prefix of a regex
+_REGEX_META = set('.^$*+?{}[]\\|()')
+_QUANTIFIERS = set('*?{')
+
+
+class PatternTimeout(Exception):
+    """Raised when user-supplied patterns exceed the per-file time budget"""
+    pass
+
+
+@dataclass
+class CompiledPattern:
+    """A compiled regex plus the literals at least one of which must occur for it to match"""
+    kind: str
+    regex: Pattern
+    literals: Tuple[str, ...] = ()
+    user_supplied: bool = False
+
+
+@dataclass
+class MatchStats:
+    """Counters describing how much work the prefilter saved"""
+    files_checked: int = 0
+    regex_runs: int = 0
+    regex_skipped: int = 0
+    timeouts: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "files_checked": self.files_checked,
+            "regex_runs": self.regex_runs,
+            "regex_skipped": self.regex_skipped,
+            "timeouts": self.timeouts
+        }
+
+
+def required_literal(regex: str, min_length: int = 2) -> Optional[str]:
+    """
+    Extract a literal prefix every match of a regex must start with
+
+    Conservative: returns None for alternations, inline flags or patterns
+    that do not start with at least `min_length` plain characters.
+
+    Args:
+        regex: Regex source
+        min_length: Shortest literal worth prefiltering on
+
+    Returns:
+        Lowercased literal, or None if no safe literal exists
+    """
+    if '|' in regex or regex.startswith('(?'):
+        return None
+
+    prefix = []
+    for char in regex:
+        if char in _REGEX_META:
+            # A quantifier makes the preceding character optional/repeated
+            if char in _QUANTIFIERS and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+
+    literal = ''.join(prefix)
+    if len(literal) < min_length:
+        return None
+    return literal.lower()
+
+
+class ArtifactMatcher:
+    """Per-repository compiled matcher for epic/story documents and test files"""
+
+    # Gate every document must pass before epic/story regexes run
+    DOCUMENT_GATE = (r'epic|epic\s*story|us-\d+|user\s*story', re.IGNORECASE, ('epic', 'us-', 'user'))
+
+    # Fallback patterns used when nothing is configured
+    DEFAULT_EPIC = (r'[Ee]pic\s+(\d+):\s*([^\n]+)', 0, ('epic',))
+    DEFAULT_STORY = (r'US\s*(\d+\.\d+)', re.IGNORECASE, ('us',))
+
+    # Epic references inside test files
+    TEST_EPIC_REF = (r'[Ee]pic\s+(\d+)', 0, ('epic',))
+    TEST_STORY_REF = (r'US\s*(\d+)\.(\d*)', re.IGNORECASE, ('us',))
+
+    # Framework markers are plain literals; the prefilter alone decides them
+    FRAMEWORK_MARKERS = {
+        'import unittest': 'unittest',
+        'from unittest': 'unittest',
+        'import pytest': 'pytest',
+        'from pytest': 'pytest',
+        'import org.junit': 'JUnit',
+        'describe(': 'Jest/Mocha',
+        'it(': 'Jest/Mocha',
+    }
+
+    def __init__(self, patterns_config: Optional[Dict] = None, time_budget: float = 2.0):
+        """
+        Compile all patterns for a repository
+
+        Args:
+            patterns_config: `artifact_patterns` section from configuration
+            time_budget: Seconds user-supplied regexes may spend per file
+        """
+        patterns_config = patterns_config or {}
+        self.time_budget = time_budget
+        self.stats = MatchStats()
+        self.errors: List[str] = []
+
+        self.document_gate = self._compile('gate', *self.DOCUMENT_GATE)
+
+        epic_sources = self._configured_regexes(patterns_config, 'epics')
+        story_sources = self._configured_regexes(patterns_config, 'stories')
+
+        # Fall back to defaults only when nothing is configured (not when it fails to compile)
+        if epic_sources:
+            self.epic_patterns = self._compile_user('epics', epic_sources)
+        else:
+            self.epic_patterns = [self._compile('epics', *self.DEFAULT_EPIC)]
+        if story_sources:
+            self.story_patterns = self._compile_user('stories', story_sources)
+        else:
+            self.story_patterns = [self._compile('stories', *self.DEFAULT_STORY)]
+
+        self.test_ref_patterns = [
+            self._compile('test_epic_ref', *self.TEST_EPIC_REF),
+            self._compile('test_story_ref', *self.TEST_STORY_REF),
+        ]
+
+        literals = set(self.FRAMEWORK_MARKERS)
+        for pattern in [self.document_gate] + self.epic_patterns + self.story_patterns + self.test_ref_patterns:
+            literals.update(pattern.literals)
+        self._all_literals = frozenset(literals)
+
+    @property
+    def literals(self) -> frozenset:
+        """All prefilter literals (lowercase)"""
+        return self._all_literals
+
+    @property
+    def has_unfiltered_patterns(self) -> bool:
+        """True if some pattern has no literal and must see every line"""
+        patterns = [self.document_gate] + self.epic_patterns + self.story_patterns + self.test_ref_patterns
+        return any(not p.literals for p in patterns)
+
+    def fingerprint(self) -> str:
+        """
+        Hash of every compiled pattern, its flags and literals
+
+        Changes whenever the configuration or the built-in patterns change, so
+        it can scope cached per-file results.
+        """
+        patterns = [self.document_gate] + self.epic_patterns + self.story_patterns + self.test_ref_patterns
+        payload = repr((
+            [(p.kind, p.regex.pattern, p.regex.flags, p.literals, p.user_supplied) for p in patterns],
+            sorted(self.FRAMEWORK_MARKERS.items())
+        ))
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _configured_regexes(patterns_config: Dict, section: str) -> List[str]:
+        """Collect regex sources from an artifact_patterns section"""
+        regexes = []
+        for pattern_obj in (patterns_config.get(section) or {}).get('local_patterns', []) or []:
+            if isinstance(pattern_obj, dict) and pattern_obj.get('regex'):
+                regexes.append(pattern_obj['regex'])
+        return regexes
+
+    @staticmethod
+    def _compile(kind: str, source: str, flags: int, literals: Iterable[str]) -> CompiledPattern:
+        """Compile a built-in pattern with hand-picked literals"""
+        return CompiledPattern(kind=kind, regex=re.compile(source, flags), literals=tuple(literals))
+
+    def _compile_user(self, kind: str, sources: List[str]) -> List[CompiledPattern]:
+        """Compile user-supplied patterns, deriving a prefilter literal where safe"""
+        compiled = []
+        for source in dict.fromkeys(sources):  # de-duplicate, keep order
+            try:
+                regex = re.compile(source)
+            except re.error as e:
+                self.errors.append(f"Invalid {kind} regex {source!r}: {e}")
+                continue
+            literal = required_literal(source)
+            compiled.append(CompiledPattern(
+                kind=kind,
+                regex=regex,
+                literals=(literal,) if literal else (),
+                user_supplied=True
+            ))
+        return compiled
+
+    def find_literals(self, content: str) -> Set[str]:
+        """
+        Find which prefilter literals occur in the content (case-insensitive)
+
+        Lowercases the content once and runs a plain substring search per
+        literal, which stops at the first occurrence; this is several times
+        faster than a case-insensitive regex alternation over large files.
+        """
+        lowered = content.lower()
+        return {literal for literal in self._all_literals if literal in lowered}
+
+    def _should_run(self, pattern: CompiledPattern, found: Set[str]) -> bool:
+        """Check the prefilter for a pattern"""
+        if not pattern.literals or any(lit in found for lit in pattern.literals):
+            self.stats.regex_runs += 1
+            return True
+        self.stats.regex_skipped += 1
+        return False
+
+    @contextmanager
+    def _time_guard(self, seconds: float):
+        """
+        Interrupt long-running regexes after `seconds`
+
+        Uses SIGALRM, which CPython's regex engine honours between steps. Only
+        available in the main thread on POSIX; elsewhere patterns run unguarded.
+        """
+        if (seconds <= 0 or not hasattr(signal, 'setitimer')
+                or threading.current_thread() is not threading.main_thread()):
+            yield
+            return
+
+        def _on_alarm(signum, frame):
+            raise PatternTimeout()
+
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def _findall(self, patterns: List[CompiledPattern], content: str, found: Set[str], label: str,
+                 budget: Optional[float] = None) -> List[Tuple[str, list]]:
+        """Run the patterns that pass the prefilter; user patterns share one time budget"""
+        results = []
+        builtin = [p for p in patterns if not p.user_supplied]
+        user = [p for p in patterns if p.user_supplied]
+        budget = self.time_budget if budget is None else budget
+
+        for pattern in builtin:
+            if self._should_run(pattern, found):
+                results.append((pattern.kind, pattern.regex.findall(content)))
+
+        if user:
+            started = time.monotonic()
+            try:
+                with self._time_guard(budget):
+                    for pattern in user:
+                        if self._should_run(pattern, found):
+                            results.append((pattern.kind, pattern.regex.findall(content)))
+            except PatternTimeout:
+                elapsed = round(time.monotonic() - started, 2)
+                self.stats.timeouts.append(f"{label}: user patterns exceeded {round(budget, 2)}s ({elapsed}s)")
+
+        return results
+
+    def _passes_gate(self, content: str, found: Set[str]) -> bool:
+        """Check whether a document can contain epics or stories at all"""
+        return self._should_run(self.document_gate, found) and bool(self.document_gate.regex.search(content))
+
+    def _extract_document(self, content: str, found: Set[str], label: str,
+                          budget: Optional[float] = None, include_user: bool = True) -> Tuple[Set[str], Set[str]]:
+        """Run epic and story patterns over a document (or chunk)"""
+        epics, stories = set(), set()
+        patterns = [p for p in self.epic_patterns + self.story_patterns if include_user or not p.user_supplied]
+        for kind, matches in self._findall(patterns, content, found, label, budget):
+            for match in matches:
+                if kind == 'epics':
+                    if isinstance(match, tuple):
+                        epic_num, epic_name = match[0], match[1] if len(match) > 1 else ''
+                        epics.add(f"Epic {epic_num}: {epic_name.strip()}" if epic_name else f"Epic {epic_num}")
+                    else:
+                        epics.add(f"Epic {match}")
+                else:
+                    stories.add(f"US{match[0] if isinstance(match, tuple) else match}")
+        return epics, stories
+
+    def match_document(self, content: str, label: str = "") -> Tuple[Set[str], Set[str]]:
+        """
+        Extract epics and user stories from a document
+
+        Args:
+            content: Document text
+            label: File label used in timeout reports
+
+        Returns:
+            Tuple of (epics, stories)
+        """
+        self.stats.files_checked += 1
+        found = self.find_literals(content)
+        if not self._passes_gate(content, found):
+            return set(), set()
+        return self._extract_document(content, found, label)
+
+    def match_document_chunks(self, chunks: Iterable, label: str = "") -> Tuple[Set[str], Set[str]]:
+        """
+        Extract epics and user stories from a document read in overlapping chunks
+
+        The gate applies to the whole document, and user patterns share one
+        time budget across all chunks, as for match_document.
+
+        Args:
+            chunks: Iterable of Chunk (see chunked_reader.ChunkedFile)
+            label: File label used in timeout reports
+
+        Returns:
+            Tuple of (epics, stories)
+        """
+        self.stats.files_checked += 1
+        epics, stories = set(), set()
+        gate_passed = False
+        deadline = time.monotonic() + self.time_budget
+        timeouts_before = len(self.stats.timeouts)
+
+        for chunk in chunks:
+            found = self.find_literals(chunk.text)
+            gate_passed = gate_passed or self._passes_gate(chunk.text, found)
+            # Once the budget is spent, user patterns are skipped for the rest of the file
+            remaining = deadline - time.monotonic() if self.time_budget > 0 else 0
+            include_user = len(self.stats.timeouts) == timeouts_before and (self.time_budget <= 0 or remaining > 0)
+            chunk_epics, chunk_stories = self._extract_document(
+                chunk.text, found, label, budget=remaining, include_user=include_user
+            )
+            epics.update(chunk_epics)
+            stories.update(chunk_stories)
+
+        if not gate_passed:
+            return set(), set()
+        return epics, stories
+
+    def _test_hits(self, content: str, found: Set[str]) -> Tuple[Set[str], List[Tuple[int, int, str]]]:
+        """Framework markers and (start, end, artifact_id) epic/story references in test text"""
+        # Markers are case-sensitive in source code; confirm the exact spelling
+        frameworks = {
+            framework for marker, framework in self.FRAMEWORK_MARKERS.items()
+            if marker in found and marker in content
+        }
+
+        # "US3.2" counts for both the story and Epic 3
+        hits = []
+        for pattern in self.test_ref_patterns:
+            if not self._should_run(pattern, found):
+                continue
+            for match in pattern.regex.finditer(content):
+                epic_num = match.group(1)
+                hits.append((match.start(), match.end(), f"Epic {epic_num}"))
+                if pattern.kind == 'test_story_ref' and match.group(2):
+                    hits.append((match.start(), match.end(), f"US{epic_num}.{match.group(2)}"))
+        return frameworks, hits
+
+    @staticmethod
+    def _hit_lines(content: str, hits: List[Tuple[int, int, str]], first_line: int = 1) -> List[Tuple[str, int]]:
+        """Convert reference offsets into (artifact_id, line_number)"""
+        refs = []
+        line, last_offset = first_line, 0
+        for offset, _, artifact_id in sorted(hits):
+            line += content.count("\n", last_offset, offset)
+            last_offset = offset
+            refs.append((artifact_id, line))
+        return refs
+
+    def match_test(self, content: str, label: str = "") -> Tuple[Set[str], Set[str], List[Tuple[str, int]]]:
+        """
+        Detect frameworks and epic/story references in a test file
+
+        Args:
+            content: Test file text
+            label: File label used in timeout reports
+
+        Returns:
+            Tuple of (frameworks, covered_epics, refs) where refs lists
+            (artifact_id, line_number) for every epic/story reference
+        """
+        self.stats.files_checked += 1
+        frameworks, hits = self._test_hits(content, self.find_literals(content))
+        covered_epics = {artifact_id for _, _, artifact_id in hits if artifact_id.startswith("Epic ")}
+        return frameworks, covered_epics, self._hit_lines(content, hits)
+
+    def match_test_chunks(self, chunks: Iterable, label: str = "") -> Tuple[Set[str], Set[str], List[Tuple[str, int]]]:
+        """
+        Detect frameworks and epic/story references in a test file read in overlapping chunks
+
+        References lying entirely inside a chunk's overlap were already
+        reported by the previous chunk and are skipped.
+
+        Args:
+            chunks: Iterable of Chunk (see chunked_reader.ChunkedFile)
+            label: File label used in timeout reports
+
+        Returns:
+            Same as match_test
+        """
+        self.stats.files_checked += 1
+        frameworks, covered_epics, refs = set(), set(), []
+        for chunk in chunks:
+            chunk_frameworks, hits = self._test_hits(chunk.text, self.find_literals(chunk.text))
+            hits = [hit for hit in hits if hit[1] > chunk.overlap]
+            frameworks.update(chunk_frameworks)
+            covered_epics.update(artifact_id for _, _, artifact_id in hits if artifact_id.startswith("Epic "))
+            refs.extend(self._hit_lines(chunk.text, hits, chunk.start_line))
+        return frameworks, covered_epics, refs
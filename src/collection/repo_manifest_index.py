@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Repository manifest index
+One pruned walk per clone records where build manifests and coverage reports
+live, so framework detection and coverage runners look files up by name
+instead of each running their own rglob over the whole tree
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class RepoManifestIndex:
+    """Cached index of manifest and report files in a repository, by file name"""
+
+    # Never descended into
+    PRUNE_DIRS = {".git", "node_modules", ".gradle", ".m2", ".venv", "venv", ".tox",
+                  "__pycache__", ".idea", ".mypy_cache", ".pytest_cache"}
+
+    # Build output: searched for reports only, manifests inside are copies
+    OUTPUT_DIRS = {"build", "target", "dist", "out"}
+
+    MANIFEST_NAMES = {
+        "pom.xml", "mvnw", "build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts",
+        "gradlew", "package.json", "package-lock.json", "npm-shrinkwrap.json", "yarn.lock",
+        "pnpm-lock.yaml", "requirements.txt", "requirements-dev.txt", "setup.py", "setup.cfg",
+        "pyproject.toml", "go.mod",
+    }
+    REPORT_NAMES = {"jacoco.xml", "jacocoTestReport.xml", "coverage.xml", "cobertura.xml", "lcov.info"}
+
+    _instances: Dict[str, "RepoManifestIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, repo_path: Path):
+        """
+        Initialize index (the walk happens on first lookup)
+
+        Args:
+            repo_path: Path to repository
+        """
+        self.repo_path = Path(repo_path)
+        self._files: Optional[Dict[str, List[Path]]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_repo(cls, repo_path: Path) -> "RepoManifestIndex":
+        """Shared index for a repository (one per resolved path per process)"""
+        key = str(Path(repo_path).resolve())
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None:
+                index = cls._instances[key] = cls(repo_path)
+            return index
+
+    @classmethod
+    def invalidate(cls, repo_path: Path):
+        """
+        Discard the shared index of a repository
+
+        Call after anything that may add or remove files in the clone (builds,
+        installs, checkouts); the next lookup walks the tree again. Indexes
+        already handed out are refreshed as well.
+        """
+        key = str(Path(repo_path).resolve())
+        with cls._instances_lock:
+            index = cls._instances.pop(key, None)
+        if index is not None:
+            index.refresh()
+
+    def _walk(self) -> Dict[str, List[Path]]:
+        files: Dict[str, List[Path]] = {}
+        for root, dirs, names in os.walk(self.repo_path):
+            relative = Path(root).relative_to(self.repo_path)
+            in_output = any(part in self.OUTPUT_DIRS for part in relative.parts)
+            dirs[:] = sorted(d for d in dirs if d not in self.PRUNE_DIRS)
+            wanted = self.REPORT_NAMES if in_output else self.MANIFEST_NAMES | self.REPORT_NAMES
+            for name in names:
+                if name in wanted:
+                    files.setdefault(name, []).append(Path(root) / name)
+        for paths in files.values():
+            paths.sort()
+        return files
+
+    def find(self, name: str) -> List[Path]:
+        """
+        Files with a given name, sorted by path
+
+        Args:
+            name: One of MANIFEST_NAMES or REPORT_NAMES
+
+        Raises:
+            ValueError: If the name is not indexed
+        """
+        if name not in self.MANIFEST_NAMES and name not in self.REPORT_NAMES:
+            raise ValueError(f"{name} is not indexed by RepoManifestIndex")
+        with self._lock:
+            if self._files is None:
+                self._files = self._walk()
+            return list(self._files.get(name, []))
+
+    def refresh(self):
+        """Forget the walk, e.g. after a build has written new reports"""
+        with self._lock:
+            self._files = None
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for per-file scan results
+Entries are keyed by git blob SHA and scoped to a fingerprint of the pattern
+configuration, so they invalidate automatically when either changes
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ScanResultCache:
+    """Per-repository cache of extraction results keyed by blob SHA"""
+
+    VERSION = 1
+
+    def __init__(self, cache_file: Path, fingerprint: str):
+        """
+        Initialize cache
+
+        Args:
+            cache_file: JSON file holding the cache for one repository
+            fingerprint: Hash of the pattern configuration the results depend on
+        """
+        self.cache_file = Path(cache_file)
+        self.fingerprint = fingerprint
+        self._entries: Dict[str, Dict] = {}
+        self._used: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        """Load entries if the file matches the current version and fingerprint"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, json.JSONDecodeError):
+            return
+
+        if data.get("version") == self.VERSION and data.get("fingerprint") == self.fingerprint:
+            self._entries = data.get("entries", {})
+
+    def get(self, blob_sha: Optional[str], kind: str) -> Optional[Dict]:
+        """
+        Look up a cached result
+
+        Args:
+            blob_sha: Blob SHA of the file (None disables caching for the file)
+            kind: Result kind ('document', 'test', ...)
+
+        Returns:
+            Cached result or None
+        """
+        if not blob_sha:
+            return None
+
+        entry = self._entries.get(blob_sha, {})
+        if kind not in entry:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used.setdefault(blob_sha, {})[kind] = entry[kind]
+        return entry[kind]
+
+    def put(self, blob_sha: Optional[str], kind: str, result: Dict):
+        """Store a result for a blob"""
+        if not blob_sha:
+            return
+        self._entries.setdefault(blob_sha, {})[kind] = result
+        self._used.setdefault(blob_sha, {})[kind] = result
+
+    def save(self):
+        """Persist only the entries used by this scan, dropping blobs no longer present"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w') as f:
+            json.dump({
+                "version": self.VERSION,
+                "fingerprint": self.fingerprint,
+                "entries": self._used
+            }, f, separators=(",", ":"))
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._used)}
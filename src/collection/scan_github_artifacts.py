@@ -4,24 +4,84 @@ Scan GitHub repositories for epics, user stories, and test files
 Uses configuration-driven pattern detection
 """
 
-import json
-import re
+import hashlib
+import io
+import os
 import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 from collections import defaultdict
 from src.config.config_parser import RepoConfigParser
+from src.collection.pattern_matcher import ArtifactMatcher
+from src.collection.chunked_reader import CHUNK_SIZE, ChunkedFile, exceeds_limit, max_file_sizes, open_for_scan
+from src.collection.git_grep_scanner import GitGrepBackend
+from src.collection.scan_cache import ScanResultCache
+from src.collection.scan_store import ScanArtifactStore
+from src.collection.test_index import TestFileIndex
+from src.collection.test_case_inventory import TestCaseInventory
+from src.collection.traceability_index import TraceabilityIndex
+
+
+def _scan_repo_worker(options, repo_dir_name):
+    """
+    Process pool worker: scan one repository with a fresh scanner
+
+    Args:
+        options: GitHubScanner keyword arguments
+        repo_dir_name: Directory name under git_artifacts/
+
+    Returns:
+        Tuple of (repo_dir_name, per-repo result, captured console output)
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        scanner = GitHubScanner(**options)
+        result = scanner.scan_repo(scanner.git_artifacts / repo_dir_name / "clone")
+    return repo_dir_name, result, output.getvalue()
+
 
 class GitHubScanner:
-    def __init__(self, root_dir=".", config_file=None):
+    BACKENDS = ("filesystem", "git-grep")
+
+    def __init__(self, root_dir=".", config_file=None, pattern_time_budget=2.0, backend="filesystem", revision=None,
+                 workers=None, repo_workers=1, max_file_size=None, chunk_size=CHUNK_SIZE):
+        """
+        Args:
+            root_dir: Project root containing git_artifacts/
+            config_file: Path to repos.yaml (auto-detected if None)
+            pattern_time_budget: Seconds user-supplied regexes may spend per file
+            backend: 'filesystem' (walk the clone) or 'git-grep' (search the index/revision with git)
+            revision: Revision for the git-grep backend; None scans the index
+            workers: Process pool size for test case parsing (defaults to CPU count)
+            repo_workers: Repositories scanned concurrently by scan_all_repos (1 = serial)
+            max_file_size: Per-extension size limits overriding the defaults, e.g. {'.md': '512MB'}
+            chunk_size: Files larger than this are scanned in overlapping chunks
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown scan backend: {backend}. Must be one of {self.BACKENDS}")
+
         self.root_dir = Path(root_dir)
+        self.pattern_time_budget = pattern_time_budget
+        self.backend = backend
+        self.revision = revision
+        self.workers = workers
+        self.repo_workers = max(1, repo_workers or 1)
+        self.config_file = config_file
+        self.max_file_size = max_file_size or {}
+        self.chunk_size = chunk_size
         self.git_artifacts = self.root_dir / "git_artifacts"
+        self.cache_root = self.root_dir / ".cache"
         self.results = {
             "epics": defaultdict(list),
             "user_stories": defaultdict(list),
             "tests": defaultdict(lambda: {"files": [], "count": 0}),
-            "test_frameworks": defaultdict(set),
+            "test_cases": defaultdict(dict),
+            "test_frameworks": defaultdict(list),
             "epic_coverage": defaultdict(list)  # Track which epics are referenced in tests
         }
+        self.repo_results = {}  # repo -> per-repo result scanned in this run
 
         # Initialize config parser
         self.config_parser = RepoConfigParser(config_file=config_file)
@@ -54,159 +114,336 @@ class GitHubScanner:
             }
         }
 
-    def scan_for_epics_and_stories(self, repo_path):
-        """Search for files containing epic or user story references"""
-        repo_name = repo_path.parent.name if repo_path.name == "clone" else repo_path.name
-
-        epics_found = set()
-        stories_found = set()
+    def _get_size_limits(self, repo_name: str) -> dict:
+        """Per-extension size limits: defaults, then scanner overrides, then repos.yaml scan_limits"""
+        repo_config = self.config_parser.get_repo(repo_name) or {}
+        overrides = dict(self.max_file_size)
+        overrides.update((repo_config.get('scan_limits') or {}).get('max_file_size') or {})
+        return max_file_sizes(overrides)
+
+    # Directories never descended into while scanning
+    EXCLUDED_DIRS = {'.git', '__pycache__', 'node_modules', '.gradle'}
+
+    # Name fragments that mark a file as a candidate epic/story document
+    ARTIFACT_NAME_MARKERS = ('epic', 'story', 'US', 'requirement', 'specification')
+    ARTIFACT_DIR_NAMES = {'docs', 'issues'}
+
+    def _iter_repo_files(self, repo_path):
+        """
+        Walk the repository once, pruning excluded directories before descending
+
+        Yields:
+            Tuple of (file_path, relative_parts) in deterministic order
+        """
+        for dirpath, dirnames, filenames in os.walk(repo_path):
+            dirnames[:] = sorted(d for d in dirnames if d not in self.EXCLUDED_DIRS)
+            rel_dir = Path(dirpath).relative_to(repo_path).parts
+            for filename in sorted(filenames):
+                yield Path(dirpath) / filename, rel_dir + (filename,)
+
+    def _is_artifact_candidate(self, rel_parts):
+        """Classify a file as a potential epic/story document"""
+        name = rel_parts[-1]
+        if name.endswith('.md'):
+            return True
+        if any(marker in name for marker in self.ARTIFACT_NAME_MARKERS):
+            return True
+        return any(part in self.ARTIFACT_DIR_NAMES for part in rel_parts[:-1])
+
+    def _read_file(self, file_path, size_limits, oversized):
+        """
+        Read a file once as text, or as overlapping chunks when it is large
+
+        Returns:
+            Text, a ChunkedFile, or None if unreadable or over its size limit
+            (recorded in `oversized`)
+        """
+        if exceeds_limit(file_path, size_limits):
+            oversized.append(file_path)
+            return None
+        return open_for_scan(file_path, size_limits, self.chunk_size)
+
+    def _iter_filesystem_candidates(self, repo_path, test_index, size_limits, oversized):
+        """
+        Classify files from one pruned directory walk
+
+        Yields:
+            Tuple of (rel_parts, is_artifact, test_language, read_content)
+        """
+        for file_path, rel_parts in self._iter_repo_files(repo_path):
+            is_artifact = self._is_artifact_candidate(rel_parts)
+            test_language = test_index.classify(rel_parts)
+            if is_artifact or test_language:
+                yield rel_parts, is_artifact, test_language, (
+                    lambda file_path=file_path: self._read_file(file_path, size_limits, oversized)
+                )
+
+    def _git_backend(self, repo_path):
+        """Git backend for blob SHAs (and grep); None if the clone is not a usable git repository"""
+        revision = self.revision if self.backend == "git-grep" else None
+        try:
+            return GitGrepBackend(repo_path, revision=revision)
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    def _blob_shas(self, git_backend):
+        """
+        Map paths to blob SHAs for caching
+
+        In filesystem mode, files modified in the worktree are left out since
+        their content no longer matches the indexed blob.
+        """
+        if git_backend is None:
+            return {}
+        try:
+            blobs = git_backend.list_blobs()
+            if self.backend != "git-grep":
+                for path in git_backend.list_modified():
+                    blobs.pop(path, None)
+            return blobs
+        except (OSError, subprocess.SubprocessError):
+            return {}
 
-        # Get patterns from config or defaults
-        patterns_config = self._get_artifact_patterns(repo_name)
-
-        # Common patterns for epic/story files (fallback)
-        default_patterns = [
-            "**/*epic*",
-            "**/*story*",
-            "**/*user*story*",
-            "**/*US*",
-            "**/*requirement*",
-            "**/*specification*",
-            "**/docs/**",
-            "**/issues/**",
-            "**/*.md"
-        ]
-
-        for pattern in default_patterns:
-            for file_path in repo_path.glob(pattern):
-                if file_path.is_file() and not any(p in str(file_path) for p in ['.git', '__pycache__', 'node_modules', '.gradle']):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-
-                        # Look for epic/story keywords
-                        if re.search(r'epic|epic\s*story|us-\d+|user\s*story', content, re.IGNORECASE):
-                            rel_path = file_path.relative_to(repo_path)
-
-                            # Extract Epic patterns with full names using configured regex
-                            epic_patterns = patterns_config.get('epics', {}).get('local_patterns', [])
-                            for pattern_obj in epic_patterns:
-                                if isinstance(pattern_obj, dict):
-                                    regex = pattern_obj.get('regex')
-                                    if regex:
-                                        epic_matches = re.findall(regex, content)
-                                        for match in epic_matches:
-                                            if isinstance(match, tuple):
-                                                epic_num, epic_name = match
-                                                epics_found.add(f"Epic {epic_num}: {epic_name.strip()}")
-                                            else:
-                                                epics_found.add(f"Epic {match}")
-
-                            # Extract US patterns using configured regex
-                            story_patterns = patterns_config.get('stories', {}).get('local_patterns', [])
-                            for pattern_obj in story_patterns:
-                                if isinstance(pattern_obj, dict):
-                                    regex = pattern_obj.get('regex')
-                                    if regex:
-                                        us_matches = re.findall(regex, content)
-                                        for us_id in us_matches:
-                                            stories_found.add(f"US{us_id}")
-
-                            # Fallback to default patterns if config not found
-                            if not epic_patterns:
-                                epic_matches = re.findall(r'[Ee]pic\s+(\d+):\s*([^\n]+)', content)
-                                for epic_num, epic_name in epic_matches:
-                                    epics_found.add(f"Epic {epic_num}: {epic_name.strip()}")
-
-                            if not story_patterns:
-                                us_matches = re.findall(r'US\s*(\d+\.\d+)', content, re.IGNORECASE)
-                                for us_id in us_matches:
-                                    stories_found.add(f"US{us_id}")
-                    except:
-                        pass
-
-        if epics_found:
-            self.results["epics"][repo_name] = sorted(list(epics_found))
-        if stories_found:
-            self.results["user_stories"][repo_name] = sorted(list(stories_found))
-
-    def scan_for_tests(self, repo_path):
-        """Search for test files"""
+    def _iter_git_grep_candidates(self, matcher, git_backend, blob_shas, test_index):
+        """
+        Classify files from the git index/revision and let `git grep` pick the lines
+
+        Only lines containing a prefilter literal reach Python, so regexes that
+        span several lines are not supported by this backend. The grep itself
+        only runs once some file actually needs its content.
+
+        Yields:
+            Tuple of (rel_parts, is_artifact, test_language, read_content)
+        """
+        grep_result = {}
+
+        def matched_lines(path):
+            if "lines" not in grep_result:
+                extra = ["."] if matcher.has_unfiltered_patterns else []
+                grep_result["lines"] = git_backend.grep(matcher.literals, extra_patterns=extra)
+            # Rebuild a sparse buffer with matched lines at their original line numbers
+            lines, previous = [], 0
+            for line_number, text in grep_result["lines"].get(path, []):
+                lines.append("\n" * (line_number - previous - 1) + text)
+                previous = line_number
+            return "\n".join(lines)
+
+        for path in blob_shas:
+            rel_parts = tuple(path.split("/"))
+            if any(part in self.EXCLUDED_DIRS for part in rel_parts[:-1]):
+                continue
+            is_artifact = self._is_artifact_candidate(rel_parts)
+            test_language = test_index.classify(rel_parts)
+            if is_artifact or test_language:
+                yield rel_parts, is_artifact, test_language, lambda path=path: matched_lines(path)
+
+    def scan_repo(self, repo_path):
+        """
+        Scan a repository for epics, user stories and tests in a single pass
+
+        Each file is classified once against all patterns and read at most once;
+        all extractors then run on that one buffer. Per-file results are cached
+        by blob SHA, so unchanged files are not read at all on later scans.
+
+        Returns:
+            Per-repository result (also merged into self.results)
+        """
         repo_name = repo_path.parent.name if repo_path.name == "clone" else repo_path.name
 
-        # Test file patterns by language
-        test_patterns = {
-            "java": ["**/*Test.java", "**/*Tests.java", "**/test/**/*.java"],
-            "javascript": ["**/*.test.js", "**/*.spec.js", "**/test/**/*.js"],
-            "python": ["**/test_*.py", "**/*_test.py", "**/tests/**/*.py"],
-            "go": ["**/*_test.go"],
-        }
-
-        # Generic patterns
-        generic_patterns = ["**/test/**", "**/tests/**", "**/__tests__/**"]
-
-        all_patterns = list(test_patterns.values())[0] + generic_patterns
+        # Compile configured and default patterns once for this repository
+        matcher = ArtifactMatcher(self._get_artifact_patterns(repo_name), time_budget=self.pattern_time_budget)
+        for error in matcher.errors:
+            print(f"  ⚠ {error}")
+
+        git_backend = self._git_backend(repo_path)
+        blob_shas = self._blob_shas(git_backend)
+        # The git-grep backend only sees matched lines, so each backend keeps its own cache
+        # file; switching backends then leaves the other backend's entries intact. Caches
+        # live outside git_artifacts, which is published with the site. Size and chunk
+        # limits decide which files are skipped or read in chunks, so they scope the cache too
+        for legacy in (self.git_artifacts / repo_name).glob("scan_cache*.json"):
+            legacy.unlink()
+        size_limits = self._get_size_limits(repo_name)
+        limits = hashlib.sha1(repr((sorted(size_limits.items()), self.chunk_size)).encode()).hexdigest()
+        cache = ScanResultCache(
+            self.cache_root / "scan" / repo_name / f"{self.backend}.json",
+            f"{matcher.fingerprint()}:cases-v{TestCaseInventory.VERSION}:limits-{limits}"
+        )
+
+        test_index = TestFileIndex()
+        oversized = []  # files skipped for exceeding their size limit
+
+        if self.backend == "git-grep":
+            if git_backend is None:
+                raise RuntimeError(f"git-grep backend requires a git repository: {repo_path}")
+            candidates = self._iter_git_grep_candidates(matcher, git_backend, blob_shas, test_index)
+        else:
+            candidates = self._iter_filesystem_candidates(repo_path, test_index, size_limits, oversized)
 
-        test_files = []
-        test_count = 0
+        epics_found = set()
+        stories_found = set()
         frameworks = set()
         covered_epics = set()  # Track which epic numbers are mentioned in tests
-
-        for pattern in all_patterns:
-            for test_file in repo_path.glob(pattern):
-                if test_file.is_file() and test_file.name not in [f.name for f in test_files]:
-                    test_files.append(test_file)
-                    test_count += 1
-
-                    # Detect test framework and extract epic references
-                    try:
-                        with open(test_file, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            if 'import unittest' in content or 'from unittest' in content:
-                                frameworks.add('unittest')
-                            if 'import pytest' in content or 'from pytest' in content:
-                                frameworks.add('pytest')
-                            if 'import org.junit' in content:
-                                frameworks.add('JUnit')
-                            if 'describe(' in content or 'it(' in content:
-                                frameworks.add('Jest/Mocha')
-
-                            # Extract epic numbers referenced in test files (e.g., "Epic 1", "US1.1")
-                            epic_refs = re.findall(r'[Ee]pic\s+(\d+)', content)
-                            for epic_num in epic_refs:
-                                covered_epics.add(f"Epic {epic_num}")
-
-                            us_refs = re.findall(r'US\s*(\d+)\.', content, re.IGNORECASE)
-                            for epic_num in us_refs:
-                                covered_epics.add(f"Epic {epic_num}")
-                    except:
-                        pass
-
-        self.results["tests"][repo_name] = {
-            "files": [str(f.relative_to(repo_path)) for f in test_files[:10]],
-            "count": test_count
+        traceability = TraceabilityIndex()  # epic/story id -> test files and lines
+
+        for rel_parts, is_artifact, test_language, read_content in candidates:
+            label = "/".join(rel_parts)
+            # Deduplicate by full path: same-named tests in different directories all count
+            is_test = bool(test_language) and test_index.add(label, test_language)
+            if not (is_artifact or is_test):
+                continue
+
+            sha = blob_shas.get(label)
+            document = cache.get(sha, "document") if is_artifact else None
+            test = cache.get(sha, "test") if is_test else None
+
+            if (is_artifact and document is None) or (is_test and test is None):
+                content = read_content()
+                if content is None:
+                    continue
+                timeouts_before = len(matcher.stats.timeouts)
+
+                chunked = isinstance(content, ChunkedFile)
+                if is_artifact and document is None:
+                    if chunked:
+                        epics, stories = matcher.match_document_chunks(content, label)
+                    else:
+                        epics, stories = matcher.match_document(content, label) if content else (set(), set())
+                    document = {"epics": sorted(epics), "stories": sorted(stories)}
+                if is_test and test is None:
+                    if chunked:
+                        test_frameworks, test_epics, refs = matcher.match_test_chunks(content, label)
+                    else:
+                        test_frameworks, test_epics, refs = matcher.match_test(content, label) if content else (set(), set(), [])
+                    test = {
+                        "frameworks": sorted(test_frameworks),
+                        "epic_refs": sorted(test_epics),
+                        "refs": [list(ref) for ref in refs]
+                    }
+
+                # Results cut short by the time budget are not cached
+                if len(matcher.stats.timeouts) == timeouts_before:
+                    if is_artifact:
+                        cache.put(sha, "document", document)
+                    if is_test:
+                        cache.put(sha, "test", test)
+
+            if is_artifact:
+                epics_found.update(document["epics"])
+                stories_found.update(document["stories"])
+            if is_test:
+                frameworks.update(test["frameworks"])
+                covered_epics.update(test["epic_refs"])
+                traceability.add_refs(label, test["refs"])
+
+        test_cases = TestCaseInventory(workers=self.workers, size_limits=size_limits, chunk_size=self.chunk_size).build(
+            repo_path, test_index, blob_shas, cache=cache,
+            from_worktree=self.backend != "git-grep"
+        )
+
+        cache.save()
+        traceability.save(self.git_artifacts / repo_name / "traceability.json")
+
+        for timeout in matcher.stats.timeouts:
+            print(f"  ⚠ {timeout}")
+        if oversized:
+            print(f"  ⚠ Skipped {len(oversized)} files over their size limit")
+
+        cache_stats = cache.stats()
+        print(f"  → Scan cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+        result = {
+            "repo": repo_name,
+            "epics": sorted(epics_found),
+            "user_stories": sorted(stories_found),
+            "tests": {
+                "files": test_index.sample(10),
+                "count": len(test_index),
+                "by_language": test_index.by_language()
+            },
+            "test_cases": test_cases,
+            "test_frameworks": sorted(frameworks),
+            "epic_coverage": sorted(covered_epics)
         }
-        self.results["test_frameworks"][repo_name] = list(frameworks)
-        self.results["epic_coverage"][repo_name] = sorted(list(covered_epics))
+        self._merge_result(result)
+        return result
+
+    def _merge_result(self, result):
+        """Merge one per-repository result into self.results"""
+        repo_name = result["repo"]
+        self.repo_results[repo_name] = result
+        if result["epics"]:
+            self.results["epics"][repo_name] = result["epics"]
+        if result["user_stories"]:
+            self.results["user_stories"][repo_name] = result["user_stories"]
+
+        self.results["tests"][repo_name] = result["tests"]
+        self.results["test_cases"][repo_name] = result["test_cases"]
+        self.results["test_frameworks"][repo_name] = result["test_frameworks"]
+        self.results["epic_coverage"][repo_name] = result["epic_coverage"]
 
     def save_results(self):
-        """Save scan results"""
-        output = {
+        """
+        Save scan results as per-repo shards (git_artifacts/<repo>/scan.json)
+
+        Only repositories scanned in this run are rewritten; the global index
+        keeps the entries of all other repositories.
+        """
+        store = ScanArtifactStore(self.git_artifacts)
+        migrated = store.migrate_legacy(skip=self.repo_results)
+        if migrated:
+            print(f"→ Migrated {migrated} repositories from {store.LEGACY_NAME} to per-repo shards")
+        for repo_name in sorted(self.repo_results):
+            store.save_repo(self.repo_results[repo_name])
+        store.save_index()
+
+        return {
             "epics": dict(self.results["epics"]),
             "user_stories": dict(self.results["user_stories"]),
             "tests": dict(self.results["tests"]),
+            "test_cases": dict(self.results["test_cases"]),
             "test_frameworks": dict(self.results["test_frameworks"]),
             "epic_coverage": dict(self.results["epic_coverage"])  # Epics covered by tests
         }
-        
-        artifacts_file = self.git_artifacts / "github_scan_artifacts.json"
-        with open(artifacts_file, 'w') as f:
-            json.dump(output, f, indent=2, default=str)
-        
-        return output
-
-    def scan_all_repos(self):
-        """Scan all cloned repositories"""
+
+    def _scan_parallel(self, repo_dirs):
+        """
+        Scan repositories in a process pool
+
+        Each worker returns its per-repository result; results and console
+        output are merged in repository order, so the output matches a serial scan.
+        """
+        options = {
+            "root_dir": str(self.root_dir),
+            "config_file": self.config_file,
+            "pattern_time_budget": self.pattern_time_budget,
+            "backend": self.backend,
+            "revision": self.revision,
+            # Test case parsing stays in-process; the pool already uses the cores
+            "workers": 1,
+            "max_file_size": self.max_file_size,
+            "chunk_size": self.chunk_size
+        }
+        workers = min(self.repo_workers, len(repo_dirs))
+        print(f"→ Scanning {len(repo_dirs)} repositories with {workers} workers ({self.backend} backend)\n")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_scan_repo_worker, options, repo_dir.name) for repo_dir in repo_dirs]
+            for future in futures:
+                repo_dir_name, result, output = future.result()
+                print(f"Scanning {repo_dir_name}...")
+                print(f"  → Using artifact patterns from configuration ({self.backend} backend)")
+                print(output, end="")
+                self._merge_result(result)
+                print(f"  ✓ Scan complete for {repo_dir_name}\n")
+
+    def scan_all_repos(self, repo_names=None):
+        """
+        Scan cloned repositories
+
+        Args:
+            repo_names: Repositories to (re)scan; None scans all of them
+        """
         print("\n" + "="*70)
         print("GITHUB ARTIFACT SCANNER - Epics, User Stories, and Tests")
         print("="*70 + "\n")
@@ -215,16 +452,23 @@ class GitHubScanner:
             print("No git artifacts found. Run collection layer first.")
             return {}
 
+        repo_dirs = []
         for repo_dir in sorted(self.git_artifacts.iterdir()):
             if repo_dir.is_dir() and not repo_dir.name.startswith('.'):
-                clone_dir = repo_dir / "clone"
-                if not clone_dir.exists():
+                if repo_names and repo_dir.name not in repo_names:
+                    continue
+                if not (repo_dir / "clone").exists():
                     print(f"Skipping {repo_dir.name} (no clone directory)")
                     continue
+                repo_dirs.append(repo_dir)
+
+        if self.repo_workers > 1 and len(repo_dirs) > 1:
+            self._scan_parallel(repo_dirs)
+        else:
+            for repo_dir in repo_dirs:
                 print(f"Scanning {repo_dir.name}...")
-                print(f"  → Using artifact patterns from configuration")
-                self.scan_for_epics_and_stories(clone_dir)
-                self.scan_for_tests(clone_dir)
+                print(f"  → Using artifact patterns from configuration ({self.backend} backend)")
+                self.scan_repo(repo_dir / "clone")
                 print(f"  ✓ Scan complete for {repo_dir.name}\n")
 
         results = self.save_results()
@@ -235,10 +479,15 @@ class GitHubScanner:
         print(f"Epics found: {sum(len(v) for v in results['epics'].values())}")
         print(f"User stories found: {sum(len(v) for v in results['user_stories'].values())}")
         print(f"Total test files: {sum(v['count'] for v in results['tests'].values())}")
+        print(f"Total test cases: {sum(v.get('total', 0) for v in results['test_cases'].values())}")
         print("="*70 + "\n")
 
         return results
 
 if __name__ == "__main__":
-    scanner = GitHubScanner()
-    results = scanner.scan_all_repos()
+    scanner = GitHubScanner(
+        backend=os.getenv("DORA_SCAN_BACKEND", "filesystem"),
+        repo_workers=int(os.getenv("DORA_SCAN_REPO_WORKERS", "1"))
+    )
+    # Optional repository names rescan only those repositories
+    results = scanner.scan_all_repos(repo_names=sys.argv[1:] or None)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Per-repository scan artifact store
+Each repository's scan result lives in git_artifacts/<repo>/scan.json, with a
+small global index of per-repo totals, so readers load only the repos they need
+and rescanning one repository rewrites only its own shard
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# Keys of the legacy monolithic github_scan_artifacts.json, each mapping repo -> value
+SCAN_SECTIONS = ("epics", "user_stories", "tests", "test_cases", "test_frameworks", "epic_coverage")
+
+
+class ScanArtifactStore:
+    """Reads and writes sharded scan results under git_artifacts/"""
+
+    VERSION = 1
+    SHARD_NAME = "scan.json"
+    INDEX_NAME = "scan_index.json"
+    LEGACY_NAME = "github_scan_artifacts.json"
+
+    def __init__(self, git_artifacts: Path):
+        """
+        Initialize store
+
+        Args:
+            git_artifacts: Path to the git_artifacts directory
+        """
+        self.git_artifacts = Path(git_artifacts)
+        self.index_file = self.git_artifacts / self.INDEX_NAME
+        self.legacy_file = self.git_artifacts / self.LEGACY_NAME
+        self._index: Optional[Dict] = None
+        self._legacy: Optional[Dict] = None
+
+    def _load_json(self, path: Path) -> Optional[Dict]:
+        """Load a JSON file; None if missing or unreadable"""
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (IOError, OSError, json.JSONDecodeError):
+            return None
+
+    def _write_json(self, path: Path, payload: Dict):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2, default=str)
+
+    def shard_path(self, repo_name: str) -> Path:
+        """Path of a repository's scan shard"""
+        return self.git_artifacts / repo_name / self.SHARD_NAME
+
+    def has_index(self) -> bool:
+        """True once scans have been written in sharded form"""
+        return self.index_file.exists()
+
+    def load_index(self) -> Dict:
+        """
+        Load the global index
+
+        Returns:
+            Dictionary with 'version' and 'repos' (repo -> summary); empty when missing
+        """
+        if self._index is None:
+            data = self._load_json(self.index_file) or {}
+            if data.get("version") != self.VERSION:
+                data = {}
+            self._index = {"version": self.VERSION, "repos": data.get("repos", {})}
+        return self._index
+
+    def _load_legacy(self) -> Dict:
+        """Load the monolithic file written by older scanner versions"""
+        if self._legacy is None:
+            self._legacy = self._load_json(self.legacy_file) or {}
+        return self._legacy
+
+    def repos(self) -> List[str]:
+        """Repositories with scan results, sorted"""
+        if self.has_index():
+            return sorted(self.load_index()["repos"])
+        legacy = self._load_legacy()
+        return sorted({repo for section in SCAN_SECTIONS for repo in legacy.get(section, {})})
+
+    def load_repo(self, repo_name: str) -> Optional[Dict]:
+        """
+        Load one repository's scan result
+
+        Falls back to the legacy monolithic file when no sharded scan exists yet.
+
+        Returns:
+            Per-repo result (keys of SCAN_SECTIONS plus 'repo'), or None if the repo was not scanned
+        """
+        shard = self._load_json(self.shard_path(repo_name))
+        if shard is not None:
+            return shard
+        if self.has_index():
+            return None
+
+        legacy = self._load_legacy()
+        if not any(repo_name in legacy.get(section, {}) for section in SCAN_SECTIONS):
+            return None
+        result = {"repo": repo_name}
+        for section in SCAN_SECTIONS:
+            default = {} if section in ("tests", "test_cases") else []
+            result[section] = legacy.get(section, {}).get(repo_name, default)
+        return result
+
+    def source_file(self, repo_name: str) -> Optional[Path]:
+        """File a repository's scan result is read from (for metric inputs)"""
+        if self.shard_path(repo_name).exists():
+            return self.shard_path(repo_name)
+        if not self.has_index() and self.legacy_file.exists():
+            return self.legacy_file
+        return None
+
+    def load_all(self, repo_names: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Assemble scan results in the legacy github_scan_artifacts.json shape
+
+        Args:
+            repo_names: Repositories to include (defaults to all scanned repos)
+        """
+        output = {section: {} for section in SCAN_SECTIONS}
+        for repo_name in sorted(repo_names if repo_names is not None else self.repos()):
+            result = self.load_repo(repo_name)
+            if result is None:
+                continue
+            for section in SCAN_SECTIONS:
+                value = result.get(section)
+                # Repos without epics/stories are left out, as the scanner always did
+                if section in ("epics", "user_stories") and not value:
+                    continue
+                output[section][repo_name] = value
+        return output
+
+    def save_repo(self, result: Dict):
+        """
+        Write one repository's shard and update its index entry
+
+        Args:
+            result: Per-repo result as returned by GitHubScanner.scan_repo
+        """
+        repo_name = result["repo"]
+        scanned_at = datetime.utcnow().isoformat() + "Z"
+        self._write_json(self.shard_path(repo_name), {**result, "scanned_at": scanned_at})
+
+        self.load_index()["repos"][repo_name] = {
+            "shard": str(self.shard_path(repo_name).relative_to(self.git_artifacts)),
+            "scanned_at": scanned_at,
+            "test_files": result.get("tests", {}).get("count", 0),
+            "test_cases": result.get("test_cases", {}).get("total", 0),
+            "epics": len(result.get("epics", [])),
+            "user_stories": len(result.get("user_stories", []))
+        }
+
+    def migrate_legacy(self, skip: Iterable[str] = ()) -> int:
+        """
+        Split the legacy monolithic file into shards (only before the first sharded save)
+
+        Args:
+            skip: Repositories about to be written anyway
+
+        Returns:
+            Number of repositories migrated
+        """
+        if self.has_index():
+            return 0
+        migrated = 0
+        for repo_name in self.repos():
+            if repo_name in skip:
+                continue
+            if self.shard_path(repo_name).parent.is_dir() and not self.shard_path(repo_name).exists():
+                self.save_repo(self.load_repo(repo_name))
+                migrated += 1
+        return migrated
+
+    def save_index(self):
+        """Write the global index, dropping repositories whose shard is gone"""
+        index = self.load_index()
+        index["repos"] = {
+            repo: entry for repo, entry in sorted(index["repos"].items())
+            if self.shard_path(repo).exists()
+        }
+        self._write_json(self.index_file, index)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Per-test-case inventory
+Counts test functions, methods and cases per file with lightweight parsers
+(Python via ast, JUnit via annotations, Jest/Mocha via it(/test( tokens, Go via
+func Test...) in a process pool, reusing results cached by blob SHA
+"""
+
+import ast
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.collection.chunked_reader import CHUNK_SIZE, ChunkedFile, exceeds_limit
+
+
+JUNIT_ANNOTATION = re.compile(r'@(?:Test|ParameterizedTest|RepeatedTest|TestFactory|TestTemplate)\b(?!\w)')
+JS_TEST_CALL = re.compile(r'(?<![\w.$])(?:it|test)(?:\.(?:only|skip|todo|concurrent|each\s*(?:`[^`]*`|\([^)]*\))))*\s*\(')
+GO_TEST_FUNC = re.compile(r'^func\s+Test\w*\s*\(\s*\w+\s+\*testing\.T\s*\)', re.MULTILINE)
+PY_TEST_DEF = re.compile(r'^\s*(?:async\s+)?def\s+test\w*\s*\(', re.MULTILINE)
+
+JVM_LANGUAGES = {"java", "kotlin", "groovy", "scala"}
+JS_LANGUAGES = {"javascript", "typescript"}
+
+# Below this many uncached files, parsing runs in-process (pool start-up costs more)
+POOL_MIN_FILES = 32
+
+_worker_readers: Dict[str, object] = {}
+
+
+def _count_python(content: str) -> Tuple[str, int]:
+    """Count pytest/unittest test functions and methods"""
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return "pytest", len(PY_TEST_DEF.findall(content))
+
+    framework = "pytest"
+    count = 0
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test"):
+            count += 1
+        elif isinstance(node, ast.ClassDef):
+            base_names = {getattr(base, "attr", getattr(base, "id", "")) for base in node.bases}
+            is_unittest = any(name.endswith("TestCase") for name in base_names)
+            if not (is_unittest or node.name.startswith("Test")):
+                continue
+            if is_unittest:
+                framework = "unittest"
+            count += sum(
+                1 for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith("test")
+            )
+    return framework, count
+
+
+def _jvm_framework(content: str) -> str:
+    """Name the JVM test framework from imports"""
+    if "org.junit.jupiter" in content:
+        return "JUnit5"
+    if "org.testng" in content:
+        return "TestNG"
+    if "org.junit" in content:
+        return "JUnit4"
+    return "JUnit"
+
+
+def _js_framework(content: str) -> str:
+    """Name the JS/TS test framework from imports"""
+    if "vitest" in content:
+        return "Vitest"
+    return "Jest/Mocha"
+
+
+def count_test_cases(content: str, language: str) -> Dict:
+    """
+    Count test cases in a single file
+
+    Args:
+        content: File text
+        language: Language reported by TestFileIndex
+
+    Returns:
+        Dict with 'framework' (or None) and 'cases'
+    """
+    if language == "python":
+        framework, cases = _count_python(content)
+    elif language in JVM_LANGUAGES:
+        framework, cases = _jvm_framework(content), len(JUNIT_ANNOTATION.findall(content))
+    elif language in JS_LANGUAGES:
+        framework, cases = _js_framework(content), len(JS_TEST_CALL.findall(content))
+    elif language == "go":
+        framework, cases = "Go testing", len(GO_TEST_FUNC.findall(content))
+    else:
+        framework, cases = None, 0
+    return {"framework": framework, "cases": cases}
+
+
+# Per-language patterns used when a file is too large to parse whole
+CHUNK_PATTERNS = {"python": PY_TEST_DEF, "go": GO_TEST_FUNC}
+CHUNK_PATTERNS.update({language: JUNIT_ANNOTATION for language in JVM_LANGUAGES})
+CHUNK_PATTERNS.update({language: JS_TEST_CALL for language in JS_LANGUAGES})
+
+
+def count_test_cases_chunks(chunks: Iterable, language: str) -> Dict:
+    """
+    Count test cases in a file read in overlapping chunks
+
+    Python falls back to matching test function definitions, since the file
+    cannot be parsed whole. The framework is named from the first chunk,
+    where imports live.
+
+    Args:
+        chunks: Iterable of Chunk (see chunked_reader.ChunkedFile)
+        language: Language reported by TestFileIndex
+
+    Returns:
+        Dict with 'framework' (or None) and 'cases'
+    """
+    pattern = CHUNK_PATTERNS.get(language)
+    framework, cases = None, 0
+    for chunk in chunks:
+        if framework is None:
+            framework = count_test_cases(chunk.text[:CHUNK_SIZE // 64], language)["framework"]
+        if pattern is not None:
+            # Matches lying entirely inside the overlap were counted with the previous chunk
+            cases += sum(1 for match in pattern.finditer(chunk.text) if match.end() > chunk.overlap)
+    return {"framework": framework, "cases": cases}
+
+
+def _read_source(task: Tuple[str, str, Optional[str], Optional[str]]) -> Optional[str]:
+    """Read file content from disk, or from the object store when only a blob SHA is available"""
+    _, language, file_path, repo_and_sha = task
+    if file_path and os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    if repo_and_sha:
+        from src.collection.collect_history import GitObjectReader
+        repo_path, sha = repo_and_sha.split("\0", 1)
+        reader = _worker_readers.get(repo_path)
+        if reader is None:
+            reader = _worker_readers[repo_path] = GitObjectReader(Path(repo_path))
+        _, raw = reader.read(sha)
+        return raw.decode("utf-8", errors="ignore")
+    return None
+
+
+def _inventory_task(task: Tuple[str, str, Optional[str], Optional[str]],
+                    chunk_size: int = CHUNK_SIZE) -> Tuple[str, Optional[Dict]]:
+    """Pool worker: read and count one file; worktree files above chunk_size are read in chunks"""
+    label, language, file_path = task[0], task[1], task[2]
+    try:
+        if file_path and os.path.exists(file_path) and os.path.getsize(file_path) > chunk_size:
+            return label, count_test_cases_chunks(ChunkedFile(file_path, chunk_size), language)
+        content = _read_source(task)
+    except (IOError, OSError, KeyError):
+        return label, None
+    if content is None:
+        return label, None
+    return label, count_test_cases(content, language)
+
+
+class TestCaseInventory:
+    """Builds per-repository test case totals from a TestFileIndex"""
+
+    __test__ = False  # not a pytest test class despite the name
+
+    VERSION = 1
+
+    def __init__(self, workers: Optional[int] = None, size_limits: Optional[Dict[str, int]] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        """
+        Args:
+            workers: Process pool size (defaults to CPU count)
+            size_limits: Per-extension size limits (see chunked_reader.max_file_sizes);
+                larger worktree files are skipped
+            chunk_size: Worktree files larger than this are counted in overlapping chunks
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.size_limits = size_limits
+        self.chunk_size = chunk_size
+
+    def build(self, repo_path: Path, test_index, blob_shas: Dict[str, str], cache=None, from_worktree: bool = True) -> Dict:
+        """
+        Count test cases for every indexed test file
+
+        Args:
+            repo_path: Repository path
+            test_index: TestFileIndex with the repository's test files
+            blob_shas: Mapping of path -> blob SHA (used for caching and object-store reads)
+            cache: Optional ScanResultCache
+            from_worktree: Read files from disk (False reads blobs through git)
+
+        Returns:
+            Dictionary with totals per repo, framework and language
+        """
+        per_file: Dict[str, Dict] = {}
+        tasks: List[Tuple[str, str, Optional[str], Optional[str]]] = []
+        cache_hits = 0
+
+        for path in test_index.paths():
+            sha = blob_shas.get(path)
+            cached = cache.get(sha, "cases") if cache is not None else None
+            if cached is not None:
+                per_file[path] = cached
+                cache_hits += 1
+                continue
+            file_path = str(Path(repo_path) / path) if from_worktree else None
+            if file_path and self.size_limits and exceeds_limit(file_path, self.size_limits):
+                continue
+            repo_and_sha = f"{repo_path}\0{sha}" if sha else None
+            tasks.append((path, test_index.language_of(path), file_path, repo_and_sha))
+
+        count = partial(_inventory_task, chunk_size=self.chunk_size)
+        if len(tasks) >= POOL_MIN_FILES and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(count, tasks, chunksize=64))
+        else:
+            results = [count(task) for task in tasks]
+            for reader in _worker_readers.values():
+                reader.close()
+            _worker_readers.clear()
+
+        for label, result in results:
+            if result is None:
+                continue
+            per_file[label] = result
+            if cache is not None:
+                cache.put(blob_shas.get(label), "cases", result)
+
+        by_framework: Dict[str, int] = {}
+        by_language: Dict[str, int] = {}
+        total = 0
+        for path, result in per_file.items():
+            cases = result["cases"]
+            total += cases
+            framework = result["framework"] or "unknown"
+            by_framework[framework] = by_framework.get(framework, 0) + cases
+            language = test_index.language_of(path)
+            by_language[language] = by_language.get(language, 0) + cases
+
+        return {
+            "total": total,
+            "by_framework": dict(sorted(by_framework.items())),
+            "by_language": dict(sorted(by_language.items())),
+            "files_parsed": len(tasks),
+            "files_cached": cache_hits
+        }
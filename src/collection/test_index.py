@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Multi-language test file discovery index
+Classifies test files for every supported language in one pass and
+deduplicates them by repository-relative path
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# File name suffixes that mark a test file, by language
+TEST_FILE_SUFFIXES = {
+    "java": ("Test.java", "Tests.java", "IT.java", "TestCase.java"),
+    "kotlin": ("Test.kt", "Tests.kt", "Spec.kt"),
+    "scala": ("Test.scala", "Spec.scala", "Suite.scala"),
+    "groovy": ("Test.groovy", "Spec.groovy"),
+    "javascript": (".test.js", ".spec.js", ".test.jsx", ".spec.jsx", ".test.mjs", ".spec.mjs", ".test.cjs", ".spec.cjs"),
+    "typescript": (".test.ts", ".spec.ts", ".test.tsx", ".spec.tsx"),
+    "python": ("_test.py",),
+    "go": ("_test.go",),
+    "ruby": ("_spec.rb", "_test.rb"),
+    "csharp": ("Test.cs", "Tests.cs"),
+    "rust": ("_test.rs",),
+    "swift": ("Tests.swift", "Test.swift"),
+}
+
+# File name prefixes that mark a test file, by language (prefix, required extension)
+TEST_FILE_PREFIXES = {
+    "python": (("test_", ".py"),),
+}
+
+# Source extensions, used for files inside test directories
+SOURCE_EXTENSIONS = {
+    ".java": "java", ".kt": "kotlin", ".kts": "kotlin", ".scala": "scala", ".groovy": "groovy",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "typescript",
+    ".py": "python", ".go": "go", ".rb": "ruby", ".cs": "csharp", ".rs": "rust", ".swift": "swift",
+}
+
+# Directory names that mark every source file beneath them as a test file
+TEST_DIR_NAMES = {"test", "tests", "__tests__"}
+
+
+class TestFileIndex:
+    """Index of test files keyed by path, classified by language"""
+
+    __test__ = False  # not a pytest test class despite the name
+
+    def __init__(self, suffixes: Optional[Dict[str, Tuple[str, ...]]] = None,
+                 prefixes: Optional[Dict[str, Tuple[Tuple[str, str], ...]]] = None):
+        """
+        Initialize index
+
+        Args:
+            suffixes: Override of TEST_FILE_SUFFIXES
+            prefixes: Override of TEST_FILE_PREFIXES
+        """
+        suffixes = suffixes or TEST_FILE_SUFFIXES
+        prefixes = prefixes or TEST_FILE_PREFIXES
+
+        # Longest suffix first so '.spec.tsx' wins over shorter overlaps
+        self._suffixes: List[Tuple[str, str]] = sorted(
+            ((suffix, language) for language, items in suffixes.items() for suffix in items),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self._any_suffix = tuple(suffix for suffix, _ in self._suffixes)
+        self._prefixes: List[Tuple[str, str, str]] = [
+            (prefix, extension, language)
+            for language, items in prefixes.items()
+            for prefix, extension in items
+        ]
+        self._files: Dict[str, str] = {}
+
+    def classify_name(self, name: str, inside_test_dir: bool = False) -> Optional[str]:
+        """
+        Classify a file by name and whether one of its parents is a test directory
+
+        Args:
+            name: File name
+            inside_test_dir: True if any parent directory is a test directory
+
+        Returns:
+            Language of the test file, or None if it is not a test file
+        """
+        if name.endswith(self._any_suffix):
+            for suffix, language in self._suffixes:
+                if name.endswith(suffix):
+                    return language
+
+        for prefix, extension, language in self._prefixes:
+            if name.startswith(prefix) and name.endswith(extension):
+                return language
+
+        if inside_test_dir:
+            dot = name.rfind(".")
+            if dot > 0:
+                return SOURCE_EXTENSIONS.get(name[dot:].lower())
+
+        return None
+
+    def classify(self, rel_parts: Tuple[str, ...]) -> Optional[str]:
+        """
+        Classify a repository-relative path
+
+        Args:
+            rel_parts: Path components, file name last
+
+        Returns:
+            Language of the test file, or None
+        """
+        inside_test_dir = any(part in TEST_DIR_NAMES for part in rel_parts[:-1])
+        return self.classify_name(rel_parts[-1], inside_test_dir)
+
+    def add(self, path: str, language: str) -> bool:
+        """
+        Record a test file
+
+        Returns:
+            True if the path was new
+        """
+        if path in self._files:
+            return False
+        self._files[path] = language
+        return True
+
+    def add_paths(self, paths: Iterable[str]) -> int:
+        """Classify and record many POSIX paths; returns the number of test files added"""
+        added = 0
+        for path in paths:
+            language = self.classify(tuple(path.split("/")))
+            if language and self.add(path, language):
+                added += 1
+        return added
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def paths(self) -> List[str]:
+        """Test file paths in discovery order"""
+        return list(self._files)
+
+    def language_of(self, path: str) -> Optional[str]:
+        """Language recorded for a path"""
+        return self._files.get(path)
+
+    def by_language(self) -> Dict[str, int]:
+        """Test file counts per language, sorted by language"""
+        counts: Dict[str, int] = {}
+        for language in self._files.values():
+            counts[language] = counts.get(language, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def sample(self, limit: int = 10) -> List[str]:
+        """First `limit` test files in discovery order"""
+        samples = []
+        for path in self._files:
+            if len(samples) >= limit:
+                break
+            samples.append(path)
+        return samples
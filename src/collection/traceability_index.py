@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Inverted epic/story -> test traceability index
+Maps every epic or story id to the test files and lines that reference it,
+stored compactly per repository
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def artifact_key(artifact: str) -> str:
+    """
+    Normalize an epic/story name to its index key
+
+    "Epic 3: Checkout flow" -> "Epic 3", "US3.2" -> "US3.2"
+    """
+    return artifact.split(":", 1)[0].strip()
+
+
+class TraceabilityIndex:
+    """Inverted index from epic/story ids to (test file, line) references"""
+
+    def __init__(self):
+        self._files: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        # artifact id -> flat [file_id, line, file_id, line, ...]
+        self._postings: Dict[str, List[int]] = {}
+
+    def _file_id(self, path: str) -> int:
+        """Intern a file path"""
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            file_id = self._file_ids[path] = len(self._files)
+            self._files.append(path)
+        return file_id
+
+    def add(self, artifact_id: str, path: str, line: int):
+        """Record a reference from a test file line to an epic/story"""
+        self._postings.setdefault(artifact_key(artifact_id), []).extend((self._file_id(path), line))
+
+    def add_refs(self, path: str, refs: Iterable[Tuple[str, int]]):
+        """Record all references found in one test file"""
+        for artifact_id, line in refs:
+            self.add(artifact_id, path, line)
+
+    def __contains__(self, artifact: str) -> bool:
+        return artifact_key(artifact) in self._postings
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def tests_for(self, artifact: str) -> List[Tuple[str, int]]:
+        """
+        List (test file, line) references for an epic or story
+
+        Args:
+            artifact: Id or full name, e.g. "US3.2" or "Epic 3: Checkout flow"
+        """
+        flat = self._postings.get(artifact_key(artifact), [])
+        return [(self._files[flat[i]], flat[i + 1]) for i in range(0, len(flat), 2)]
+
+    def test_files_for(self, artifact: str) -> List[str]:
+        """Distinct test files referencing an epic or story"""
+        flat = self._postings.get(artifact_key(artifact), [])
+        return [self._files[file_id] for file_id in dict.fromkeys(flat[0::2])]
+
+    def untested(self, artifacts: Iterable[str]) -> List[str]:
+        """Artifacts (as given) with no referencing test"""
+        return [a for a in artifacts if artifact_key(a) not in self._postings]
+
+    def coverage_by_artifact(self, artifacts: Iterable[str]) -> Dict[str, int]:
+        """Number of distinct referencing test files per artifact (as given)"""
+        return {a: len(self.test_files_for(a)) for a in artifacts}
+
+    def to_dict(self) -> Dict:
+        """Compact, JSON-serializable form"""
+        return {
+            "files": self._files,
+            "refs": dict(sorted(self._postings.items()))
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TraceabilityIndex":
+        """Rebuild an index from `to_dict` output"""
+        index = cls()
+        index._files = list(data.get("files", []))
+        index._file_ids = {path: i for i, path in enumerate(index._files)}
+        index._postings = {key: list(flat) for key, flat in data.get("refs", {}).items()}
+        return index
+
+    def save(self, path: Path):
+        """Write the index as compact JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["TraceabilityIndex"]:
+        """Load an index; None if the file is missing or unreadable"""
+        try:
+            with open(path, 'r') as f:
+                return cls.from_dict(json.load(f))
+        except (IOError, OSError, json.JSONDecodeError):
+            return None
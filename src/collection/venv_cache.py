@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Cached per-repository virtualenvs
+Each repository's tests run in an isolated virtualenv keyed by a hash of its
+requirement files (with their -r/-c includes), the project's packaging
+metadata, the extra packages and the Python version, so unchanged
+dependencies are installed once and reused; wheels are kept in a shared
+wheelhouse so rebuilding an environment can install offline
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import venv
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from src.collection.command_executor import CommandExecutor
+
+
+# Files declaring a project's own dependencies (pip install . / -e .)
+PROJECT_METADATA = ("pyproject.toml", "setup.py", "setup.cfg")
+
+_INCLUDE = re.compile(r'^(?:-[rc]\s*|--(?:requirement|constraint)(?:\s*=\s*|\s+))(\S+)')
+_EDITABLE = re.compile(r'^(?:-e\s*|--editable(?:\s*=\s*|\s+))(\S+)')
+
+
+def _local_path(spec: str) -> Optional[Path]:
+    """Directory a requirement refers to, or None for index packages and URLs"""
+    spec = spec.split("#", 1)[0].split("[", 1)[0].strip()
+    if spec.startswith("file:"):
+        spec = spec[len("file:"):]
+    if spec in (".", "..") or spec.startswith(("./", "../", "/")):
+        return Path(spec)
+    return None
+
+
+def requirement_inputs(requirement_files: Iterable[Path], project_dir: Optional[Path] = None) -> List[Path]:
+    """
+    Every file an install from these requirement files depends on
+
+    Follows -r/-c includes recursively (relative to the including file) and
+    adds the packaging metadata of the project directory and of local paths
+    referenced as requirements (relative to project_dir, where pip runs).
+
+    Returns:
+        Existing files, sorted and without duplicates
+    """
+    project_dir = Path(project_dir) if project_dir else None
+    files: Set[Path] = set()
+    directories: Set[Path] = {Path(".")} if project_dir else set()
+    pending = [Path(p) for p in requirement_files]
+
+    while pending:
+        path = pending.pop().resolve()
+        if path in files or not path.is_file():
+            continue
+        files.add(path)
+        for line in path.read_text(errors="replace").splitlines():
+            line = line.split(" #", 1)[0].strip()
+            include = _INCLUDE.match(line)
+            if include:
+                pending.append(path.parent / include.group(1))
+                continue
+            editable = _EDITABLE.match(line)
+            directory = _local_path(editable.group(1) if editable else line)
+            if directory is not None:
+                directories.add(directory)
+
+    for directory in directories:
+        base = directory if directory.is_absolute() or project_dir is None else project_dir / directory
+        for name in PROJECT_METADATA:
+            if (base / name).is_file():
+                files.add((base / name).resolve())
+    return sorted(files)
+
+
+class VirtualenvCache:
+    """Content-addressed virtualenvs under <cache_dir>/venvs with a shared wheelhouse"""
+
+    COMPLETE_MARKER = ".dora-complete"
+    MAX_ENVS = 20  # least recently used environments beyond this are removed
+
+    def __init__(self, cache_dir: Path, python: Optional[str] = None,
+                 executor: Optional[CommandExecutor] = None):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Shared dependency cache directory
+            python: Base interpreter for new environments (defaults to this one)
+            executor: Runs pip/venv commands (logs, timeouts, resource stats);
+                output is discarded when None
+        """
+        self.cache_dir = Path(cache_dir)
+        self.envs_dir = self.cache_dir / "venvs"
+        self.wheelhouse = self.cache_dir / "wheels"
+        self.python = python or sys.executable
+        self.executor = executor or CommandExecutor()
+
+    def _python_version(self) -> str:
+        """Implementation and full version of the base interpreter"""
+        if self.python == sys.executable:
+            return f"{sys.implementation.name}-{sys.version}"
+        command = [self.python, "-c", "import sys; print(sys.implementation.name + '-' + sys.version)"]
+        probe = self.executor.run(command, timeout=30)
+        if probe.returncode != 0:
+            raise subprocess.CalledProcessError(probe.returncode, command, probe.stdout, probe.stderr)
+        return probe.stdout.strip()
+
+    def key(self, requirement_files: Iterable[Path], packages: Iterable[str],
+            project_dir: Optional[Path] = None) -> str:
+        """
+        Hash identifying an environment
+
+        Args:
+            requirement_files: Requirement files installed into the environment
+            packages: Extra packages installed alongside them
+            project_dir: Repository root; its packaging metadata is part of the key
+        """
+        digest = hashlib.sha256(self._python_version().encode())
+        root = Path(project_dir).resolve() if project_dir else None
+        for path in requirement_inputs(requirement_files, project_dir):
+            name = str(path.relative_to(root)) if root and path.is_relative_to(root) else path.name
+            digest.update(b"\0" + name.encode() + b"\0" + path.read_bytes())
+        for package in sorted(packages):
+            digest.update(b"\0pkg\0" + package.encode())
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def env_python(env_dir: Path) -> Path:
+        """Interpreter of a virtualenv"""
+        if os.name == "nt":
+            return env_dir / "Scripts" / "python.exe"
+        return env_dir / "bin" / "python"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Completed environment for a key, or None"""
+        env_dir = self.envs_dir / key
+        marker = env_dir / self.COMPLETE_MARKER
+        if not marker.exists():
+            return None
+        marker.touch()
+        return env_dir
+
+    def _pip(self, env_dir: Path, args: List[str], timeout: int,
+             cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        return self.executor.run(
+            [str(self.env_python(env_dir)), "-m", "pip", "-q", "--disable-pip-version-check"] + args,
+            cwd=cwd, timeout=timeout
+        )
+
+    def _install(self, env_dir: Path, install_args: List[str], timeout: int,
+                 cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        """
+        Install into an environment, offline from the wheelhouse when possible
+
+        Missing wheels are built into the wheelhouse and the offline install is
+        retried; if that still fails, packages are installed from the index.
+        """
+        offline = ["install", "--no-index", "--find-links", str(self.wheelhouse)] + install_args
+        if self.wheelhouse.is_dir():
+            installed = self._pip(env_dir, offline, timeout, cwd)
+            if installed.returncode == 0:
+                return installed
+
+        self.wheelhouse.mkdir(parents=True, exist_ok=True)
+        built = self._pip(env_dir, ["wheel", "--wheel-dir", str(self.wheelhouse)] + install_args, timeout, cwd)
+        if built.returncode == 0:
+            installed = self._pip(env_dir, offline, timeout, cwd)
+            if installed.returncode == 0:
+                return installed
+        return self._pip(env_dir, ["install", "--find-links", str(self.wheelhouse)] + install_args, timeout, cwd)
+
+    def ensure(self, requirement_files: Iterable[Path], packages: Iterable[str],
+               timeout: int = 900, project_dir: Optional[Path] = None) -> Path:
+        """
+        Return a ready environment, building it on a cache miss
+
+        The environment is built in a temporary directory and moved into place
+        once installed, so concurrent builds of the same key never share a
+        half-installed environment.
+
+        Args:
+            requirement_files: Requirement files to install
+            packages: Extra packages (e.g. pytest, pytest-cov)
+            timeout: Timeout per pip invocation in seconds
+            project_dir: Repository root; pip runs there so local path requirements
+                (-e .) resolve against it, and its packaging metadata is keyed
+
+        Returns:
+            Path of the environment
+
+        Raises:
+            RuntimeError: If dependencies cannot be installed
+        """
+        requirement_files = [Path(p) for p in requirement_files]
+        packages = list(packages)
+        key = self.key(requirement_files, packages, project_dir)
+        env_dir = self.lookup(key)
+        if env_dir is not None:
+            return env_dir
+
+        self.envs_dir.mkdir(parents=True, exist_ok=True)
+        build_dir = self.envs_dir / f"{key}.tmp-{os.getpid()}-{id(requirement_files):x}"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        try:
+            if self.python == sys.executable:
+                venv.EnvBuilder(with_pip=True, symlinks=os.name != "nt").create(build_dir)
+            else:
+                command = [self.python, "-m", "venv", str(build_dir)]
+                created = self.executor.run(command, timeout=300)
+                if created.returncode != 0:
+                    raise subprocess.CalledProcessError(created.returncode, command, created.stdout, created.stderr)
+
+            install_args = [arg for path in requirement_files for arg in ("-r", str(path))] + packages
+            installed = self._install(build_dir, install_args, timeout, project_dir)
+            if installed.returncode != 0:
+                raise RuntimeError(f"Dependency installation failed: {installed.stderr.strip()[-500:]}")
+
+            (build_dir / self.COMPLETE_MARKER).touch()
+            try:
+                build_dir.rename(self.envs_dir / key)
+            except OSError:
+                # Another build of the same key finished first
+                shutil.rmtree(build_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+        self.prune()
+        return self.envs_dir / key
+
+    def prune(self, keep: Optional[int] = None):
+        """Remove the least recently used environments beyond `keep`"""
+        keep = self.MAX_ENVS if keep is None else keep
+        envs = [d for d in self.envs_dir.iterdir() if (d / self.COMPLETE_MARKER).exists()]
+        envs.sort(key=lambda d: (d / self.COMPLETE_MARKER).stat().st_mtime, reverse=True)
+        for env_dir in envs[keep:]:
+            shutil.rmtree(env_dir, ignore_errors=True)
@@ -8,6 +8,7 @@ import json
 import re
 from datetime import datetime
 from pathlib import Path
+from src.collection.scan_store import ScanArtifactStore
 
 class Validator:
     def __init__(self, root_dir="."):
@@ -322,12 +323,8 @@ class Validator:
                 "calculation_path": str(calc_file.relative_to(self.root_dir))
             }
 
-        # Load github scan artifacts for epic coverage tracking
-        git_artifacts_dir = self.root_dir / "git_artifacts"
-        github_scan_file = git_artifacts_dir / "github_scan_artifacts.json"
-        github_scan_artifacts = {}
-        if github_scan_file.exists():
-            github_scan_artifacts = self._load_json(github_scan_file) or {}
+        # Assemble github scan artifacts for epic coverage tracking from the per-repo shards
+        github_scan_artifacts = ScanArtifactStore(self.root_dir / "git_artifacts").load_all()
 
         total_metrics = 0
         for calc_file in self.calculations.rglob("*.json"):
@@ -0,0 +1,69 @@
+"""Coverage result cache hits must not change calculated coverage"""
+
+import json
+import subprocess
+
+from src.calculations.calculate import Calculator
+from src.collection.collect_ci import CICollector
+from src.collection.coverage_tool_runner import CoverageResult
+
+REPORT = """<?xml version="1.0" ?>
+<coverage lines-valid="4" lines-covered="3"><packages><package name="pkg"><classes>
+<class name="app.py" filename="pkg/app.py"><methods/><lines>
+<line number="1" hits="1"/><line number="2" hits="1"/><line number="3" hits="1"/><line number="4" hits="0"/>
+</lines></class></classes></package></packages></coverage>
+"""
+
+
+def _git(clone, *args):
+    subprocess.run(["git", *args], cwd=clone, check=True, capture_output=True)
+
+
+def _calculate(root):
+    calculator = Calculator(root)
+    return {
+        "coverage": calculator.calculate_coverage_percentage("r", {"coverage": "pytest-cov"}),
+        "breakdown": calculator.calculate_coverage_breakdown("r"),
+        "diff": calculator.calculate_diff_coverage("r")
+    }
+
+
+def test_cache_hit_leaves_coverage_totals_unchanged(tmp_path, monkeypatch):
+    clone = tmp_path / "git_artifacts" / "r" / "clone"
+    (clone / "pkg").mkdir(parents=True)
+    (clone / "pkg" / "app.py").write_text("a = 1\nb = 2\nc = 3\nd = 4\n")
+    _git(clone, "init", "-q")
+    _git(clone, "add", "-A")
+    _git(clone, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    (clone / "coverage.xml").write_text(REPORT)
+
+    config_file = tmp_path / "repos.yaml"
+    config_file.write_text("repositories:\n  r:\n    repo: https://example.com/r.git\n    language: python\n")
+    collector = CICollector(root_dir=tmp_path, config_file=config_file)
+    plan = {"repo_name": "r", "repo_dir": tmp_path / "ci_artifacts" / "r", "git_clone": clone, "build_tool": None}
+
+    runs = []
+
+    def run_runner(runner, config):
+        runs.append(runner)
+        return CoverageResult(tool="pytest-cov", language="python", success=True, report_path=clone / "coverage.xml")
+
+    monkeypatch.setattr(CICollector, "_run_runner", staticmethod(run_runner))
+
+    first = collector.run_coverage_tool(plan, {"type": "pytest-cov"})
+    # The pipeline publishes the collected report under ci_artifacts
+    (tmp_path / "ci_artifacts" / "r" / "coverage.xml").write_text(REPORT)
+    before = _calculate(tmp_path)
+
+    second = collector.run_coverage_tool(plan, {"type": "pytest-cov"})
+    after = _calculate(tmp_path)
+
+    assert len(runs) == 1 and first.success and "(cached" in second.status_message
+    assert not list((tmp_path / "ci_artifacts").rglob("cache"))
+    for name in ("coverage", "breakdown", "diff"):
+        assert after[name]["inputs"] == before[name]["inputs"] == ["ci_artifacts/r/coverage.xml"]
+    assert after["coverage"]["value"] == before["coverage"]["value"] == 75.0
+    assert after["breakdown"]["totals"] == before["breakdown"]["totals"]
+    assert after["breakdown"]["totals"]["lines_covered"] == 3
+    assert after["diff"]["covered_lines"] == before["diff"]["covered_lines"] == 3
+    assert json.dumps(after["diff"]["top_uncovered_files"]) == json.dumps(before["diff"]["top_uncovered_files"])